@@ -12,8 +12,8 @@ from livekit import rtc, api
 import subprocess
 import time
 import struct
-import audioop
 import numpy as np
+from audio import codec
 
 
 # Environment variables
@@ -75,7 +75,7 @@ class TelephonyAudioSource(rtc.AudioSource):
 
             # Convert μ-law to 16-bit PCM
             try:
-                pcm_data = audioop.ulaw2lin(mulaw_data, 2)  # 2 bytes per sample (16-bit)
+                pcm_data = codec.ulaw2lin(mulaw_data)  # 2 bytes per sample (16-bit)
             except Exception as e:
                 logger.error(f"❌ μ-law conversion error: {e}, data size: {len(mulaw_data)}")
                 return
@@ -449,7 +449,7 @@ class TelephonyWebSocketHandler:
                         noisy_pcm = (pcm_array + noise * 32767 * 0.1).astype(np.int16)
 
                         # Convert PCM to μ-law for telephony
-                        mulaw_bytes = audioop.lin2ulaw(pcm_bytes, 2)
+                        mulaw_bytes = codec.lin2ulaw(pcm_bytes)
                         
                         # Send to telephony
                         success = await self.send_audio_to_telephony(mulaw_bytes)
@@ -1,13 +1,13 @@
 """
 Audio processing with proper mixing - agent + background
 """
-import audioop
 import numpy as np
 import logging
-import array
 from livekit import rtc
+from audio import codec, mixer
 from config import TELEPHONY_SAMPLE_RATE, LIVEKIT_SAMPLE_RATE
 from audio.noise_manager import NoiseManager
+from audio.buffer_pool import BufferPool
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +25,12 @@ class AudioProcessor:
         self.noise_manager = NoiseManager()
         self.is_active = True
         
+        # Preallocated per-frame buffers for the outbound mix/encode path
+        self.mix_pool = BufferPool(lambda n: np.empty(n, dtype=np.int16), name="outbound-mix")
+        self.scratch_pool = BufferPool(lambda n: np.empty((2, n), dtype=np.float32), name="outbound-scratch")
+        self.ulaw_pool = BufferPool(lambda n: np.empty(n, dtype=np.uint8), name="outbound-ulaw")
+        self.outbound_frames = 0
+        
         # Log status
         status = self.noise_manager.get_status()
         logger.info(f"🔊 AudioProcessor: noise enabled={status['enabled']}, "
@@ -49,7 +55,7 @@ class AudioProcessor:
                 pcm_bytes = bytes(resampled_frame.data[:resampled_frame.samples_per_channel * 2])
                 
                 # Convert to μ-law
-                mulaw_bytes = audioop.lin2ulaw(pcm_bytes, 2)
+                mulaw_bytes = codec.lin2ulaw(pcm_bytes)
                 
                 telephony_audio_data.append(mulaw_bytes)
                 
@@ -58,7 +64,66 @@ class AudioProcessor:
         except Exception as e:
             logger.error(f"❌ Error converting audio: {e}")
             return []
-    
+
+    def process_outbound_frame(self, audio_frame):
+        """
+        Agent LiveKit frame -> μ-law chunks ready for telephony
+
+        Agent and background stay int16 PCM through resampling and mixing;
+        the only lossy step is the single μ-law encode at the end.
+
+        Returns:
+            list of μ-law bytes, one per resampled frame
+        """
+        if not self.is_active:
+            return []
+
+        try:
+            resampled_frames = self.return_resampler.push(audio_frame)
+
+            telephony_audio_data = []
+
+            for resampled_frame in resampled_frames:
+                if not self.is_active:
+                    break
+
+                # Zero-copy int16 view over the resampler's output
+                agent_pcm = np.frombuffer(
+                    resampled_frame.data, dtype=np.int16,
+                    count=resampled_frame.samples_per_channel
+                )
+                telephony_audio_data.append(self.encode_outbound_pcm(agent_pcm))
+                self.outbound_frames += 1
+
+            return telephony_audio_data
+
+        except Exception as e:
+            logger.error(f"❌ Error processing outbound audio: {e}")
+            return []
+
+    def encode_outbound_pcm(self, agent_pcm):
+        """Mix agent PCM with pre-scaled background PCM (if enabled) and encode to μ-law once"""
+        num_samples = len(agent_pcm)
+        bg_pcm = self.get_background_pcm_chunk(num_samples)
+        ulaw = self.ulaw_pool.acquire(num_samples)
+
+        try:
+            # Agent-only fast path: nothing to mix
+            if bg_pcm is None or self.noise_manager.volume <= 0:
+                return codec.encode(agent_pcm, out=ulaw).tobytes()
+
+            mixed_pcm = self.mix_pool.acquire(num_samples)
+            scratch = self.scratch_pool.acquire(num_samples)
+            try:
+                # Background already carries its volume: slice + one add
+                mixer.mix([agent_pcm, bg_pcm], out=mixed_pcm, scratch=scratch)
+                return codec.encode(mixed_pcm, out=ulaw).tobytes()
+            finally:
+                self.mix_pool.release(num_samples, mixed_pcm)
+                self.scratch_pool.release(num_samples, scratch)
+        finally:
+            self.ulaw_pool.release(num_samples, ulaw)
+
     def mix_audio_chunks(self, agent_mulaw, background_mulaw):
         """Mix agent audio with background audio (both in μ-law format)"""
         if not agent_mulaw:
@@ -68,52 +133,16 @@ class AudioProcessor:
         
         try:
             # Convert both to PCM
-            agent_pcm = audioop.ulaw2lin(agent_mulaw, 2)
-            bg_pcm = audioop.ulaw2lin(background_mulaw, 2)
-            
-            # Ensure same length
-            agent_len = len(agent_pcm)
-            bg_len = len(bg_pcm)
-            
-            if bg_len < agent_len:
-                # Repeat background if too short
-                repetitions = (agent_len // bg_len) + 1
-                bg_pcm = (bg_pcm * repetitions)[:agent_len]
-            elif bg_len > agent_len:
-                # Truncate background if too long
-                bg_pcm = bg_pcm[:agent_len]
+            agent_pcm = codec.decode(agent_mulaw)
+            bg_pcm = codec.decode(background_mulaw)
             
-            # Convert to sample arrays
-            agent_samples = array.array('h')
-            bg_samples = array.array('h')
-            
-            agent_samples.frombytes(agent_pcm)
-            bg_samples.frombytes(bg_pcm)
-            
-            # Mix samples - agent at full volume, background at configured volume
-            mixed_samples = array.array('h')
+            # Mix - agent at full volume, background at configured volume
+            # (background is looped/truncated to the agent length by the mixer)
             bg_volume = self.noise_manager.volume if self.noise_manager else 0.15
-            
-            for i in range(len(agent_samples)):
-                agent_sample = agent_samples[i]
-                bg_sample = int(bg_samples[i] * bg_volume)
-                
-                # Simple addition
-                mixed_sample = agent_sample + bg_sample
-                
-                # Clamp to prevent clipping
-                if mixed_sample > 32767:
-                    mixed_sample = 32767
-                elif mixed_sample < -32768:
-                    mixed_sample = -32768
-                
-                mixed_samples.append(mixed_sample)
+            mixed_pcm = mixer.mix([agent_pcm, bg_pcm], gains=[1.0, bg_volume])
             
             # Convert back to μ-law
-            mixed_pcm = mixed_samples.tobytes()
-            mixed_mulaw = audioop.lin2ulaw(mixed_pcm, 2)
-            
-            return mixed_mulaw
+            return codec.encode(mixed_pcm).tobytes()
             
         except Exception as e:
             logger.error(f"❌ Error mixing audio: {e}")
@@ -170,9 +199,22 @@ class AudioProcessor:
             
         # Get raw background chunk (volume will be applied during mixing)
         chunk = self.noise_manager.get_background_chunk_raw(chunk_size)
-        
+
         return chunk
 
+    def get_background_pcm_chunk(self, num_samples):
+        """Get background chunk as volume-scaled int16 PCM for mixing (None if noise is off)"""
+        if not self.is_active or not self.noise_manager or not self.noise_manager.enabled:
+            return None
+
+        return self.noise_manager.get_scaled_pcm_chunk(num_samples)
+
+    async def load_background_audio(self):
+        """Load background noise through the shared asset cache (off the event loop)"""
+        if self.noise_manager:
+            return await self.noise_manager.load()
+        return False
+
     def start_background_audio(self):
         """Start background audio"""
         if self.noise_manager:
@@ -180,6 +222,16 @@ class AudioProcessor:
             status = self.noise_manager.get_status()
             logger.info(f"🎵 Background audio started: {status}")
     
+    def get_buffer_stats(self):
+        """Get outbound buffer pool statistics (allocations per frame should stay ~0)"""
+        return {
+            "outbound_frames": self.outbound_frames,
+            "pools": [
+                pool.get_stats(frames=self.outbound_frames)
+                for pool in (self.mix_pool, self.scratch_pool, self.ulaw_pool)
+            ]
+        }
+    
     def get_noise_status(self):
         """Get noise manager status"""
         if self.noise_manager:
@@ -0,0 +1,73 @@
+"""
+Reusable buffer pool for per-frame audio buffers
+Keeps a small free-list per buffer size so the steady state allocates nothing
+"""
+import logging
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+
+class BufferPool:
+    """Free-list of preallocated buffers keyed by size, with allocation counters"""
+
+    def __init__(self, factory, name="buffers", max_free_per_size=4):
+        """
+        Args:
+            factory: callable(size) -> new buffer (only called on a pool miss)
+            name: label used in stats/logs
+            max_free_per_size: how many idle buffers to keep per size
+        """
+        self.factory = factory
+        self.name = name
+        self.max_free_per_size = max_free_per_size
+        self._free = defaultdict(list)
+
+        # Stats
+        self.acquires = 0
+        self.allocations = 0
+        self.discarded = 0
+
+    def acquire(self, size):
+        """Get a buffer of the given size (reused if one is free)"""
+        self.acquires += 1
+        free = self._free[size]
+        if free:
+            return free.pop()
+
+        self.allocations += 1
+        if self.allocations % 100 == 0:
+            logger.warning(f"⚠️ Buffer pool '{self.name}': {self.allocations} allocations "
+                           f"for {self.acquires} acquires")
+        return self.factory(size)
+
+    def release(self, size, buffer):
+        """Return a buffer to the pool"""
+        free = self._free[size]
+        if len(free) < self.max_free_per_size:
+            free.append(buffer)
+        else:
+            self.discarded += 1
+
+    def clear(self):
+        """Drop all idle buffers"""
+        self._free.clear()
+
+    def get_stats(self, frames=None):
+        """
+        Get pool statistics
+
+        Args:
+            frames: optional frame count, adds allocations_per_frame
+        """
+        stats = {
+            "name": self.name,
+            "acquires": self.acquires,
+            "allocations": self.allocations,
+            "reuse_ratio": 1.0 - self.allocations / self.acquires if self.acquires else 0.0,
+            "discarded": self.discarded,
+            "idle_buffers": sum(len(free) for free in self._free.values())
+        }
+        if frames is not None:
+            stats["allocations_per_frame"] = self.allocations / max(1, frames)
+        return stats
@@ -0,0 +1,131 @@
+"""
+G.711 μ-law codec built on NumPy lookup tables
+Drop-in replacement for audioop.ulaw2lin / audioop.lin2ulaw (removed in Python 3.13)
+
+Decoding is a 256-entry table lookup, encoding a 65536-entry table lookup indexed
+by the raw 16-bit sample, so both directions are a single vectorized gather.
+Inputs may be bytes, bytearray, memoryview or NumPy arrays of any shape, which
+makes batches (e.g. a (frames, 160) array) as cheap to convert as single frames.
+"""
+import numpy as np
+
+# G.711 constants (same values audioop uses)
+_ULAW_BIAS = 0x84
+_ULAW_CLIP = 8159  # 14-bit magnitude clip
+_SEG_END = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF], dtype=np.int32)
+
+
+def _build_decode_table():
+    """μ-law byte -> int16 sample for all 256 codes"""
+    codes = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (codes >> 4) & 0x07
+    mantissa = codes & 0x0F
+    magnitude = (((mantissa << 3) + _ULAW_BIAS) << exponent) - _ULAW_BIAS
+    return np.where(codes & 0x80, -magnitude, magnitude).astype(np.int16)
+
+
+def _build_encode_table():
+    """int16 sample (indexed as uint16) -> μ-law byte for all 65536 values"""
+    samples = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32)
+    pcm = samples >> 2  # audioop works on 14-bit magnitudes
+
+    mask = np.where(pcm < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(pcm), _ULAW_CLIP) + (_ULAW_BIAS >> 2)
+
+    segment = np.searchsorted(_SEG_END, magnitude, side="left")
+    mantissa = (magnitude >> (np.minimum(segment, 7) + 1)) & 0x0F
+    codes = np.where(segment >= 8, 0x7F, (segment << 4) | mantissa)
+    return (codes ^ mask).astype(np.uint8)
+
+
+ULAW_DECODE_TABLE = _build_decode_table()
+ULAW_ENCODE_TABLE = _build_encode_table()
+ULAW_DECODE_TABLE.flags.writeable = False
+ULAW_ENCODE_TABLE.flags.writeable = False
+
+# μ-law code for a zero sample (used for padding/silence)
+ULAW_SILENCE = int(ULAW_ENCODE_TABLE[0])
+
+
+def _as_ulaw_array(data):
+    """View μ-law input as a uint8 array without copying"""
+    if isinstance(data, np.ndarray):
+        return data if data.dtype == np.uint8 else data.view(np.uint8)
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def _as_pcm_array(data):
+    """
+    View 16-bit PCM input as an int16 array without copying. Wider integer
+    arrays saturate to the int16 range (a plain cast would wrap around);
+    float input is rejected, since its scale (±1.0 or ±32768) is ambiguous
+    """
+    if isinstance(data, np.ndarray):
+        if data.dtype == np.int16:
+            return data
+        if not np.issubdtype(data.dtype, np.integer):
+            raise TypeError(f"PCM must be an integer array, got {data.dtype}")
+        info = np.iinfo(data.dtype)
+        return np.clip(data, max(info.min, -32768), min(info.max, 32767)).astype(np.int16)
+    return np.frombuffer(data, dtype=np.int16)
+
+
+def decode(data, out=None):
+    """
+    Decode μ-law to int16 PCM
+
+    Args:
+        data: μ-law bytes, memoryview or uint8 array (any shape)
+        out: optional preallocated int16 array of the same shape
+
+    Returns:
+        int16 NumPy array
+    """
+    codes = _as_ulaw_array(data)
+    if out is None:
+        return ULAW_DECODE_TABLE[codes]
+    return np.take(ULAW_DECODE_TABLE, codes, out=out)
+
+
+def encode(samples, out=None):
+    """
+    Encode int16 PCM to μ-law
+
+    Args:
+        samples: int16 array (any shape; other integer arrays are saturated to int16),
+            or PCM bytes/memoryview (16-bit, native endian)
+        out: optional preallocated uint8 array of the same shape
+
+    Returns:
+        uint8 NumPy array
+    """
+    pcm = _as_pcm_array(samples)
+    if out is None:
+        return ULAW_ENCODE_TABLE[pcm.view(np.uint16)]
+    return np.take(ULAW_ENCODE_TABLE, pcm.view(np.uint16), out=out)
+
+
+def ulaw2lin(data):
+    """audioop.ulaw2lin(data, 2) equivalent - μ-law bytes to PCM bytes"""
+    return decode(data).tobytes()
+
+
+def lin2ulaw(data):
+    """audioop.lin2ulaw(data, 2) equivalent - PCM bytes to μ-law bytes"""
+    return encode(data).tobytes()
+
+
+def decode_batch(frames):
+    """Decode a list of equal-length μ-law frames in one pass -> (n, frame_len) int16"""
+    if not frames:
+        return np.empty((0, 0), dtype=np.int16)
+    stacked = np.frombuffer(b"".join(frames), dtype=np.uint8).reshape(len(frames), -1)
+    return ULAW_DECODE_TABLE[stacked]
+
+
+def encode_batch(frames):
+    """Encode a list of equal-length int16 frames in one pass -> (n, frame_len) uint8"""
+    if len(frames) == 0:
+        return np.empty((0, 0), dtype=np.uint8)
+    stacked = np.stack([_as_pcm_array(frame) for frame in frames])
+    return ULAW_ENCODE_TABLE[stacked.view(np.uint16)]
@@ -0,0 +1,145 @@
+"""
+Inbound discontinuous transmission (DTX) for caller audio
+During sustained silence caller frames are not resampled or sent to LiveKit
+(optionally a sparse comfort-noise frame is). A short pre-roll of the most
+recent suppressed frames is sent first when speech resumes, so onsets are not
+clipped. Activity comes from a cheap energy VAD on the frame itself (or the
+shared frame-feature stage), extended by the call's main VAD when it reports
+the user speaking
+"""
+import logging
+from collections import deque
+import numpy as np
+from audio.energy_vad import EnergyVADProcessor
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_THRESHOLD = 0.3    # Energy VAD probability that counts as activity (conservative)
+NOISE_LEVEL_TRACK = 0.05    # EMA rate for the background RMS used by comfort noise
+COMFORT_GAIN = 0.5          # Comfort noise level relative to the tracked background
+
+
+class InboundDTX:
+    """Per-call send / suppress decision for 20ms caller frames"""
+
+    def __init__(self, hangover_frames=20, preroll_frames=5, comfort_interval_frames=0, sample_rate=8000):
+        """
+        Args:
+            hangover_frames: consecutive inactive frames before suppression starts
+            preroll_frames: suppressed frames kept and sent ahead of resumed speech
+            comfort_interval_frames: while suppressed, send one comfort-noise frame
+                every N frames (0 = send nothing)
+            sample_rate: PCM sample rate
+        """
+        self.hangover_frames = hangover_frames
+        self.comfort_interval_frames = comfort_interval_frames
+        self.vad = EnergyVADProcessor(threshold=ACTIVITY_THRESHOLD, sample_rate=sample_rate)
+
+        self.preroll = deque(maxlen=preroll_frames)
+        self.inactive_run = 0
+        self.suppressing = False
+        self.last_active = False
+        self.external_speech = False
+        self.noise_rms = 0.0
+        self.rng = np.random.default_rng()
+
+        # Stats
+        self.frames = 0
+        self.frames_suppressed = 0
+        self.comfort_frames = 0
+        self.preroll_frames_sent = 0
+        self.dtx_periods = 0
+
+        logger.info(f"✅ Inbound DTX: hangover={hangover_frames} frames, pre-roll={preroll_frames} frames, "
+                   f"comfort every {comfort_interval_frames or '-'} frames")
+
+    def note_speech(self, user_speaking):
+        """Main VAD state for the call (keeps frames flowing while it says the user is speaking)"""
+        self.external_speech = user_speaking
+
+    def process(self, samples, features=None):
+        """
+        Decide what to send for one int16 frame
+
+        Args:
+            samples: int16 frame
+            features: FrameFeatures of this same frame - its shared activity
+                decision and RMS replace the DTX's own measurements
+
+        Returns:
+            list of int16 frames to send now (empty while suppressed)
+        """
+        self.frames += 1
+        if features is not None:
+            activity = features.activity
+        else:
+            windows = self.vad.windows_processed
+            result = self.vad.process_chunk(samples)
+            activity = result.is_speech if self.vad.windows_processed != windows else None
+
+        # Frames that complete no energy window keep the previous decision
+        if activity is not None:
+            self.last_active = activity
+
+        if self.last_active or self.external_speech:
+            self.inactive_run = 0
+        else:
+            self.inactive_run += 1
+
+        if self.inactive_run <= self.hangover_frames:
+            return self._resume(samples)
+        return self._suppress(samples, features)
+
+    def _resume(self, samples):
+        if not self.suppressing:
+            return [samples]
+
+        # Speech is back: send the pre-roll ahead of this frame
+        self.suppressing = False
+        frames = list(self.preroll)
+        self.preroll.clear()
+        self.preroll_frames_sent += len(frames)
+        frames.append(samples)
+        return frames
+
+    def _suppress(self, samples, features=None):
+        if not self.suppressing:
+            self.suppressing = True
+            self.dtx_periods += 1
+
+        self.preroll.append(np.array(samples, dtype=np.int16))
+        self.frames_suppressed += 1
+        self._track_noise(samples, features)
+
+        if self.comfort_interval_frames and self.frames_suppressed % self.comfort_interval_frames == 0:
+            self.comfort_frames += 1
+            return [self._comfort_frame(len(samples))]
+        return []
+
+    def _track_noise(self, samples, features=None):
+        if features is not None:
+            rms = features.rms * 32768.0
+        else:
+            samples = np.asarray(samples, dtype=np.float32)
+            rms = float(np.sqrt(np.dot(samples, samples) / max(1, len(samples))))
+        if self.noise_rms == 0.0:
+            self.noise_rms = rms
+        else:
+            self.noise_rms += NOISE_LEVEL_TRACK * (rms - self.noise_rms)
+
+    def _comfort_frame(self, num_samples):
+        noise = self.rng.standard_normal(num_samples, dtype=np.float32)
+        noise *= np.float32(self.noise_rms * COMFORT_GAIN)
+        return np.clip(noise, -32768, 32767).astype(np.int16)
+
+    def get_stats(self):
+        """DTX statistics - suppressed_ratio is the share of caller frames never sent"""
+        return {
+            "frames": self.frames,
+            "frames_suppressed": self.frames_suppressed,
+            "suppressed_ratio": self.frames_suppressed / self.frames if self.frames else 0.0,
+            "comfort_frames": self.comfort_frames,
+            "preroll_frames_sent": self.preroll_frames_sent,
+            "dtx_periods": self.dtx_periods,
+            "suppressing": self.suppressing
+        }
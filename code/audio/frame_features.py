@@ -0,0 +1,160 @@
+"""
+Shared per-frame features for the user-audio path
+Each caller frame is analysed once - float samples, RMS / level, zero-crossing
+rate, one energy-VAD activity decision and (on demand) the STFT frame used by
+noise suppression - and every stage reads the cached results instead of
+converting and measuring the same PCM again
+"""
+import logging
+import time
+import numpy as np
+from audio.energy_vad import EnergyVADProcessor
+from audio.ring_buffer import INT16_SCALE
+
+logger = logging.getLogger(__name__)
+
+STFT_HOP_MS = 20            # STFT hop (= noise suppression latency); matches the telephony frame
+ACTIVITY_THRESHOLD = 0.3    # Energy VAD probability shared by the NC gate and DTX (conservative)
+SILENCE_DB = -96.0          # Level reported for digital silence
+
+
+def stft_window(n_fft):
+    """Periodic sqrt-Hann: used for analysis and synthesis, window^2 overlap-adds to 1 at 50%"""
+    return np.sqrt(np.hanning(n_fft + 1)[:-1]).astype(np.float32)
+
+
+class FrameFeatures:
+    """
+    Features of the latest frame. The extractor overwrites this object on every
+    frame, so read it before the next extract (samples is a new array each frame
+    and may be kept, e.g. queued for VAD)
+    """
+
+    __slots__ = ("extractor", "pcm", "samples", "rms", "level_db", "activity", "_zcr", "_spectrum",
+                 "_magnitude_db")
+
+    def __init__(self, extractor):
+        self.extractor = extractor
+        self.set(None, None, 0.0, SILENCE_DB, None)
+
+    def set(self, pcm, samples, rms, level_db, activity):
+        self.pcm = pcm
+        self.samples = samples          # float32 in [-1, 1]
+        self.rms = rms                  # Normalized (full scale = 1.0)
+        self.level_db = level_db        # dBFS
+        self.activity = activity        # Energy VAD decision, None if no window completed this frame
+        self._zcr = None
+        self._spectrum = None
+        self._magnitude_db = None
+        return self
+
+    @property
+    def zcr(self):
+        """Zero-crossing rate (crossings per sample)"""
+        if self._zcr is None:
+            signs = np.signbit(self.samples)
+            self._zcr = float(np.count_nonzero(signs[1:] != signs[:-1])) / max(1, len(signs) - 1)
+        return self._zcr
+
+    def spectrum(self):
+        """rfft of the last n_fft samples under the sqrt-Hann window (computed once per frame)"""
+        if self._spectrum is None:
+            self._spectrum = self.extractor._stft()
+        return self._spectrum
+
+    def magnitude_db(self):
+        """Per-bin magnitude of spectrum() in dB (float32, shared - do not modify)"""
+        if self._magnitude_db is None:
+            magnitude = np.abs(self.spectrum())
+            magnitude += 1e-10
+            np.log10(magnitude, out=magnitude)
+            magnitude *= 20.0
+            self._magnitude_db = magnitude
+        return self._magnitude_db
+
+
+class FeatureExtractor:
+    """Per-call feature stage: one extract() per caller frame, before any other stage"""
+
+    def __init__(self, sample_rate=8000, activity=False):
+        """
+        Args:
+            sample_rate: PCM sample rate
+            activity: also run the shared energy VAD (needed by the NC gate / DTX)
+        """
+        self.sample_rate = sample_rate
+        self.hop = sample_rate * STFT_HOP_MS // 1000
+        self.n_fft = 2 * self.hop
+        self.window = stft_window(self.n_fft)
+        self.history = np.zeros(self.n_fft, dtype=np.float32)  # Last n_fft samples (any chunk size)
+        self.windowed = np.zeros(self.n_fft, dtype=np.float32)
+
+        self.activity_vad = EnergyVADProcessor(threshold=ACTIVITY_THRESHOLD, sample_rate=sample_rate) \
+            if activity else None
+        self.features = FrameFeatures(self)
+
+        # Stats
+        self.frames = 0
+        self.stft_frames = 0
+        self.extract_time = 0.0
+
+        logger.info(f"✅ Frame features: {sample_rate}Hz, {self.n_fft}-point STFT, "
+                   f"shared activity VAD {'on' if activity else 'off'}")
+
+    def extract(self, pcm):
+        """
+        Analyse one int16 frame (bytes or numpy array)
+
+        Returns:
+            FrameFeatures (reused object)
+        """
+        start = time.perf_counter()
+        if isinstance(pcm, (bytes, bytearray, memoryview)):
+            pcm = np.frombuffer(pcm, dtype=np.int16)
+
+        samples = np.multiply(pcm, INT16_SCALE, dtype=np.float32)
+        power = float(np.dot(samples, samples)) / max(1, len(samples))
+        level_db = float(10.0 * np.log10(power)) if power > 0 else SILENCE_DB
+        self._slide(samples)
+
+        activity = None
+        if self.activity_vad is not None:
+            windows = self.activity_vad.windows_processed
+            result = self.activity_vad.process_chunk(samples)
+            if self.activity_vad.windows_processed != windows:
+                activity = result.is_speech
+
+        self.frames += 1
+        self.extract_time += time.perf_counter() - start
+        return self.features.set(pcm, samples, power ** 0.5, level_db, activity)
+
+    def _slide(self, samples):
+        n = len(samples)
+        if n >= self.n_fft:
+            self.history[:] = samples[-self.n_fft:]
+        else:
+            self.history[:-n] = self.history[n:]
+            self.history[-n:] = samples
+
+    def _stft(self):
+        start = time.perf_counter()
+        np.multiply(self.history, self.window, out=self.windowed)
+        spectrum = np.fft.rfft(self.windowed)
+        self.stft_frames += 1
+        self.extract_time += time.perf_counter() - start
+        return spectrum
+
+    def reset(self):
+        """Reset analysis state (e.g., between calls)"""
+        self.history[:] = 0.0
+        if self.activity_vad is not None:
+            self.activity_vad.reset()
+
+    def get_stats(self):
+        """Feature stage statistics"""
+        return {
+            "frames": self.frames,
+            "stft_frames": self.stft_frames,
+            "feature_ms": self.extract_time * 1000,
+            "per_frame_us": self.extract_time / self.frames * 1e6 if self.frames else 0.0
+        }
@@ -31,7 +31,7 @@ class InterruptionDetector:
         Check if user is interrupting agent
         
         Args:
-            vad_result: Dict from VAD processor
+            vad_result: VADResult from VAD processor
             agent_is_speaking: Bool indicating if agent is currently speaking
             
         Returns:
@@ -44,7 +44,7 @@ class InterruptionDetector:
             return False
         
         # If VAD is disabled, can't detect interruptions
-        if not vad_result.get("enabled", False):
+        if not vad_result.enabled:
             return False
         
         current_time = time.time() * 1000  # ms
@@ -57,7 +57,7 @@ class InterruptionDetector:
         # 1. Agent is speaking
         # 2. User speech just started (not continuing)
         # 3. Outside cooldown period
-        user_speech_started = vad_result.get("speech_started", False)
+        user_speech_started = vad_result.speech_started
         
         if agent_is_speaking and user_speech_started:
             if in_cooldown:
@@ -73,7 +73,7 @@ class InterruptionDetector:
                 
                 logger.warning(f"🚨 INTERRUPTION #{self.interruption_count} DETECTED")
                 logger.warning(f"   Agent was speaking: {agent_is_speaking}")
-                logger.warning(f"   User confidence: {vad_result.get('confidence', 0):.3f}")
+                logger.warning(f"   User confidence: {vad_result.confidence:.3f}")
                 logger.warning(f"   Time since last: {time_since_last:.0f}ms")
                 
                 return True
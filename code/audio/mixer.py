@@ -0,0 +1,83 @@
+"""
+Vectorized PCM mixer - sums any number of int16 layers with per-layer gain
+Length matching, gain and clamping are all array operations (no per-sample Python)
+"""
+import numpy as np
+
+INT16_MIN = -32768
+INT16_MAX = 32767
+
+
+def fit_length(samples, length):
+    """
+    Match a layer to the target length
+
+    Short layers are looped (same as the old bytes repetition), long layers are
+    truncated. Truncation returns a view, so the common case does not copy.
+    """
+    current = len(samples)
+    if current == length:
+        return samples
+    if current > length:
+        return samples[:length]
+    if current == 0:
+        return np.zeros(length, dtype=samples.dtype)
+    return np.resize(samples, length)
+
+
+def mix(layers, gains=None, length=None, out=None, scratch=None):
+    """
+    Mix int16 PCM layers into one int16 buffer
+
+    Args:
+        layers: sequence of int16 arrays (or PCM bytes); None entries are skipped
+        gains: per-layer gain, defaults to 1.0 for every layer
+        length: output length in samples, defaults to the first layer's length
+        out: optional preallocated int16 array of `length` samples
+        scratch: optional float32 work buffer of shape (2, >= length); when given
+            the mix allocates no arrays
+
+    Returns:
+        int16 NumPy array with the clamped sum
+    """
+    if gains is None:
+        gains = [1.0] * len(layers)
+
+    active = [
+        (np.frombuffer(layer, dtype=np.int16) if not isinstance(layer, np.ndarray) else layer, gain)
+        for layer, gain in zip(layers, gains)
+        if layer is not None and len(layer) > 0 and gain != 0.0
+    ]
+
+    if length is None:
+        length = len(active[0][0]) if active else 0
+
+    if out is None:
+        out = np.empty(length, dtype=np.int16)
+
+    if not active:
+        out[:] = 0
+        return out
+
+    # Single unity-gain layer: nothing to sum or clamp
+    if len(active) == 1 and active[0][1] == 1.0:
+        out[:] = fit_length(active[0][0], length)
+        return out
+
+    if scratch is None:
+        scratch = np.empty((2, length), dtype=np.float32)
+    acc = scratch[0, :length]
+    work = scratch[1, :length]
+
+    acc.fill(0.0)
+    for samples, gain in active:
+        samples = fit_length(samples, length)
+        if gain == 1.0:
+            acc += samples
+        else:
+            np.multiply(samples, np.float32(gain), out=work)
+            acc += work
+
+    np.clip(acc, INT16_MIN, INT16_MAX, out=acc)
+    out[:] = acc  # float -> int16 truncates toward zero, like int()
+    return out
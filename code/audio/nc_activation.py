@@ -0,0 +1,186 @@
+"""
+Per-call noise suppression activation from the measured noise floor
+The noise floor is the minimum frame level (dBFS) over a sliding ~2s window -
+speech has pauses, background noise does not - and the speech level is an
+average of frames well above it; their difference is the line's SNR.
+Suppression runs only while the floor is above the configured level, with
+hysteresis (on both the floor and the clean-line SNR check) and a minimum hold
+time so it does not flap. Frames of a line with suppression off still go
+through the suppressor's one-hop timeline (bypass_chunk), so switching is a
+crossfade, not a jump
+"""
+import logging
+import time
+from collections import deque
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MIN_WINDOW_FRAMES = 20      # Frames per minimum-statistics sub-window (400ms)
+MIN_WINDOWS = 5             # Sub-windows searched for the floor (2s)
+FLOOR_SMOOTH = 0.1          # Per-frame smoothing of the floor towards the window minimum
+SPEECH_MARGIN_DB = 10.0     # Frames this far above the floor count towards the speech level
+SPEECH_TRACK = 0.05         # Speech level EMA rate
+SILENCE_DB = -96.0          # Level reported for digital silence
+
+
+class NoiseActivationController:
+    """Per-call on/off decision for noise suppression"""
+
+    def __init__(self, on_db=-50.0, hysteresis_db=6.0, max_snr_db=35.0, hold_frames=100, warmup_frames=25):
+        """
+        Args:
+            on_db: noise floor (dBFS) at/above which suppression turns on
+            hysteresis_db: floor must drop this far below on_db to turn it off
+            max_snr_db: lines whose speech is this far above the floor stay off (0 = ignore SNR);
+                an active line only counts as clean again hysteresis_db above it
+            hold_frames: minimum frames between switches
+            warmup_frames: frames measured before the first decision
+        """
+        self.on_db = on_db
+        self.off_db = on_db - hysteresis_db
+        self.hysteresis_db = hysteresis_db
+        self.max_snr_db = max_snr_db
+        self.hold_frames = hold_frames
+        self.warmup_frames = warmup_frames
+
+        self.floor_db = None
+        self.speech_db = None
+        self.window_minima = deque(maxlen=MIN_WINDOWS)
+        self.current_min = None
+        self.window_frames = 0
+        self.active = False
+        self.decided = False
+        self.since_switch = 0
+
+        # Stats
+        self.frames = 0
+        self.active_frames = 0
+        self.switches = 0
+        self.monitor_time = 0.0
+
+        logger.info(f"✅ Adaptive NC: on at {on_db:.0f}dBFS floor, off below {self.off_db:.0f}dBFS, "
+                   f"max SNR {max_snr_db or '-'}dB, hold {hold_frames} frames")
+
+    @property
+    def snr_db(self):
+        if self.floor_db is None or self.speech_db is None:
+            return None
+        return self.speech_db - self.floor_db
+
+    def warm_start(self, floor_db):
+        """Start from a floor measured on a previous call (decides on the first frame)"""
+        if floor_db is None:
+            return
+        self.floor_db = float(floor_db)
+        self.window_minima.append(self.floor_db)
+        self.warmup_frames = 0
+        logger.info(f"🎯 Adaptive NC warm start: floor {self.floor_db:.1f}dBFS")
+
+    def update(self, pcm, features=None):
+        """
+        Measure one frame and return whether suppression should run on it
+
+        Args:
+            pcm: int16 PCM (bytes or numpy array)
+            features: FrameFeatures of this frame (its level is used as is)
+        """
+        start = time.perf_counter()
+        if features is not None:
+            level_db = features.level_db
+        else:
+            if isinstance(pcm, (bytes, bytearray, memoryview)):
+                pcm = np.frombuffer(pcm, dtype=np.int16)
+            samples = pcm.astype(np.float32)
+            power = float(np.dot(samples, samples)) / max(1, len(samples)) / (32768.0 * 32768.0)
+            level_db = float(10.0 * np.log10(power)) if power > 0 else SILENCE_DB
+        self._track(level_db)
+
+        self.frames += 1
+        self.since_switch += 1
+        if self.frames >= self.warmup_frames:
+            self._decide()
+        if self.active:
+            self.active_frames += 1
+
+        self.monitor_time += time.perf_counter() - start
+        return self.active
+
+    def _track(self, level_db):
+        # Minimum statistics: running minimum of the current sub-window and the last few
+        self.current_min = level_db if self.current_min is None else min(self.current_min, level_db)
+        self.window_frames += 1
+        minimum = min(self.current_min, min(self.window_minima, default=self.current_min))
+        if self.window_frames == MIN_WINDOW_FRAMES:
+            self.window_minima.append(self.current_min)
+            self.current_min = None
+            self.window_frames = 0
+
+        if self.floor_db is None:
+            self.floor_db = minimum
+        else:
+            self.floor_db += FLOOR_SMOOTH * (minimum - self.floor_db)
+
+        if level_db >= self.floor_db + SPEECH_MARGIN_DB:
+            if self.speech_db is None:
+                self.speech_db = level_db
+            else:
+                self.speech_db += SPEECH_TRACK * (level_db - self.speech_db)
+
+    def _decide(self):
+        if self.decided and self.since_switch < self.hold_frames:
+            return
+
+        snr = self.snr_db
+        if self.active:
+            clean_line = self._clean_line(snr, self.max_snr_db + self.hysteresis_db)
+            wanted = self.floor_db >= self.off_db and not clean_line
+        else:
+            clean_line = self._clean_line(snr, self.max_snr_db)
+            wanted = self.floor_db >= self.on_db and not clean_line
+
+        if wanted == self.active and self.decided:
+            return
+
+        if self.decided:
+            self.switches += 1
+        logger.info(f"🔇 Noise suppression {'ON' if wanted else 'OFF'}: floor {self.floor_db:.1f}dBFS, "
+                   f"SNR {'-' if snr is None else f'{snr:.1f}dB'}")
+        self.active = wanted
+        self.decided = True
+        self.since_switch = 0
+
+    def _clean_line(self, snr, limit):
+        return bool(self.max_snr_db) and snr is not None and snr >= limit
+
+    def reset(self):
+        """Reset measurements (e.g., between calls)"""
+        self.floor_db = None
+        self.speech_db = None
+        self.window_minima.clear()
+        self.current_min = None
+        self.window_frames = 0
+        self.active = False
+        self.decided = False
+        self.since_switch = 0
+
+    def get_stats(self, nc_frame_ms=None):
+        """
+        Activation statistics
+
+        Args:
+            nc_frame_ms: average noise-suppression cost per frame, adds the estimated CPU saved
+        """
+        stats = {
+            "active": self.active,
+            "frames": self.frames,
+            "active_frames": self.active_frames,
+            "active_ratio": self.active_frames / self.frames if self.frames else 0.0,
+            "switches": self.switches,
+            "floor_db": self.floor_db,
+            "snr_db": self.snr_db,
+            "monitor_ms": self.monitor_time * 1000
+        }
+        if nc_frame_ms is not None:
+            stats["nc_ms_saved"] = (self.frames - self.active_frames) * nc_frame_ms - stats["monitor_ms"]
+        return stats
@@ -0,0 +1,549 @@
+"""
+Process-wide background noise asset cache
+Decoded noise loops are shared read-only across calls; each call only holds a cursor
+
+Assets come from prebuilt files (see build_noise_assets.py) that are memory-mapped,
+so worker processes share the same pages and startup needs no transcoding.
+Runtime FFmpeg decoding of the source mp3 is kept as a fallback.
+
+Every buffer holds the loop followed by a copy of its first WRAP_PADDING_MS,
+so a read that wraps around the loop end is still a plain slice.
+"""
+import os
+import random
+import struct
+import zlib
+import asyncio
+import logging
+import subprocess
+import tempfile
+import threading
+import time
+import wave
+import numpy as np
+from collections import OrderedDict
+from pathlib import Path
+from audio import codec
+from audio.mixer import INT16_MIN, INT16_MAX
+from config import (
+    NOISE_FOLDER, NOISE_CACHE_MAX_ASSETS, NOISE_LOAD_FAILURE_TTL_S, NOISE_VOLUME_STEP, NOISE_SCALED_LEVELS,
+    NOISE_PREBUILT_VERIFY
+)
+
+logger = logging.getLogger(__name__)
+
+WRAP_PADDING_MS = 1000  # Loop start repeated after its end; reads up to this long never copy
+
+_ffmpeg_available = None
+
+
+def ffmpeg_available():
+    """Check FFmpeg once per process (the result is cached)"""
+    global _ffmpeg_available
+    if _ffmpeg_available is None:
+        try:
+            result = subprocess.run(['ffmpeg', '-version'], capture_output=True, timeout=5)
+            _ffmpeg_available = result.returncode == 0
+        except Exception:
+            _ffmpeg_available = False
+    return _ffmpeg_available
+
+
+def wrap_padding(sample_rate, loop_len):
+    """Samples of the loop start repeated after its end"""
+    return min(loop_len, sample_rate * WRAP_PADDING_MS // 1000)
+
+
+def quantize_volume(volume):
+    """Snap a volume to NOISE_VOLUME_STEP so nearby values share one pre-scaled buffer"""
+    if NOISE_VOLUME_STEP <= 0:
+        return float(volume)
+    return round(round(volume / NOISE_VOLUME_STEP) * NOISE_VOLUME_STEP, 6)
+
+
+class NoiseAsset:
+    """
+    Immutable decoded noise loop (int16 PCM + μ-law) shared by all calls.
+    pcm, ulaw and every scaled_pcm buffer are the loop (loop_len samples)
+    followed by its wrap padding
+    """
+
+    __slots__ = ("noise_type", "sample_rate", "pcm", "ulaw", "loop_len", "_scaled", "_scaled_lock")
+
+    def __init__(self, noise_type, sample_rate, pcm, ulaw=None, loop_len=None):
+        """
+        Args:
+            pcm: the loop as int16, or - with loop_len - the loop already followed
+                by its padding (e.g. memory-mapped from a prebuilt file, used as-is)
+            ulaw: μ-law matching pcm (derived if omitted)
+            loop_len: samples in the loop when pcm is already padded
+        """
+        if loop_len is None:
+            pcm = np.asarray(pcm, dtype=np.int16)
+            loop_len = len(pcm)
+            pcm = np.concatenate((pcm, pcm[:wrap_padding(sample_rate, loop_len)]))
+            pcm.flags.writeable = False
+            ulaw = None
+        elif pcm.flags.writeable:
+            pcm = np.array(pcm, dtype=np.int16)
+            pcm.flags.writeable = False
+        if ulaw is None:
+            ulaw = codec.encode(pcm)
+            ulaw.flags.writeable = False
+
+        self.noise_type = noise_type
+        self.sample_rate = sample_rate
+        self.pcm = pcm
+        self.ulaw = ulaw
+        self.loop_len = loop_len
+        self._scaled = OrderedDict()  # quantized volume -> read-only int16 PCM
+        self._scaled_lock = threading.Lock()
+
+    def scaled_pcm(self, volume):
+        """
+        PCM with the volume already applied (int(sample * volume), clamped)
+
+        Buffers are cached per quantized volume and shared by every call using
+        that level, so mixing only needs a slice of the returned array.
+        """
+        level = quantize_volume(volume)
+        if level == 1.0:
+            return self.pcm
+
+        with self._scaled_lock:
+            scaled = self._scaled.get(level)
+            if scaled is not None:
+                self._scaled.move_to_end(level)
+                return scaled
+
+        scaled = self.pcm * np.float32(level)
+        np.clip(scaled, INT16_MIN, INT16_MAX, out=scaled)
+        scaled = scaled.astype(np.int16)  # truncates toward zero, like int()
+        scaled.flags.writeable = False
+
+        with self._scaled_lock:
+            self._scaled[level] = scaled
+            while len(self._scaled) > NOISE_SCALED_LEVELS:
+                self._scaled.popitem(last=False)
+        return scaled
+
+    def __len__(self):
+        return self.loop_len
+
+    @property
+    def padding(self):
+        return len(self.pcm) - self.loop_len
+
+    @property
+    def duration(self):
+        return self.loop_len / self.sample_rate
+
+    @property
+    def nbytes(self):
+        return self.pcm.nbytes + self.ulaw.nbytes + sum(s.nbytes for s in list(self._scaled.values()))
+
+
+class NoiseCursor:
+    """Per-call playback position into a shared NoiseAsset"""
+
+    __slots__ = ("asset", "position")
+
+    def __init__(self, asset, random_start=False):
+        self.asset = asset
+        self.position = random.randrange(len(asset)) if random_start and len(asset) else 0
+
+    def read_pcm(self, num_samples):
+        """Next int16 chunk (a read-only view into the shared loop)"""
+        return self.read(self.asset.pcm, num_samples)
+
+    def read_ulaw(self, num_samples):
+        """Next μ-law chunk as bytes"""
+        return self.read(self.asset.ulaw, num_samples).tobytes()
+
+    def read(self, source, num_samples):
+        """
+        Next chunk from any buffer aligned with the asset (pcm, ulaw or a scaled_pcm
+        buffer - all carry the wrap padding, so wrapping is a plain slice)
+        """
+        data_len = self.asset.loop_len
+        if data_len == 0:
+            return None
+
+        if self.position >= data_len:
+            self.position = 0
+
+        start = self.position
+        self.position = (start + num_samples) % data_len
+        if num_samples <= len(source) - data_len:
+            return source[start:start + num_samples]
+
+        # Longer than the padding (rare) - gather with a copy
+        return source[(start + np.arange(num_samples)) % data_len]
+
+
+# Prebuilt asset file layout (little endian):
+#   64-byte header | int16 PCM (num_samples + padding) | μ-law (num_samples + padding)
+# The padding repeats the loop start (see wrap_padding); the source size / mtime
+# let loaders detect a changed source with a stat instead of reading it
+PREBUILT_MAGIC = b"TNZ1"
+PREBUILT_VERSION = 2
+PREBUILT_DIR = "prebuilt"
+PREBUILT_SUFFIX = ".noise"
+# magic, version, reserved, rate, samples, padding, pcm crc, μ-law crc, source crc, source size, source mtime (ns)
+_HEADER = struct.Struct("<4sHHIIIIIIQQ")
+_HEADER_SIZE = 64
+
+
+def prebuilt_path(noise_folder, noise_type, sample_rate):
+    """Location of the prebuilt asset for a noise type / sample rate"""
+    return Path(noise_folder) / PREBUILT_DIR / f"{noise_type}-{sample_rate}{PREBUILT_SUFFIX}"
+
+
+def source_checksum(source_file):
+    """CRC32 of the source audio file (build time, or when only its mtime changed)"""
+    crc = 0
+    with open(source_file, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            crc = zlib.crc32(block, crc)
+    return crc
+
+
+def source_fingerprint(source_file):
+    """Header fields identifying the source an asset is built from"""
+    stat = os.stat(source_file)
+    return {"source_crc32": source_checksum(source_file), "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns}
+
+
+def write_prebuilt_asset(path, sample_rate, pcm, source=None):
+    """
+    Write int16 PCM (+ wrap padding and derived μ-law) in the prebuilt format, atomically
+
+    Args:
+        source: source_fingerprint() of the file the PCM was decoded from
+    """
+    pcm = np.ascontiguousarray(pcm, dtype=np.int16)
+    padding = wrap_padding(sample_rate, len(pcm))
+    padded = np.concatenate((pcm, pcm[:padding]))
+    ulaw = codec.encode(padded)
+    source = source or {"source_crc32": 0, "source_size": 0, "source_mtime_ns": 0}
+
+    header = _HEADER.pack(
+        PREBUILT_MAGIC, PREBUILT_VERSION, 0, sample_rate, len(pcm), padding,
+        zlib.crc32(padded.tobytes()), zlib.crc32(ulaw.tobytes()),
+        source["source_crc32"], source["source_size"], source["source_mtime_ns"]
+    ).ljust(_HEADER_SIZE, b"\0")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Unique temp file: concurrent builds (or a build racing a deploy) never share one
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(padded.astype('<i2', copy=False).tobytes())
+            f.write(ulaw.tobytes())
+        os.chmod(temp_path, 0o644)  # mkstemp creates 0600; workers may run as another user
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+def read_prebuilt_header(path):
+    """Parse a prebuilt asset header -> dict (raises ValueError if invalid)"""
+    with open(path, 'rb') as f:
+        raw = f.read(_HEADER_SIZE)
+    if len(raw) < _HEADER_SIZE:
+        raise ValueError("truncated header")
+
+    magic, version, _, sample_rate, num_samples, padding, pcm_crc, ulaw_crc, source_crc, source_size, \
+        source_mtime_ns = _HEADER.unpack_from(raw)
+    if magic != PREBUILT_MAGIC or version != PREBUILT_VERSION:
+        raise ValueError(f"unsupported asset format {magic!r} v{version}")
+
+    return {
+        "sample_rate": sample_rate,
+        "num_samples": num_samples,
+        "padding": padding,
+        "pcm_crc32": pcm_crc,
+        "ulaw_crc32": ulaw_crc,
+        "source_crc32": source_crc,
+        "source_size": source_size,
+        "source_mtime_ns": source_mtime_ns
+    }
+
+
+def _source_changed(header, source_file):
+    """
+    The source differs from the one the asset was built from. A stat is enough
+    unless only the mtime moved (e.g. a fresh checkout): then the source is CRC'd
+    """
+    stat = os.stat(source_file)
+    if stat.st_size != header["source_size"]:
+        return True
+    if stat.st_mtime_ns == header["source_mtime_ns"]:
+        return False
+    return source_checksum(source_file) != header["source_crc32"]
+
+
+def load_prebuilt_asset(path, noise_type, sample_rate, verify=NOISE_PREBUILT_VERIFY, source_file=None):
+    """
+    Memory-map a prebuilt asset. Only the header is read: the samples are paged
+    in (and shared between processes) as calls play them
+
+    Args:
+        verify: also check the data checksums - reads the whole file, so it is off
+            at runtime by default (build_noise_assets.py --check does it)
+        source_file: audio file the asset was built from; if it exists, an asset
+            built from different contents is stale
+
+    Returns:
+        NoiseAsset backed by the mapping, or None if missing/invalid/stale
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    try:
+        header = read_prebuilt_header(path)
+        if header["sample_rate"] != sample_rate:
+            logger.error(f"❌ Prebuilt asset {path} is {header['sample_rate']}Hz, expected {sample_rate}Hz")
+            return None
+
+        num_samples, padding = header["num_samples"], header["padding"]
+        total = num_samples + padding
+        if num_samples == 0 or padding > num_samples or path.stat().st_size != _HEADER_SIZE + total * 3:
+            logger.error(f"❌ Prebuilt asset {path} has wrong size")
+            return None
+
+        if source_file is not None and os.path.exists(source_file) and _source_changed(header, source_file):
+            logger.warning(f"⚠️ Prebuilt asset {path} is stale ({source_file} changed) - "
+                           f"ignoring it, rerun build_noise_assets.py")
+            return None
+
+        mapping = np.memmap(path, dtype=np.uint8, mode='r')
+        pcm = mapping[_HEADER_SIZE:_HEADER_SIZE + total * 2].view('<i2')
+        ulaw = mapping[_HEADER_SIZE + total * 2:]
+
+        if verify and (zlib.crc32(pcm) != header["pcm_crc32"] or zlib.crc32(ulaw) != header["ulaw_crc32"]):
+            logger.error(f"❌ Prebuilt asset {path} failed checksum - ignoring it")
+            return None
+
+        return NoiseAsset(noise_type, sample_rate, pcm, ulaw, loop_len=num_samples)
+
+    except Exception as e:
+        logger.error(f"❌ Error mapping prebuilt asset {path}: {e}")
+        return None
+
+
+def decode_noise_file(noise_file, sample_rate):
+    """
+    Decode a noise file to mono int16 PCM at `sample_rate` using FFmpeg
+
+    Blocking - run it off the event loop.
+
+    Returns:
+        int16 numpy array, or None on failure
+    """
+    if not ffmpeg_available():
+        logger.error("❌ FFmpeg not found - install: sudo apt install ffmpeg")
+        return None
+
+    # Create temp WAV
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
+        temp_path = temp_file.name
+
+    try:
+        result = subprocess.run([
+            'ffmpeg', '-i', str(noise_file),
+            '-ar', str(sample_rate),
+            '-ac', '1',
+            '-f', 'wav',
+            '-y',
+            temp_path
+        ], capture_output=True, text=True, timeout=30)
+
+        if result.returncode != 0:
+            logger.error(f"❌ FFmpeg failed: {result.stderr}")
+            return None
+
+        with wave.open(temp_path, 'rb') as wav_file:
+            if wav_file.getnchannels() != 1:
+                logger.error("❌ Must be mono")
+                return None
+
+            if wav_file.getframerate() != sample_rate:
+                logger.error(f"❌ Must be {sample_rate}Hz")
+                return None
+
+            return np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+
+    except subprocess.TimeoutExpired:
+        logger.error("❌ FFmpeg timeout")
+        return None
+    finally:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+
+class NoiseAssetCache:
+    """LRU cache of decoded noise assets keyed by (noise_type, sample_rate)"""
+
+    def __init__(self, max_assets=NOISE_CACHE_MAX_ASSETS, noise_folder=NOISE_FOLDER,
+                 failure_ttl=NOISE_LOAD_FAILURE_TTL_S):
+        self.max_assets = max(1, max_assets)
+        self.noise_folder = noise_folder
+        self.failure_ttl = failure_ttl
+        self._assets = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = {}  # key -> asyncio.Future for loads in flight
+        self._failures = {}  # key -> monotonic time of the last failed load
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_failures = 0
+        self.failure_hits = 0
+        self.prebuilt_loads = 0
+
+    def peek(self, noise_type, sample_rate):
+        """Return a cached asset without loading (None if not cached)"""
+        key = (noise_type, sample_rate)
+        with self._lock:
+            asset = self._assets.get(key)
+            if asset is not None:
+                self._assets.move_to_end(key)
+                self.hits += 1
+            return asset
+
+    def get(self, noise_type, sample_rate):
+        """Return an asset, decoding it in the calling thread if needed (blocking)"""
+        asset = self.peek(noise_type, sample_rate)
+        if asset is not None or self._failed_recently(noise_type, sample_rate):
+            return asset
+        return self._load(noise_type, sample_rate)
+
+    async def aget(self, noise_type, sample_rate):
+        """Return an asset, decoding it in the default executor if needed"""
+        asset = self.peek(noise_type, sample_rate)
+        if asset is not None or self._failed_recently(noise_type, sample_rate):
+            return asset
+
+        # Calls starting at the same time share one load
+        key = (noise_type, sample_rate)
+        pending = self._pending.get(key)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = loop.run_in_executor(None, self._load, noise_type, sample_rate)
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(pending)
+
+    def _load(self, noise_type, sample_rate):
+        """Map (or decode) and insert an asset (runs in whatever thread calls it)"""
+        asset = load_prebuilt_asset(
+            prebuilt_path(self.noise_folder, noise_type, sample_rate), noise_type, sample_rate,
+            source_file=self._source_file(noise_type)
+        )
+        if asset is not None:
+            logger.info(f"✅ Mapped prebuilt noise: {noise_type} @ {sample_rate}Hz, {asset.duration:.1f}s")
+            self.prebuilt_loads += 1
+        else:
+            asset = self._decode_source(noise_type, sample_rate)
+            if asset is None:
+                with self._lock:
+                    self.load_failures += 1
+                    self._failures[(noise_type, sample_rate)] = time.monotonic()
+                logger.warning(f"⚠️ Noise {noise_type} @ {sample_rate}Hz unavailable - "
+                               f"not retrying for {self.failure_ttl:.0f}s")
+                return None
+
+        with self._lock:
+            self._failures.pop((noise_type, sample_rate), None)
+        return self._insert(asset)
+
+    def _failed_recently(self, noise_type, sample_rate):
+        """True if the last load of this asset failed less than failure_ttl ago (already logged)"""
+        key = (noise_type, sample_rate)
+        with self._lock:
+            failed_at = self._failures.get(key)
+            if failed_at is None:
+                return False
+            if time.monotonic() - failed_at >= self.failure_ttl:
+                del self._failures[key]
+                return False
+            self.failure_hits += 1
+            return True
+
+    def _decode_source(self, noise_type, sample_rate):
+        """Fallback: transcode the source mp3 with FFmpeg"""
+        noise_file = self._source_file(noise_type)
+        if not noise_file.exists():
+            logger.error(f"❌ Noise file not found: {noise_file}")
+            return None
+
+        logger.info(f"🔊 Loading: {noise_file} @ {sample_rate}Hz (no prebuilt asset - run build_noise_assets.py)")
+        try:
+            pcm = decode_noise_file(noise_file, sample_rate)
+        except Exception as e:
+            logger.error(f"❌ Error loading {noise_file}: {e}")
+            pcm = None
+
+        if pcm is None or len(pcm) == 0:
+            return None
+
+        asset = NoiseAsset(noise_type, sample_rate, pcm)
+        logger.info(f"✅ Loaded: {len(asset)} samples, {asset.duration:.1f}s (shared)")
+        return asset
+
+    def _source_file(self, noise_type):
+        return Path(self.noise_folder) / f"{noise_type}.mp3"
+
+    def _insert(self, asset):
+        noise_type, sample_rate = asset.noise_type, asset.sample_rate
+        with self._lock:
+            self.misses += 1
+            self._assets[(noise_type, sample_rate)] = asset
+            self._assets.move_to_end((noise_type, sample_rate))
+            while len(self._assets) > self.max_assets:
+                evicted_key, _ = self._assets.popitem(last=False)
+                self.evictions += 1
+                logger.info(f"🗑️ Noise asset evicted: {evicted_key}")
+
+        return asset
+
+    def get_stats(self):
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                "assets": [f"{noise_type}@{rate}" for noise_type, rate in self._assets],
+                "bytes": sum(asset.nbytes for asset in self._assets.values()),
+                "max_assets": self.max_assets,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "load_failures": self.load_failures,
+                "failure_hits": self.failure_hits,
+                "failed_assets": [f"{noise_type}@{rate}" for noise_type, rate in self._failures],
+                "prebuilt_loads": self.prebuilt_loads,
+                "ffmpeg_available": _ffmpeg_available
+            }
+
+
+_noise_asset_cache = None
+
+
+def get_noise_asset_cache():
+    """Get the process-wide noise asset cache"""
+    global _noise_asset_cache
+    if _noise_asset_cache is None:
+        _noise_asset_cache = NoiseAssetCache()
+    return _noise_asset_cache
@@ -1,17 +1,14 @@
 """
-Background noise manager - provides raw chunks for mixing
+Background noise manager - provides raw and volume-scaled chunks for mixing
+Noise data comes from the shared NoiseAssetCache; each manager only owns a cursor
 """
-import os
+import asyncio
 import logging
-import subprocess
-import tempfile
-import wave
-import audioop
 import threading
-import array
-from pathlib import Path
+from audio import codec
+from audio.noise_assets import NoiseCursor, get_noise_asset_cache, ffmpeg_available
 from config import (
-    BG_NOISE_ENABLED, NOISE_TYPE, NOISE_VOLUME, NOISE_FOLDER,
+    BG_NOISE_ENABLED, NOISE_TYPE, NOISE_VOLUME, NOISE_RANDOM_START,
     TELEPHONY_SAMPLE_RATE
 )
 
@@ -21,157 +18,123 @@ logger = logging.getLogger(__name__)
 class NoiseManager:
     """Manages background noise for mixing"""
     
-    def __init__(self):
+    def __init__(self, sample_rate=TELEPHONY_SAMPLE_RATE):
         self.enabled = BG_NOISE_ENABLED
         self.noise_type = NOISE_TYPE
         self.volume = NOISE_VOLUME
-        self.noise_data = None
-        self.current_position = 0
+        self.sample_rate = sample_rate
+        self.cache = get_noise_asset_cache()
+        self.cursor = None
+        self.scaled_pcm = None  # Shared pre-scaled buffer for the current volume
         self.is_running = False
         self.lock = threading.Lock()
+        self._load_task = None  # The one load in flight; switches while it runs are picked up by it
         
         logger.info(f"🔊 NoiseManager: enabled={self.enabled}, "
                    f"type={self.noise_type}, volume={self.volume}")
         
+        # Attach immediately if another call already loaded this noise;
+        # otherwise load() decodes it off the event loop
         if self.enabled:
-            self._load_noise_file()
+            self._attach(self.cache.peek(self.noise_type, self.sample_rate))
     
-    def _load_noise_file(self):
-        """Load noise file using FFmpeg"""
-        try:
-            noise_file = Path(NOISE_FOLDER) / f"{self.noise_type}.mp3"
-            
-            if not noise_file.exists():
-                logger.error(f"❌ Noise file not found: {noise_file}")
-                self.enabled = False
-                return
-            
-            logger.info(f"🔊 Loading: {noise_file}")
-            
-            # Create temp WAV
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_path = temp_file.name
-            
-            try:
-                # Convert with FFmpeg
-                result = subprocess.run([
-                    'ffmpeg', '-i', str(noise_file),
-                    '-ar', str(TELEPHONY_SAMPLE_RATE),
-                    '-ac', '1',
-                    '-f', 'wav',
-                    '-y',
-                    temp_path
-                ], capture_output=True, text=True, timeout=30)
-                
-                if result.returncode != 0:
-                    logger.error(f"❌ FFmpeg failed: {result.stderr}")
-                    self.enabled = False
-                    return
-                
-                # Read WAV file
-                with wave.open(temp_path, 'rb') as wav_file:
-                    if wav_file.getnchannels() != 1:
-                        logger.error("❌ Must be mono")
-                        self.enabled = False
-                        return
-                    
-                    if wav_file.getframerate() != TELEPHONY_SAMPLE_RATE:
-                        logger.error(f"❌ Must be {TELEPHONY_SAMPLE_RATE}Hz")
-                        self.enabled = False
-                        return
-                    
-                    # Read PCM data
-                    pcm_data = wav_file.readframes(wav_file.getnframes())
-                    
-                    # Convert to μ-law
-                    self.noise_data = audioop.lin2ulaw(pcm_data, 2)
-                    
-                    duration = len(pcm_data) / (2 * TELEPHONY_SAMPLE_RATE)
-                    logger.info(f"✅ Loaded: {len(self.noise_data)} bytes, {duration:.1f}s")
-                
-            finally:
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
-                    
-        except subprocess.TimeoutExpired:
-            logger.error("❌ FFmpeg timeout")
-            self.enabled = False
-        except FileNotFoundError:
-            logger.error("❌ FFmpeg not found - install: sudo apt install ffmpeg")
-            self.enabled = False
-        except Exception as e:
-            logger.error(f"❌ Error loading: {e}")
-            import traceback
-            traceback.print_exc()
-            self.enabled = False
+    @property
+    def asset(self):
+        return self.cursor.asset if self.cursor else None
     
-    def _get_noise_chunk(self, chunk_size):
-        """Get noise chunk with looping"""
-        if not self.noise_data:
-            return None
+    def _attach(self, asset):
+        """Point this call's cursor at a shared asset"""
+        if asset is None:
+            self.cursor = None
+            self.scaled_pcm = None
+            return
+        scaled_pcm = asset.scaled_pcm(self.volume)
+        with self.lock:
+            self.cursor = NoiseCursor(asset, random_start=NOISE_RANDOM_START)
+            self.scaled_pcm = scaled_pcm
+    
+    def _rescale(self):
+        """Swap in the pre-scaled buffer for the current volume (cached per level)"""
+        asset = self.asset
+        if asset is None:
+            return
+        scaled_pcm = asset.scaled_pcm(self.volume)
+        with self.lock:
+            self.scaled_pcm = scaled_pcm
+    
+    async def load(self):
+        """Load the current noise type through the shared cache (non-blocking)"""
+        if not self.enabled:
+            return False
         
-        data_len = len(self.noise_data)
+        if self.asset is not None and self.asset.noise_type == self.noise_type:
+            return True
         
-        # Loop if reached end
-        if self.current_position >= data_len:
-            self.current_position = 0
+        return await asyncio.shield(self._start_load())
+    
+    def _start_load(self):
+        """The in-flight load task, started if there is none"""
+        if self._load_task is None or self._load_task.done():
+            self._load_task = asyncio.get_running_loop().create_task(self._load_current())
+        return self._load_task
+    
+    async def _load_current(self):
+        """Load until the asset matches the noise type (it may change while decoding), attach once"""
+        while True:
+            noise_type = self.noise_type
+            asset = await self.cache.aget(noise_type, self.sample_rate)
+            if noise_type != self.noise_type:
+                continue
+            if asset is None:
+                self.enabled = False
+                return False
+            if self.asset is not asset:
+                self._attach(asset)
+            return True
+    
+    def load_blocking(self):
+        """Load the current noise type in the calling thread (no event loop)"""
+        if not self.enabled:
+            return False
         
-        # Get chunk with wrap-around
-        if self.current_position + chunk_size <= data_len:
-            chunk = self.noise_data[self.current_position:self.current_position + chunk_size]
-            self.current_position += chunk_size
-        else:
-            # Wrap around
-            first_part = self.noise_data[self.current_position:]
-            remaining = chunk_size - len(first_part)
-            second_part = self.noise_data[:remaining]
-            chunk = first_part + second_part
-            self.current_position = remaining
+        asset = self.cache.get(self.noise_type, self.sample_rate)
+        if asset is None:
+            self.enabled = False
+            return False
         
-        return chunk
+        self._attach(asset)
+        return True
     
     def get_background_chunk_raw(self, chunk_size):
         """Get RAW background chunk (no volume applied - for mixing)"""
-        if not self.enabled or not self.noise_data:
+        if not self.enabled or self.cursor is None:
             return None
         
         with self.lock:
-            return self._get_noise_chunk(chunk_size)
+            return self.cursor.read_ulaw(chunk_size)
     
-    def get_background_chunk(self, chunk_size):
-        """Get background chunk with volume applied (for separate streaming)"""
-        if not self.enabled or not self.noise_data:
+    def get_background_pcm_chunk(self, num_samples):
+        """Get RAW background chunk as int16 PCM (no volume applied - for PCM mixing)"""
+        if not self.enabled or self.cursor is None:
+            return None
+        
+        with self.lock:
+            return self.cursor.read_pcm(num_samples)
+    
+    def get_scaled_pcm_chunk(self, num_samples):
+        """Get background chunk as int16 PCM with volume applied (a view into the shared buffer)"""
+        if not self.enabled or self.cursor is None or self.scaled_pcm is None:
             return None
         
         with self.lock:
-            noise_chunk = self._get_noise_chunk(chunk_size)
-            
-            if noise_chunk and self.volume > 0:
-                try:
-                    # Convert to PCM
-                    pcm_data = audioop.ulaw2lin(noise_chunk, 2)
-                    samples = array.array('h')
-                    samples.frombytes(pcm_data)
-                    
-                    # Apply volume
-                    volume_adjusted = array.array('h')
-                    for sample in samples:
-                        adjusted = int(sample * self.volume)
-                        adjusted = max(-32768, min(32767, adjusted))
-                        volume_adjusted.append(adjusted)
-                    
-                    # Convert back to μ-law
-                    adjusted_pcm = volume_adjusted.tobytes()
-                    adjusted_mulaw = audioop.lin2ulaw(adjusted_pcm, 2)
-                    return adjusted_mulaw
-                    
-                except Exception as e:
-                    logger.error(f"❌ Error adjusting volume: {e}")
-                    return noise_chunk
-            
-            return noise_chunk
+            return self.cursor.read(self.scaled_pcm, num_samples)
+    
+    def get_background_chunk(self, chunk_size):
+        """Get background chunk with volume applied (for separate streaming)"""
+        pcm_chunk = self.get_scaled_pcm_chunk(chunk_size)
+        if pcm_chunk is None:
+            return None
+        return codec.encode(pcm_chunk).tobytes()
     
     def update_settings(self, noise_type=None, volume=None, enabled=None):
         """Update settings"""
@@ -180,13 +143,27 @@ class NoiseManager:
         
         if volume is not None:
             self.volume = max(0.0, min(10.0, volume))
+            self._rescale()
             logger.info(f"🔊 Volume: {self.volume}")
         
         if noise_type is not None and noise_type != self.noise_type:
             self.noise_type = noise_type
             logger.info(f"🔊 Switching to: {noise_type}")
             if self.enabled:
-                self._load_noise_file()
+                self._switch_noise()
+    
+    def _switch_noise(self):
+        """Swap to the current noise type - cached assets swap instantly"""
+        asset = self.cache.peek(self.noise_type, self.sample_rate)
+        if asset is not None:
+            self._attach(asset)
+            return
+        
+        # Not cached: keep playing the old asset until the new one is decoded
+        try:
+            self._start_load()
+        except RuntimeError:
+            self.load_blocking()
     
     def start(self):
         """Start background noise"""
@@ -204,17 +181,8 @@ class NoiseManager:
             "enabled": self.enabled,
             "noise_type": self.noise_type,
             "volume": self.volume,
-            "ffmpeg_available": self._check_ffmpeg(),
-            "noise_loaded": self.noise_data is not None,
-            "noise_samples": len(self.noise_data) if self.noise_data is not None else 0,
+            "ffmpeg_available": ffmpeg_available(),
+            "noise_loaded": self.asset is not None,
+            "noise_samples": len(self.asset) if self.asset is not None else 0,
             "is_running": self.is_running
-        }
-    
-    def _check_ffmpeg(self):
-        """Check FFmpeg"""
-        try:
-            result = subprocess.run(['ffmpeg', '-version'], 
-                                  capture_output=True, timeout=5)
-            return result.returncode == 0
-        except:
-            return False
\ No newline at end of file
+        }
\ No newline at end of file
@@ -0,0 +1,303 @@
+"""
+Per-caller noise profile cache
+Stationary noise suppression learns a spectral noise profile at the start of
+every call. Profiles are kept in a bounded LRU keyed by caller number (or
+trunk) and persisted to a JSON file, so a returning caller's call starts with
+suppression already active and the profile keeps refining across calls.
+Numbers are only stored as an HMAC under a secret kept outside the cache
+file, and writes are coalesced (at most one per save interval, plus a final
+flush at shutdown)
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import re
+import secrets
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from config import (
+    NC_PROFILE_CACHE_PATH, NC_PROFILE_CACHE_MAX_ENTRIES, NC_PROFILE_CACHE_KEY, NC_PROFILE_CACHE_TTL_HOURS,
+    NC_PROFILE_CACHE_SAVE_INTERVAL_S, NC_PROFILE_CACHE_KEY_SECRET, NC_PROFILE_CACHE_KEY_SECRET_PATH
+)
+
+logger = logging.getLogger(__name__)
+
+ANONYMOUS_NUMBERS = ("", "unknown", "anonymous", "restricted", "private")
+KEY_PATTERN = re.compile(r"^(caller|trunk):[0-9a-f]{64}$")
+SECRET_BYTES = 32
+
+_key_secret = None      # HMAC key for numbers
+_key_persistent = False  # The key survives a restart, so profiles keyed with it may be written to disk
+
+
+def _normalize_number(number):
+    if number is None:
+        return None
+    number = str(number).strip()
+    if number.lower() in ANONYMOUS_NUMBERS:
+        return None
+    digits = re.sub(r"[^\d]", "", number)
+    return digits or None
+
+
+def _read_or_create_secret(path):
+    """Secret from its file, created (owner-only) on first run"""
+    try:
+        with open(path) as f:
+            return bytes.fromhex(f.read().strip())
+    except FileNotFoundError:
+        pass
+
+    secret = secrets.token_bytes(SECRET_BYTES)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another worker created it first
+        with open(path) as f:
+            return bytes.fromhex(f.read().strip())
+    with os.fdopen(fd, "w") as f:
+        f.write(secret.hex())
+    logger.info(f"🔑 Noise profile key secret created: {path}")
+    return secret
+
+
+def _get_key_secret():
+    """
+    (secret, persistent). NC_PROFILE_CACHE_KEY_SECRET if set, else the secret
+    file; if neither works a random per-process secret, which must not be persisted
+    """
+    global _key_secret, _key_persistent
+    if _key_secret is None:
+        if NC_PROFILE_CACHE_KEY_SECRET:
+            _key_secret, _key_persistent = NC_PROFILE_CACHE_KEY_SECRET.encode(), True
+        else:
+            try:
+                _key_secret, _key_persistent = _read_or_create_secret(NC_PROFILE_CACHE_KEY_SECRET_PATH), True
+            except (OSError, ValueError) as e:
+                logger.error(f"❌ No noise profile key secret ({NC_PROFILE_CACHE_KEY_SECRET_PATH}: {e}) - "
+                             f"profiles are kept in memory only")
+                _key_secret, _key_persistent = secrets.token_bytes(SECRET_BYTES), False
+    return _key_secret, _key_persistent
+
+
+def _hash_number(number):
+    """Keyed hash: without the secret a number cannot be recovered by trying every number"""
+    secret, _ = _get_key_secret()
+    return hmac.new(secret, number.encode(), hashlib.sha256).hexdigest()
+
+
+def _key_id():
+    """Fingerprint of the secret, stored with the file so profiles keyed under another secret are dropped"""
+    secret, _ = _get_key_secret()
+    return hmac.new(secret, b"noise-profile-cache", hashlib.sha256).hexdigest()[:16]
+
+
+def profile_key(caller=None, trunk=None, key_by=NC_PROFILE_CACHE_KEY):
+    """
+    Cache key for a call
+
+    Args:
+        caller: remote party's number
+        trunk: our number / line the call came in on
+        key_by: "caller" (falls back to the trunk for anonymous callers) | "trunk"
+    """
+    caller, trunk = _normalize_number(caller), _normalize_number(trunk)
+    if key_by != "trunk" and caller:
+        return f"caller:{_hash_number(caller)}"
+    return f"trunk:{_hash_number(trunk)}" if trunk else None
+
+
+def profile_key_from_plivo(start_data, outbound=False, key_by=NC_PROFILE_CACHE_KEY):
+    """Key from a Plivo stream "start" payload (from/to swap roles on outbound calls)"""
+    from_number, to_number = start_data.get("from"), start_data.get("to")
+    if outbound:
+        return profile_key(caller=to_number, trunk=from_number, key_by=key_by)
+    return profile_key(caller=from_number, trunk=to_number, key_by=key_by)
+
+
+def profile_key_from_maqsam(context, key_by=NC_PROFILE_CACHE_KEY):
+    """Key from a Maqsam session context (caller number only)"""
+    return profile_key(caller=(context or {}).get("caller_number"), key_by=key_by)
+
+
+class NoiseProfileCache:
+    """LRU of noise profiles (NoiseSuppressionProcessor.get_noise_profile dicts) with a JSON file behind it"""
+
+    def __init__(self, path=NC_PROFILE_CACHE_PATH, max_entries=NC_PROFILE_CACHE_MAX_ENTRIES,
+                 ttl_hours=NC_PROFILE_CACHE_TTL_HOURS, save_interval=NC_PROFILE_CACHE_SAVE_INTERVAL_S):
+        # Keys made with a throwaway secret are useless after a restart: never persist them
+        self.path = path if _get_key_secret()[1] else None
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl_hours * 3600
+        self.save_interval = save_interval
+        self._profiles = OrderedDict()  # key -> profile (with "updated" epoch seconds)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # One writer of the file at a time
+        self._dirty = False
+        self._save_task = None
+        self._last_save = 0.0
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+        self.evictions = 0
+        self.saves = 0
+        self.save_errors = 0
+        self.dropped = 0
+
+        self._load()
+        if self._dirty:
+            self.save()  # Don't leave dropped (possibly plaintext) keys on disk until the next store
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            now = time.time()
+            # Files from older versions (plain or unkeyed numbers) or another secret are rewritten
+            same_secret = data.get("key_id") == _key_id()
+            for key, profile in data.get("profiles", []):
+                if not same_secret or not KEY_PATTERN.match(key):
+                    self.dropped += 1
+                elif now - profile.get("updated", 0) <= self.ttl:
+                    self._profiles[key] = profile
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+            if self.dropped:
+                self._dirty = True
+                logger.warning(f"⚠️ Noise profile cache: dropped {self.dropped} profiles with unrecognized keys")
+            logger.info(f"✅ Noise profile cache: {len(self._profiles)} profiles loaded from {self.path}")
+        except Exception as e:
+            logger.error(f"❌ Failed to load noise profile cache {self.path}: {e}")
+
+    def get(self, key):
+        """Profile for a key (None if missing or expired)"""
+        if key is None:
+            return None
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is not None and time.time() - profile.get("updated", 0) > self.ttl:
+                del self._profiles[key]
+                self._dirty = True
+                self.expired += 1
+                profile = None
+            if profile is None:
+                self.misses += 1
+                return None
+            self._profiles.move_to_end(key)
+            self.hits += 1
+            return profile
+
+    def put(self, key, profile):
+        """Store (replace) a call's profile"""
+        if key is None or profile is None:
+            return
+        profile = dict(profile, updated=time.time())
+        with self._lock:
+            self._profiles[key] = profile
+            self._profiles.move_to_end(key)
+            while len(self._profiles) > self.max_entries:
+                evicted_key, _ = self._profiles.popitem(last=False)
+                self.evictions += 1
+                logger.debug(f"🗑️ Noise profile evicted: {evicted_key}")
+            self._dirty = True
+            self.stores += 1
+
+    def save(self):
+        """Write the cache to its file if it changed (atomic replace; blocking)"""
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = list(self._profiles.items())
+                self._dirty = False
+            self._last_save = time.monotonic()
+
+            temp_path = None
+            try:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".noise_profiles.", suffix=".tmp")
+                with os.fdopen(fd, "w") as f:
+                    json.dump({"key_id": _key_id(), "profiles": snapshot}, f, separators=(",", ":"))
+                os.replace(temp_path, self.path)
+                temp_path = None
+                self.saves += 1
+            except Exception as e:
+                with self._lock:
+                    self._dirty = True
+                self.save_errors += 1
+                logger.error(f"❌ Failed to save noise profile cache {self.path}: {e}")
+            finally:
+                if temp_path:
+                    try:
+                        os.unlink(temp_path)
+                    except OSError:
+                        pass
+
+    async def save_async(self):
+        """
+        Schedule a save in the default executor. Calls within one save interval
+        share a single write; returns without waiting for it
+        """
+        if not self.path or (self._save_task and not self._save_task.done()):
+            return
+        self._save_task = asyncio.get_running_loop().create_task(self._deferred_save())
+
+    async def _deferred_save(self):
+        delay = self._last_save + self.save_interval - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await asyncio.get_running_loop().run_in_executor(None, self.save)
+
+    async def flush(self):
+        """Write pending changes now (shutdown)"""
+        if self._save_task and not self._save_task.done():
+            self._save_task.cancel()
+        await asyncio.get_running_loop().run_in_executor(None, self.save)
+
+    def get_stats(self):
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                "profiles": len(self._profiles),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "saves": self.saves,
+                "save_errors": self.save_errors,
+                "dropped": self.dropped,
+                "save_pending": bool(self._save_task and not self._save_task.done()),
+                "path": self.path
+            }
+
+
+_noise_profile_cache = None
+
+
+def get_noise_profile_cache():
+    """Get the process-wide noise profile cache"""
+    global _noise_profile_cache
+    if _noise_profile_cache is None:
+        _noise_profile_cache = NoiseProfileCache()
+    return _noise_profile_cache
+
+
+async def flush_noise_profile_cache():
+    """Write the process-wide cache's pending changes, if it was ever used"""
+    if _noise_profile_cache is not None:
+        await _noise_profile_cache.flush()
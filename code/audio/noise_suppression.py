@@ -0,0 +1,449 @@
+"""
+Real-time noise suppression - streaming STFT spectral gating
+Toggleable via NOISE_CANCELLATION_ENABLED environment variable
+
+Caller audio runs through a sqrt-Hann analysis/synthesis STFT with 50% overlap
+(20ms hop at 8kHz) whose window and overlap-add state persist across frames.
+Each hop's spectrum is gated against a per-bin noise threshold - learned once
+from the first frames (stationary, then refreshed on noise-only hops, or loaded
+from the per-caller profile cache) or tracked continuously (adaptive) - with a
+vectorized soft mask. Output lags input by exactly one hop - also for frames
+that skip suppression (bypass_chunk), which go through the same overlap-add at
+unit gain, so switching between the two paths crossfades over one hop instead
+of repeating or dropping audio
+"""
+import numpy as np
+import logging
+import time
+from audio.frame_features import STFT_HOP_MS, stft_window
+from audio.ring_buffer import PCMRingBuffer
+
+logger = logging.getLogger(__name__)
+
+N_STD_THRESH = 1.5          # Stationary threshold: noise mean + N std (dB, per bin)
+ADAPTIVE_MARGIN_DB = 12.0   # Adaptive threshold above the tracked noise floor
+ADAPTIVE_FALL = 0.1         # Noise floor tracking rate when a bin drops below it
+ADAPTIVE_RISE = 0.01        # ...and when it rises above it (slow, so speech is not learned)
+PROFILE_REFRESH_RATE = 0.01        # Stationary profile EMA rate on noise-only hops (keeps it current)
+PROFILE_REFRESH_MAX_ACTIVE = 0.15  # Noise-only hop: at most this share of bins above threshold
+MASK_SOFT_DB = 6.0          # Width of the mask's 0 -> 1 ramp, starting at the threshold
+MASK_RELEASE = 0.6          # Per-hop decay of the mask (holds speech tails, smooths it over time)
+OVER_SUBTRACTION = 1.5      # Gated bins sit this much below the prop_decrease floor (0.8 -> -17.5dB)
+EPS = 1e-10
+
+
+class NoiseSuppressionProcessor:
+    """Streaming noise suppression with a fixed one-hop latency"""
+
+    def __init__(self, enabled=True, sample_rate=8000, stationary=True,
+                 prop_decrease=0.8, learning_frames=25):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.stationary = stationary
+        self.prop_decrease = prop_decrease
+        self.reduction = prop_decrease if stationary else prop_decrease * 0.75  # Less aggressive for adaptive
+        self.gain_floor = (1.0 - self.reduction) / OVER_SUBTRACTION
+
+        # STFT geometry
+        self.hop = sample_rate * STFT_HOP_MS // 1000
+        self.n_fft = 2 * self.hop
+        self.n_bins = self.n_fft // 2 + 1
+        self.window = stft_window(self.n_fft)
+        self.window_sq = self.window * self.window  # Unit-gain synthesis of bypassed hops (sums to 1)
+
+        # Persistent streaming state
+        self.input = PCMRingBuffer(self.n_fft)
+        self.content_input = PCMRingBuffer(self.n_fft)            # Bypass output, in step with input
+        self.output = PCMRingBuffer(self.n_fft)
+        self.frame = np.zeros(self.n_fft, dtype=np.float32)       # Last n_fft input samples
+        self.content = np.zeros(self.n_fft, dtype=np.float32)     # Last n_fft samples meant for the output
+        self.content_hop = np.zeros(self.hop, dtype=np.float32)
+        self.windowed = np.zeros(self.n_fft, dtype=np.float32)
+        self.ola = np.zeros(self.n_fft, dtype=np.float32)         # Overlap-add accumulator
+        self.hop_buffer = np.zeros(self.hop, dtype=np.float32)
+        self.out_buffer = np.zeros(self.hop, dtype=np.float32)
+        self.pad = np.zeros(self.hop, dtype=np.float32)
+        self.mag_db = np.zeros(self.n_bins, dtype=np.float32)
+        self.mask = np.ones(self.n_bins, dtype=np.float32)
+        self.padding = 0    # Output zero-padded because chunks did not line up with hops
+
+        # Noise profile: per-bin magnitude statistics (dB) -> gate threshold
+        self.profile_sum = np.zeros(self.n_bins, dtype=np.float64)
+        self.profile_sq_sum = np.zeros(self.n_bins, dtype=np.float64)
+        self.profile_hops = 0
+        self.noise_profile = None   # Mean noise magnitude per bin (dB)
+        self.noise_std = None
+        self.threshold_db = None
+        self.profile_source = None  # "learned" | "cache" (stationary)
+        self.frames_processed = 0
+        self.learning_frames = learning_frames if stationary else 0
+
+        # Stats
+        self.total_processed = 0
+        self.errors = 0
+        self.process_time = 0.0  # Time spent in process_chunk (for per-frame cost)
+        self.noise_frames_learned = 0
+        self.hops_processed = 0
+        self.bypassed_hops = 0
+        self.shared_hops = 0    # Hops whose spectrum came from the frame feature stage
+        self.profile_refreshes = 0
+
+        if self.enabled:
+            logger.info(f"✅ Noise suppression loaded: {self.sample_rate}Hz, "
+                       f"{self.n_fft}-point STFT, latency {STFT_HOP_MS}ms")
+            logger.info(f"   Mode: {'Stationary' if self.stationary else 'Adaptive'}")
+            logger.info(f"   Aggressiveness: {self.prop_decrease}")
+            if self.stationary:
+                logger.info(f"   Learning frames: {self.learning_frames}")
+        else:
+            logger.info("🔇 Noise Cancellation: DISABLED (NOISE_CANCELLATION_ENABLED=false)")
+
+    @property
+    def latency_ms(self):
+        """Output delay: one STFT hop, plus padding if chunk sizes are not a multiple of it"""
+        return (self.hop + self.padding) * 1000 / self.sample_rate
+
+    def process_chunk(self, audio_pcm_int16, features=None):
+        """
+        Apply noise reduction to audio chunk
+
+        Args:
+            audio_pcm_int16: PCM int16 audio (bytes or numpy array)
+            features: FrameFeatures of this frame - its samples and STFT are reused
+                when the frame is exactly one hop
+
+        Returns:
+            Processed int16 numpy array of the same length, delayed by one hop
+            (original input if disabled/error)
+        """
+        # If disabled, return original
+        if not self.enabled:
+            return audio_pcm_int16
+
+        start = time.perf_counter()
+        try:
+            if isinstance(audio_pcm_int16, (bytes, bytearray, memoryview)):
+                audio_np = np.frombuffer(audio_pcm_int16, dtype=np.int16)
+            else:
+                audio_np = audio_pcm_int16
+
+            self.frames_processed += 1
+            self.total_processed += 1
+
+            # Build noise profile in early frames (stationary mode) - passed through unchanged
+            learning = self.stationary and self.frames_processed <= self.learning_frames
+            if learning:
+                self._log_learning()
+            elif self.stationary and self.noise_profile is None and self.profile_hops > 0:
+                self._finish_profile()
+
+            if self._shares_frame(audio_np, features):
+                np.copyto(self.hop_buffer, features.samples)
+                self._process_hop(learning, features)
+            else:
+                self.input.write_pcm16(audio_np)
+                self.content_input.write_pcm16(audio_np)
+                while len(self.input) >= self.hop:
+                    self.input.read_into(self.hop_buffer)
+                    self.content_input.skip(self.hop)
+                    self._process_hop(learning)
+
+            out = self._read_output(len(audio_np))
+
+            # Log occasionally
+            if self.total_processed % 500 == 0:
+                logger.info(f"🔇 Noise suppression: {self.total_processed} frames processed, {self.errors} errors")
+
+            return out
+
+        except Exception as e:
+            self.errors += 1
+            if self.errors <= 5:  # Only log first few errors
+                logger.error(f"❌ Noise suppression error: {e}")
+            return audio_pcm_int16  # Return original on error
+
+        finally:
+            self.process_time += time.perf_counter() - start
+
+    def _shares_frame(self, audio_np, features):
+        """The feature stage's STFT is this hop's analysis frame (one aligned hop, nothing pending)"""
+        return (features is not None and len(audio_np) == self.hop and len(self.input) == 0
+                and features.extractor.n_fft == self.n_fft)
+
+    def _push_frame(self, content=None):
+        """Slide the analysis frame (and the output content) by one hop"""
+        self.frame[:-self.hop] = self.frame[self.hop:]
+        self.frame[-self.hop:] = self.hop_buffer
+        self.content[:-self.hop] = self.content[self.hop:]
+        self.content[-self.hop:] = self.hop_buffer if content is None else content
+
+    def _analyze(self):
+        """Spectrum and per-bin magnitude (dB) of the current analysis frame"""
+        np.multiply(self.frame, self.window, out=self.windowed)
+        spectrum = np.fft.rfft(self.windowed)
+        np.abs(spectrum, out=self.mag_db)
+        self.mag_db += EPS
+        np.log10(self.mag_db, out=self.mag_db)
+        self.mag_db *= 20.0
+        return spectrum
+
+    def _process_hop(self, learning, features=None):
+        self._push_frame()
+        if features is None:
+            spectrum = self._analyze()
+        else:
+            spectrum = features.spectrum()
+            np.copyto(self.mag_db, features.magnitude_db())
+            self.shared_hops += 1
+        self.hops_processed += 1
+
+        if learning:
+            self._accumulate_profile()
+        elif not self.stationary:
+            self._track_noise()
+        elif self.noise_profile is not None:
+            self._refresh_profile()
+
+        if self.threshold_db is not None and not learning:
+            spectrum = spectrum * self._gain()  # Not in place: the spectrum may be the shared one
+
+        # Synthesis window + overlap-add
+        frame_out = np.fft.irfft(spectrum, n=self.n_fft).astype(np.float32, copy=False)
+        frame_out *= self.window
+        self._overlap_add(frame_out)
+
+    def _bypass_hop(self, learning, features=None, content=None):
+        """A hop without suppression: analysis only (while learning), unit-gain synthesis of the content"""
+        self._push_frame(content)
+        if learning:
+            if features is None:
+                self._analyze()
+            else:
+                np.copyto(self.mag_db, features.magnitude_db())
+            self._accumulate_profile()
+        self.mask *= MASK_RELEASE  # Speech hold decays as on gated hops
+        self.bypassed_hops += 1
+
+        # analysis window x synthesis window with no spectral change = content x window^2
+        self._overlap_add(self.content * self.window_sq)
+
+    def _overlap_add(self, frame_out):
+        """Add one synthesized frame; the first hop of the accumulator is complete"""
+        self.ola += frame_out
+        self.output.write(self.ola[:self.hop])
+        self.ola[:-self.hop] = self.ola[self.hop:]
+        self.ola[-self.hop:] = 0.0
+
+    def _gain(self):
+        """
+        Soft spectral-gating gain for the current hop (vectorized over bins).
+        Bins at or below the threshold are fully gated; the mask is smoothed over
+        time only - smoothing across bins spread noise into the gaps and pulled
+        speech harmonics down
+        """
+        mask = self.mag_db - self.threshold_db
+        mask *= 1.0 / MASK_SOFT_DB
+        np.clip(mask, 0.0, 1.0, out=mask)
+
+        # Fast attack, slow release across hops
+        self.mask *= MASK_RELEASE
+        np.maximum(mask, self.mask, out=self.mask)
+
+        gain = self.mask * (1.0 - self.gain_floor)
+        gain += self.gain_floor
+        return gain
+
+    def _accumulate_profile(self):
+        self.profile_sum += self.mag_db
+        self.profile_sq_sum += np.square(self.mag_db, dtype=np.float64)
+        self.profile_hops += 1
+
+    def _finish_profile(self):
+        """Precompute the per-bin noise magnitude and gate threshold"""
+        mean = self.profile_sum / self.profile_hops
+        std = np.sqrt(np.maximum(self.profile_sq_sum / self.profile_hops - mean * mean, 0.0))
+        self.noise_profile = mean.astype(np.float32)
+        self.noise_std = std.astype(np.float32)
+        self.threshold_db = self.noise_profile + N_STD_THRESH * self.noise_std
+        self.profile_source = "learned"
+        logger.info(f"🎯 Noise profile created from {self.profile_hops} STFT frames")
+
+    def _refresh_profile(self):
+        """Stationary mode: fold noise-only hops into the profile (EMA of mean / variance)"""
+        if np.count_nonzero(self.mag_db > self.threshold_db) > PROFILE_REFRESH_MAX_ACTIVE * self.n_bins:
+            return
+        delta = self.mag_db - self.noise_profile
+        variance = np.square(self.noise_std)
+        variance += PROFILE_REFRESH_RATE * np.square(delta)
+        variance *= 1.0 - PROFILE_REFRESH_RATE
+        self.noise_profile += PROFILE_REFRESH_RATE * delta
+        np.sqrt(variance, out=self.noise_std)
+        np.multiply(self.noise_std, N_STD_THRESH, out=self.threshold_db)
+        self.threshold_db += self.noise_profile
+        self.profile_refreshes += 1
+
+    def get_noise_profile(self):
+        """Current stationary noise profile as a JSON-friendly dict (None until one exists)"""
+        if not self.stationary or self.noise_profile is None:
+            return None
+        return {
+            "sample_rate": self.sample_rate,
+            "n_bins": self.n_bins,
+            "hops": self.profile_hops + self.profile_refreshes,
+            "mean_db": np.round(self.noise_profile, 2).tolist(),
+            "std_db": np.round(self.noise_std, 2).tolist()
+        }
+
+    def load_noise_profile(self, profile):
+        """
+        Warm-start from a stored profile (get_noise_profile output): skips the
+        learning phase, suppression is active from the first frame
+
+        Returns:
+            True if the profile was applied
+        """
+        if not self.enabled or not self.stationary or not profile:
+            return False
+        if profile.get("sample_rate") != self.sample_rate or profile.get("n_bins") != self.n_bins:
+            logger.warning(f"⚠️ Ignoring noise profile for {profile.get('sample_rate')}Hz / "
+                           f"{profile.get('n_bins')} bins")
+            return False
+
+        self.noise_profile = np.array(profile["mean_db"], dtype=np.float32)
+        self.noise_std = np.array(profile["std_db"], dtype=np.float32)
+        self.threshold_db = self.noise_profile + N_STD_THRESH * self.noise_std
+        self.profile_hops = profile.get("hops", 0)
+        self.frames_processed = max(self.frames_processed, self.learning_frames)
+        self.profile_source = "cache"
+        logger.info(f"🎯 Noise profile loaded ({self.profile_hops} STFT frames) - learning skipped")
+        return True
+
+    def _track_noise(self):
+        """Adaptive mode: follow the noise floor per bin (falls fast, rises slowly)"""
+        if self.noise_profile is None:
+            self.noise_profile = self.mag_db.copy()
+            self.threshold_db = self.noise_profile + ADAPTIVE_MARGIN_DB
+            return
+        delta = self.mag_db - self.noise_profile
+        delta *= np.where(delta < 0, ADAPTIVE_FALL, ADAPTIVE_RISE).astype(np.float32)
+        self.noise_profile += delta
+        np.add(self.noise_profile, ADAPTIVE_MARGIN_DB, out=self.threshold_db)
+
+    def _read_output(self, n):
+        if len(self.out_buffer) < n:
+            self.out_buffer = np.zeros(n, dtype=np.float32)
+        out = self.out_buffer[:n]
+
+        # Chunks not aligned to hops: pad once to the worst case (hop - 1 samples),
+        # the extra delay then stays constant
+        missing = n - len(self.output)
+        if missing > 0:
+            missing = max(missing, self.hop - 1 - self.padding)
+            if len(self.pad) < missing:
+                self.pad = np.zeros(missing, dtype=np.float32)
+            self.output.write(self.pad[:missing])
+            self.padding += missing
+
+        self.output.read_into(out)
+        return np.clip(out * 32768.0, -32768, 32767).astype(np.int16)
+
+    def _log_learning(self):
+        # Log learning progress
+        if self.frames_processed == 1:
+            logger.info(f"🎯 Learning noise profile for {self.learning_frames} frames...")
+        elif self.frames_processed == self.learning_frames:
+            logger.info(f"✅ Noise profile learning complete")
+
+    def bypass_chunk(self, audio_pcm_int16, features=None, output=None):
+        """
+        A frame that skips suppression (NC off for the line, or VAD-first
+        non-speech): it slides the analysis window, is added to the noise
+        profile while still learning, and comes out on the same one-hop
+        timeline as denoised frames (no FFT), so path switches crossfade
+
+        Args:
+            audio_pcm_int16: caller PCM int16 (bytes or numpy array)
+            features: FrameFeatures of this frame
+            output: what to emit for this frame instead of the caller audio
+                (e.g. the gate's attenuated frame), same length
+
+        Returns:
+            int16 numpy array of the same length, delayed by one hop
+            (the output/caller audio unchanged if disabled)
+        """
+        if not self.enabled:
+            return audio_pcm_int16 if output is None else output
+
+        if isinstance(audio_pcm_int16, (bytes, bytearray, memoryview)):
+            audio_pcm_int16 = np.frombuffer(audio_pcm_int16, dtype=np.int16)
+        if isinstance(output, (bytes, bytearray, memoryview)):
+            output = np.frombuffer(output, dtype=np.int16)
+
+        learning = self.stationary and self.frames_processed < self.learning_frames
+        if learning:
+            self.frames_processed += 1
+            self.noise_frames_learned += 1
+            self._log_learning()
+
+        if self._shares_frame(audio_pcm_int16, features):
+            np.copyto(self.hop_buffer, features.samples)
+            content = None
+            if output is not None:
+                np.multiply(output, np.float32(1.0 / 32768), out=self.content_hop)
+                content = self.content_hop
+            self._bypass_hop(learning, features, content)
+        else:
+            self.input.write_pcm16(audio_pcm_int16)
+            self.content_input.write_pcm16(audio_pcm_int16 if output is None else output)
+            while len(self.input) >= self.hop:
+                self.input.read_into(self.hop_buffer)
+                self.content_input.read_into(self.content_hop)
+                self._bypass_hop(learning, content=self.content_hop)
+
+        return self._read_output(len(audio_pcm_int16))
+
+    def get_frame_cost_ms(self):
+        """Average cost of one process_chunk call"""
+        return self.process_time / self.total_processed * 1000 if self.total_processed else 0.0
+
+    def reset(self):
+        """Reset noise suppression state (e.g., between calls)"""
+        self.input.clear()
+        self.content_input.clear()
+        self.output.clear()
+        self.frame[:] = 0.0
+        self.content[:] = 0.0
+        self.ola[:] = 0.0
+        self.mask[:] = 1.0
+        self.padding = 0
+        self.profile_sum[:] = 0.0
+        self.profile_sq_sum[:] = 0.0
+        self.profile_hops = 0
+        self.noise_profile = None
+        self.noise_std = None
+        self.threshold_db = None
+        self.profile_source = None
+        self.profile_refreshes = 0
+        self.frames_processed = 0
+        logger.info("🔄 Noise suppression state reset")
+
+    def get_status(self):
+        """Get noise suppression status"""
+        return {
+            "enabled": self.enabled,
+            "stationary": self.stationary,
+            "prop_decrease": self.prop_decrease,
+            "learning_frames": self.learning_frames,
+            "frames_processed": self.frames_processed,
+            "total_processed": self.total_processed,
+            "errors": self.errors,
+            "noise_profile_ready": self.noise_profile is not None,
+            "profile_source": self.profile_source,
+            "profile_refreshes": self.profile_refreshes,
+            "noise_frames_learned": self.noise_frames_learned,
+            "fft_size": self.n_fft,
+            "shared_hops": self.shared_hops,
+            "bypassed_hops": self.bypassed_hops,
+            "latency_ms": self.latency_ms,
+            "frame_cost_ms": self.get_frame_cost_ms()
+        }
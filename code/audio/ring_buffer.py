@@ -0,0 +1,95 @@
+"""
+Fixed-capacity float32 ring buffer for streaming PCM
+Incoming int16 frames are normalized straight into the ring and read back one
+analysis window at a time into a caller-owned array, so the steady state
+allocates nothing
+"""
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INT16_SCALE = np.float32(1.0 / 32768.0)
+
+
+class PCMRingBuffer:
+    """Float32 sample ring; only grows (and counts it) if a frame does not fit"""
+
+    def __init__(self, capacity):
+        self.buffer = np.zeros(capacity, dtype=np.float32)
+        self.read_pos = 0
+        self.count = 0
+
+        # Stats
+        self.grows = 0
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self):
+        return len(self.buffer)
+
+    def write_pcm16(self, samples):
+        """Append int16 samples, normalized to float32 [-1, 1]"""
+        self._write(samples, INT16_SCALE)
+
+    def write(self, samples):
+        """Append float32 samples as they are"""
+        self._write(samples, None)
+
+    def _write(self, samples, scale):
+        n = len(samples)
+        if self.count + n > len(self.buffer):
+            self._grow(self.count + n)
+
+        capacity = len(self.buffer)
+        start = (self.read_pos + self.count) % capacity
+        first = min(n, capacity - start)
+        self._store(samples[:first], scale, self.buffer[start:start + first])
+        if first < n:
+            self._store(samples[first:], scale, self.buffer[:n - first])
+        self.count += n
+
+    @staticmethod
+    def _store(samples, scale, out):
+        if scale is None:
+            out[:] = samples
+        else:
+            np.multiply(samples, scale, out=out)
+
+    def read_into(self, out):
+        """Move len(out) samples into out (caller checks len(self) first)"""
+        n = len(out)
+        capacity = len(self.buffer)
+        first = min(n, capacity - self.read_pos)
+        out[:first] = self.buffer[self.read_pos:self.read_pos + first]
+        if first < n:
+            out[first:] = self.buffer[:n - first]
+        self.read_pos = (self.read_pos + n) % capacity
+        self.count -= n
+
+    def skip(self, n):
+        """Drop the oldest n samples (caller checks len(self) first)"""
+        self.read_pos = (self.read_pos + n) % len(self.buffer)
+        self.count -= n
+
+    def clear(self):
+        """Drop buffered samples (capacity is kept)"""
+        self.read_pos = 0
+        self.count = 0
+
+    def _grow(self, needed):
+        capacity = len(self.buffer)
+        while capacity < needed:
+            capacity *= 2
+
+        count = self.count
+        grown = np.zeros(capacity, dtype=np.float32)
+        self.read_into(grown[:count])
+        self.buffer = grown
+        self.read_pos = 0
+        self.count = count
+
+        self.grows += 1
+        logger.debug(f"PCM ring buffer grown to {capacity} samples")
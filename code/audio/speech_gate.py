@@ -0,0 +1,140 @@
+"""
+VAD-first gate for the user audio path
+A cheap energy VAD on the raw PCM (its own, or the shared frame-feature
+stage's) decides which frames need noise suppression;
+non-speech frames go out attenuated (or as comfort noise at the line's noise
+level) without paying for the STFT denoiser
+"""
+import logging
+import time
+import numpy as np
+from audio.energy_vad import EnergyVADProcessor
+
+logger = logging.getLogger(__name__)
+
+GATE_THRESHOLD = 0.3        # Lower than the main VAD - a missed speech frame costs more than a denoised silence
+NOISE_LEVEL_TRACK = 0.05    # EMA rate for the non-speech RMS used by comfort noise
+NONSPEECH_MODES = ("attenuate", "comfort_noise")
+
+
+class SpeechFirstGate:
+    """Per-call raw-PCM speech decision with hangover, plus the non-speech frame output"""
+
+    def __init__(self, mode="attenuate", gain_db=-12.0, hangover_frames=15, sample_rate=8000):
+        """
+        Args:
+            mode: "attenuate" (scaled input) | "comfort_noise" (white noise at the tracked level)
+            gain_db: level of non-speech output relative to the input / noise level
+            hangover_frames: frames kept on the speech path after the last speech decision
+            sample_rate: PCM sample rate
+        """
+        if mode not in NONSPEECH_MODES:
+            logger.warning(f"⚠️ Unknown non-speech mode '{mode}' - using attenuate")
+            mode = "attenuate"
+
+        self.mode = mode
+        self.gain = np.float32(10 ** (gain_db / 20))
+        self.hangover_frames = hangover_frames
+        self.vad = EnergyVADProcessor(threshold=GATE_THRESHOLD, sample_rate=sample_rate)
+
+        self.hangover = 0
+        self.last_speech = False
+        self.noise_rms = 0.0
+        self.rng = np.random.default_rng()
+
+        # Stats
+        self.frames = 0
+        self.speech_frames = 0
+        self.bypassed_frames = 0
+        self.decision_time = 0.0
+        self.output_time = 0.0
+
+        logger.info(f"✅ VAD-first NC gate: non-speech={mode} ({gain_db:.0f}dB), hangover={hangover_frames} frames")
+
+    def is_speech(self, pcm, features=None):
+        """
+        Decide whether this frame goes through noise suppression
+
+        Args:
+            pcm: int16 PCM (bytes or numpy array)
+            features: FrameFeatures of this frame - its shared activity decision
+                replaces the gate's own energy VAD
+        """
+        start = time.perf_counter()
+        if features is not None:
+            activity = features.activity
+        else:
+            windows = self.vad.windows_processed
+            result = self.vad.process_chunk(pcm)
+            activity = result.is_speech if self.vad.windows_processed != windows else None
+
+        # Frames that complete no window keep the previous decision
+        if activity is not None:
+            self.last_speech = activity
+
+        if self.last_speech:
+            self.hangover = self.hangover_frames
+        elif self.hangover > 0:
+            self.hangover -= 1
+
+        speech = self.last_speech or self.hangover > 0
+        self.frames += 1
+        if speech:
+            self.speech_frames += 1
+        self.decision_time += time.perf_counter() - start
+        return speech
+
+    def non_speech_frame(self, pcm, features=None):
+        """Output for a frame that skipped noise suppression (new int16 array)"""
+        start = time.perf_counter()
+        if features is not None:
+            samples = features.samples * np.float32(32768.0)
+        else:
+            if isinstance(pcm, (bytes, bytearray, memoryview)):
+                pcm = np.frombuffer(pcm, dtype=np.int16)
+            samples = pcm.astype(np.float32)
+
+        if self.mode == "comfort_noise":
+            # Stationary noise at the line's background level instead of the real background
+            if features is not None:
+                rms = features.rms * 32768.0
+            else:
+                rms = float(np.sqrt(np.dot(samples, samples) / max(1, len(samples))))
+            if self.noise_rms == 0.0:
+                self.noise_rms = rms
+            else:
+                self.noise_rms += NOISE_LEVEL_TRACK * (rms - self.noise_rms)
+
+            samples = self.rng.standard_normal(len(samples), dtype=np.float32)
+            samples *= np.float32(self.noise_rms)
+        samples *= self.gain
+
+        self.bypassed_frames += 1
+        self.output_time += time.perf_counter() - start
+        return np.clip(samples, -32768, 32767).astype(np.int16)
+
+    def reset(self):
+        """Reset gate state (e.g., between calls)"""
+        self.vad.reset()
+        self.hangover = 0
+        self.last_speech = False
+        self.noise_rms = 0.0
+
+    def get_stats(self, nc_frame_ms=None):
+        """
+        Gate statistics
+
+        Args:
+            nc_frame_ms: average noise-suppression cost per frame, adds the estimated CPU saved
+        """
+        stats = {
+            "mode": self.mode,
+            "frames": self.frames,
+            "speech_frames": self.speech_frames,
+            "bypassed_frames": self.bypassed_frames,
+            "bypass_ratio": self.bypassed_frames / self.frames if self.frames else 0.0,
+            "gate_ms": (self.decision_time + self.output_time) * 1000
+        }
+        if nc_frame_ms is not None:
+            stats["nc_ms_saved"] = self.bypassed_frames * nc_frame_ms - stats["gate_ms"]
+        return stats
@@ -1,11 +1,13 @@
 """
-Telephony Audio Source for processing μ-law audio data
+Telephony Audio Source for processing μ-law (or already decoded PCM) audio data
+Optional inbound DTX (push_pcm only): silent caller frames are not resampled or sent
 """
 import time
-import array
-import audioop
 import logging
+import numpy as np
 from livekit import rtc
+from audio import codec
+from audio.buffer_pool import BufferPool
 from config import TELEPHONY_SAMPLE_RATE, LIVEKIT_SAMPLE_RATE, AUDIO_LOG_FREQUENCY
 
 logger = logging.getLogger(__name__)
@@ -14,7 +16,11 @@ logger = logging.getLogger(__name__)
 class TelephonyAudioSource(rtc.AudioSource):
     """Audio source for processing telephony μ-law audio"""
     
-    def __init__(self):
+    def __init__(self, dtx=None):
+        """
+        Args:
+            dtx: optional InboundDTX deciding which PCM frames reach LiveKit
+        """
         super().__init__(
             sample_rate=LIVEKIT_SAMPLE_RATE,
             num_channels=1
@@ -30,6 +36,11 @@ class TelephonyAudioSource(rtc.AudioSource):
         self.total_bytes_processed = 0
         self.last_audio_time = time.time()
         
+        # Preallocated 8kHz input frames (+ int16 views) reused across pushes
+        self.frame_pool = BufferPool(self._create_input_frame, name="telephony-input-frames")
+        
+        self.dtx = dtx
+        
         logger.info(f"🎤 Audio Source initialized: {TELEPHONY_SAMPLE_RATE}Hz -> {LIVEKIT_SAMPLE_RATE}Hz")
 
     async def push_audio_data(self, mulaw_data):
@@ -48,18 +59,15 @@ class TelephonyAudioSource(rtc.AudioSource):
                 logger.info(f"🎵 [INCOMING] Frame #{self.frame_count}: {len(mulaw_data)} bytes μ-law, "
                            f"Total: {self.total_bytes_processed} bytes")
 
-            # Convert μ-law to 16-bit PCM
-            pcm_data = self._convert_mulaw_to_pcm(mulaw_data)
-            if not pcm_data:
-                return
-            
-            # Convert to samples array
-            samples = self._pcm_to_samples(pcm_data)
-            if not samples:
-                return
-
-            # Create and resample audio frame
-            resampled_frames = self._resample_audio(samples)
+            # Decode μ-law straight into a pooled input frame (no intermediate buffers)
+            num_samples = len(mulaw_data)
+            input_frame, samples = self.frame_pool.acquire(num_samples)
+            try:
+                if not self._convert_mulaw_to_pcm(mulaw_data, samples):
+                    return
+                resampled_frames = self._resample_audio(input_frame)
+            finally:
+                self.frame_pool.release(num_samples, (input_frame, samples))
             
             # Push each resampled frame to LiveKit
             await self._push_resampled_frames(resampled_frames)
@@ -69,19 +77,96 @@ class TelephonyAudioSource(rtc.AudioSource):
             import traceback
             traceback.print_exc()
 
-    def _convert_mulaw_to_pcm(self, mulaw_data):
-        """Convert μ-law to 16-bit PCM"""
+    async def push_pcm(self, pcm_data, features=None):
+        """
+        Process 16-bit PCM at the telephony rate (already decoded and cleaned)
+
+        Skips the μ-law encode/decode round trip, so audio reaching the agent's
+        STT carries no extra companding loss.
+
+        Args:
+            pcm_data: int16 numpy array, or PCM bytes/memoryview
+            features: FrameFeatures of exactly this audio (shared with the DTX decision);
+                None for processed audio, e.g. suppressor output, which lags the raw
+                frame by the suppressor's latency - DTX then measures pcm_data itself
+        """
         try:
-            return audioop.ulaw2lin(mulaw_data, 2)  # 2 bytes per sample (16-bit)
+            if pcm_data is None or len(pcm_data) == 0:
+                logger.warning("⚠️ Received empty PCM data")
+                return
+
+            # Count μ-law-equivalent bytes (one per sample) so stats stay comparable
+            num_samples = len(pcm_data) if isinstance(pcm_data, np.ndarray) else len(pcm_data) // 2
+
+            self.frame_count += 1
+            self.total_bytes_processed += num_samples
+            self.last_audio_time = time.time()
+
+            if self.frame_count % AUDIO_LOG_FREQUENCY == 0:
+                logger.info(f"🎵 [INCOMING] Frame #{self.frame_count}: {num_samples} samples PCM, "
+                           f"Total: {self.total_bytes_processed} bytes")
+
+            if self.dtx is None:
+                await self._push_pcm_samples(pcm_data)
+                return
+
+            # DTX: nothing during sustained silence, pre-roll + frame when speech resumes
+            samples = self._pcm_to_samples(pcm_data)
+            if samples is None:
+                return
+            for frame in self.dtx.process(samples, features):
+                await self._push_pcm_samples(frame)
+
+        except Exception as e:
+            logger.error(f"❌ Error processing telephony PCM frame {self.frame_count}: {e}")
+            import traceback
+            traceback.print_exc()
+
+    async def _push_pcm_samples(self, pcm_data):
+        """PCM -> pooled input frame -> resampler -> LiveKit"""
+        # Convert to samples array
+        samples = self._pcm_to_samples(pcm_data)
+        if samples is None:
+            return
+
+        # Copy into a pooled input frame and resample
+        num_samples = len(samples)
+        input_frame, frame_samples = self.frame_pool.acquire(num_samples)
+        try:
+            frame_samples[:] = samples
+            resampled_frames = self._resample_audio(input_frame)
+        finally:
+            self.frame_pool.release(num_samples, (input_frame, frame_samples))
+        
+        # Push each resampled frame to LiveKit
+        await self._push_resampled_frames(resampled_frames)
+
+    @staticmethod
+    def _create_input_frame(num_samples):
+        """Allocate an 8kHz input frame and a writable int16 view over its buffer"""
+        input_frame = rtc.AudioFrame.create(
+            sample_rate=TELEPHONY_SAMPLE_RATE,
+            num_channels=1,
+            samples_per_channel=num_samples
+        )
+        return input_frame, np.frombuffer(input_frame.data, dtype=np.int16)
+
+    def _convert_mulaw_to_pcm(self, mulaw_data, out):
+        """Convert μ-law to 16-bit PCM, written into `out`"""
+        try:
+            codec.decode(mulaw_data, out=out)
+            return True
         except Exception as e:
             logger.error(f"❌ μ-law conversion error: {e}, data size: {len(mulaw_data)}")
-            return None
+            return False
 
     def _pcm_to_samples(self, pcm_data):
-        """Convert PCM data to samples array"""
+        """Convert PCM data to an int16 samples array (no copy for bytes or int16 input)"""
         try:
-            samples = array.array("h")  # signed short (16-bit)
-            samples.frombytes(pcm_data)
+            if isinstance(pcm_data, np.ndarray):
+                samples = pcm_data.astype(np.int16, copy=False)
+            else:
+                samples = np.frombuffer(pcm_data, dtype=np.int16)
             
             if len(samples) == 0:
                 logger.warning("⚠️ No samples after PCM conversion")
@@ -97,18 +182,10 @@ class TelephonyAudioSource(rtc.AudioSource):
             logger.error(f"❌ Error converting PCM to samples: {e}")
             return None
 
-    def _resample_audio(self, samples):
+    def _resample_audio(self, input_frame):
         """Resample audio to LiveKit's sample rate"""
         try:
-            # Create input frame for resampling
-            input_frame = rtc.AudioFrame.create(
-                sample_rate=TELEPHONY_SAMPLE_RATE,
-                num_channels=1,
-                samples_per_channel=len(samples)
-            )
-            input_frame.data[:len(samples)] = samples
-
-            # Resample to LiveKit's sample rate
+            # The resampler copies the input synchronously, so the frame can be reused
             return self.resampler.push(input_frame)
         except Exception as e:
             logger.error(f"❌ Error resampling audio: {e}")
@@ -122,20 +199,30 @@ class TelephonyAudioSource(rtc.AudioSource):
             if self.frame_count <= 5:
                 logger.info(f"🔍 Pushed resampled frame {i}: {resampled_frame.samples_per_channel} samples")
 
+    def note_speech(self, user_speaking):
+        """Main VAD state for the call (DTX keeps sending while the user is speaking)"""
+        if self.dtx is not None:
+            self.dtx.note_speech(user_speaking)
+
     def get_stats(self):
         """Get audio processing statistics"""
-        return {
+        stats = {
             "frames_processed": self.frame_count,
             "total_bytes": self.total_bytes_processed,
             "last_audio_ago": time.time() - self.last_audio_time,
-            "avg_bytes_per_frame": self.total_bytes_processed / max(1, self.frame_count)
+            "avg_bytes_per_frame": self.total_bytes_processed / max(1, self.frame_count),
+            "frame_pool": self.frame_pool.get_stats(frames=self.frame_count)
         }
+        if self.dtx is not None:
+            stats["dtx"] = self.dtx.get_stats()
+        return stats
 
     async def cleanup(self):
         """Clean up audio source"""
         try:
             stats = self.get_stats()
             logger.info(f"🧹 Audio source cleanup - Stats: {stats}")
+            self.frame_pool.clear()
             
             if hasattr(self.resampler, 'aclose'):
                 await self.resampler.aclose()
@@ -0,0 +1,429 @@
+"""
+Composable user-audio pipeline (caller → agent)
+Each stage declares the format it takes and produces and whether it can be
+bypassed; a pipeline is an ordered list of stage names (a profile) checked
+for format compatibility and built per call from that call's components.
+The runner times every stage on every frame, so stages can be reordered,
+skipped or swapped for experiments without touching the handler
+"""
+import abc
+import logging
+import time
+from audio import codec
+
+logger = logging.getLogger(__name__)
+
+# Frame formats between stages
+ULAW = "ulaw"       # μ-law bytes as received from telephony
+PCM16 = "pcm16"     # int16 numpy array
+SINK = None         # Consumed (sent to the agent)
+
+ERROR_LOG_INTERVAL = 500  # Log every Nth error of a stage after the first
+
+
+class UserAudioFrame:
+    """
+    One caller frame on its way through the pipeline. The pipeline owns one
+    instance and overwrites it on every frame
+    """
+
+    __slots__ = ("data", "pcm", "features", "nc_skip")
+
+    def __init__(self):
+        self.set(None)
+
+    def set(self, data):
+        self.data = data            # Current payload (format of the last stage run)
+        self.pcm = None             # Decoded caller audio, before any processing
+        self.features = None        # FrameFeatures, if the features stage ran
+        self.nc_skip = None         # Why noise suppression should not run: "inactive" | "non_speech"
+        return self
+
+    def features_for(self, data):
+        """The frame features, if they were computed on exactly this audio"""
+        if self.features is not None and self.features.pcm is data:
+            return self.features
+        return None
+
+
+class PipelineStage(abc.ABC):
+    """Base stage: process() updates the frame in place"""
+
+    name = None
+    input_format = PCM16
+    output_format = PCM16
+    bypassable = True       # Frame may skip the stage (only if it does not change the format)
+    asynchronous = False    # process() returns an awaitable
+
+    def __init__(self):
+        self.bypassed = False
+        self.frames = 0
+        self.bypassed_frames = 0
+        self.errors = 0
+        self.elapsed = 0.0
+        self.max_elapsed = 0.0
+
+    @classmethod
+    def create(cls, components):
+        """Stage for this call, or None if its component is disabled"""
+        return cls()
+
+    @abc.abstractmethod
+    def process(self, frame):
+        """Transform the frame in place (a coroutine for asynchronous stages)"""
+
+    def get_stats(self):
+        return {
+            "name": self.name,
+            "frames": self.frames,
+            "bypassed_frames": self.bypassed_frames,
+            "errors": self.errors,
+            "total_ms": self.elapsed * 1000,
+            "per_frame_us": self.elapsed / self.frames * 1e6 if self.frames else 0.0,
+            "max_us": self.max_elapsed * 1e6
+        }
+
+
+class DecodeStage(PipelineStage):
+    """μ-law → PCM"""
+
+    name = "decode"
+    input_format = ULAW
+    bypassable = False
+
+    def process(self, frame):
+        frame.pcm = frame.data = codec.decode(frame.data)
+
+
+class EncodeStage(PipelineStage):
+    """PCM → μ-law"""
+
+    name = "encode"
+    output_format = ULAW
+    bypassable = False
+
+    def process(self, frame):
+        frame.data = codec.encode(frame.data)
+
+
+class FeatureStage(PipelineStage):
+    """Shared per-frame features for the stages after it"""
+
+    name = "features"
+
+    def __init__(self, extractor):
+        super().__init__()
+        self.extractor = extractor
+
+    @classmethod
+    def create(cls, components):
+        extractor = components.get("feature_extractor")
+        return cls(extractor) if extractor else None
+
+    def process(self, frame):
+        frame.features = self.extractor.extract(frame.data)
+
+
+class NCActivationStage(PipelineStage):
+    """Adaptive NC: marks frames of quiet lines so suppression is skipped"""
+
+    name = "nc_activation"
+
+    def __init__(self, controller, stats):
+        super().__init__()
+        self.controller = controller
+        self.stats = stats
+
+    @classmethod
+    def create(cls, components):
+        controller = components.get("nc_activation")
+        return cls(controller, components["stats"]) if controller else None
+
+    def process(self, frame):
+        if not self.controller.update(frame.data, frame.features_for(frame.data)) and frame.nc_skip is None:
+            frame.nc_skip = "inactive"
+            self.stats["nc_inactive_frames"] += 1
+
+
+class SpeechGateStage(PipelineStage):
+    """VAD-first: non-speech frames are attenuated (or comfort noise) and skip suppression"""
+
+    name = "speech_gate"
+
+    def __init__(self, gate, stats):
+        super().__init__()
+        self.gate = gate
+        self.stats = stats
+
+    @classmethod
+    def create(cls, components):
+        gate = components.get("speech_gate")
+        return cls(gate, components["stats"]) if gate else None
+
+    def process(self, frame):
+        if frame.nc_skip is not None:
+            return
+        features = frame.features_for(frame.data)
+        if not self.gate.is_speech(frame.data, features):
+            frame.data = self.gate.non_speech_frame(frame.data, features)
+            frame.nc_skip = "non_speech"
+            self.stats["nc_bypassed_frames"] += 1
+
+
+class NoiseSuppressionStage(PipelineStage):
+    """
+    Streaming noise suppression. Skipped frames (or the gate's replacement for
+    them) still go through the suppressor's one-hop timeline, so audio stays
+    continuous when a frame switches path
+    """
+
+    name = "noise_suppression"
+
+    def __init__(self, suppressor, stats):
+        super().__init__()
+        self.suppressor = suppressor
+        self.stats = stats
+
+    @classmethod
+    def create(cls, components):
+        suppressor = components.get("noise_suppressor")
+        return cls(suppressor, components["stats"]) if suppressor and suppressor.enabled else None
+
+    def process(self, frame):
+        if frame.nc_skip is not None:
+            pcm = frame.data if frame.pcm is None else frame.pcm
+            output = None if frame.data is pcm else frame.data
+            frame.data = self.suppressor.bypass_chunk(pcm, frame.features_for(pcm), output)
+            return
+        frame.data = self.suppressor.process_chunk(frame.data, frame.features_for(frame.data))
+        self.stats["noise_cancelled_frames"] += 1
+
+
+class VADStage(PipelineStage):
+    """VAD on the audio as it is at this point; results go to the handler's callback"""
+
+    name = "vad"
+
+    def __init__(self, processor, stream, on_result):
+        super().__init__()
+        self.processor = processor
+        self.stream = stream
+        self.on_result = on_result
+        self.asynchronous = stream is None
+
+    @classmethod
+    def create(cls, components):
+        processor = components.get("vad_processor")
+        if not processor or not processor.enabled:
+            return None
+        return cls(processor, components.get("vad_stream"), components["on_vad_result"])
+
+    def process(self, frame):
+        # Untouched frames reuse the float samples the feature stage already converted
+        features = frame.features_for(frame.data)
+        samples = features.samples if features is not None else frame.data
+        if self.stream:
+            self.stream.submit(samples)
+        else:
+            return self._process_async(samples)
+
+    async def _process_async(self, samples):
+        await self.on_result(await self.processor.process_chunk_async(samples))
+
+
+class AgentStage(PipelineStage):
+    """PCM straight to the agent's LiveKit track (inbound DTX applies here)"""
+
+    name = "agent"
+    output_format = SINK
+    bypassable = False
+    asynchronous = True
+
+    def __init__(self, get_audio_source, stats):
+        super().__init__()
+        self.get_audio_source = get_audio_source
+        self.stats = stats
+
+    @classmethod
+    def create(cls, components):
+        return cls(components["get_audio_source"], components["stats"])
+
+    async def process(self, frame):
+        # After noise suppression the data is a different frame (one hop behind the
+        # raw one the features describe), so DTX then measures the audio it sends
+        await self.get_audio_source().push_pcm(frame.data, frame.features_for(frame.data))
+        self.stats["audio_frames_sent_to_livekit"] += 1
+
+
+class AgentULawStage(AgentStage):
+    """μ-law to the agent's LiveKit track (decoded by the audio source, no DTX)"""
+
+    name = "agent_ulaw"
+    input_format = ULAW
+
+    async def process(self, frame):
+        await self.get_audio_source().push_audio_data(frame.data)
+        self.stats["audio_frames_sent_to_livekit"] += 1
+
+
+PIPELINE_STAGES = {
+    stage.name: stage for stage in (
+        DecodeStage, EncodeStage, FeatureStage, NCActivationStage, SpeechGateStage,
+        NoiseSuppressionStage, VADStage, AgentStage, AgentULawStage
+    )
+}
+
+PIPELINE_PROFILES = {
+    # NC on every frame of a noisy line, then VAD on the clean audio
+    "default": ("decode", "features", "nc_activation", "noise_suppression", "vad", "agent"),
+    # Cheap speech decision first, only speech frames are denoised
+    "vad_first": ("decode", "features", "nc_activation", "speech_gate", "noise_suppression", "vad", "agent"),
+    # No noise suppression
+    "no_nc": ("decode", "features", "vad", "agent"),
+    # Original order: denoise every frame, re-encode to μ-law for LiveKit
+    "legacy": ("decode", "noise_suppression", "vad", "encode", "agent_ulaw"),
+    # Caller audio untouched, no VAD (cheapest)
+    "passthrough": ("agent_ulaw",)
+}
+
+DEFAULT_PROFILE = "default"
+
+
+def _check_stages(names):
+    """Raise ValueError unless the stages exist and their formats chain from μ-law to a sink"""
+    current = ULAW
+    for name in names:
+        stage = PIPELINE_STAGES.get(name)
+        if stage is None:
+            raise ValueError(f"unknown stage '{name}'")
+        if current is SINK:
+            raise ValueError(f"'{name}' comes after the sink")
+        if stage.input_format != current:
+            raise ValueError(f"'{name}' takes {stage.input_format}, gets {current}")
+        current = stage.output_format
+    if current is not SINK:
+        raise ValueError("pipeline does not end in a sink")
+
+
+def resolve_pipeline(profile=None, stages=None):
+    """
+    Stage names for a call
+
+    Args:
+        profile: name from PIPELINE_PROFILES
+        stages: explicit stage names (overrides the profile)
+
+    Returns:
+        (profile name, tuple of stage names) - the default profile if the request is invalid
+    """
+    if stages:
+        profile, names = "custom", tuple(stages)
+    elif profile in PIPELINE_PROFILES:
+        names = PIPELINE_PROFILES[profile]
+    else:
+        logger.warning(f"⚠️ Unknown pipeline profile '{profile}' - using {DEFAULT_PROFILE}")
+        return DEFAULT_PROFILE, PIPELINE_PROFILES[DEFAULT_PROFILE]
+
+    try:
+        _check_stages(names)
+    except ValueError as e:
+        logger.error(f"❌ Invalid pipeline {','.join(names)}: {e} - using {DEFAULT_PROFILE}")
+        return DEFAULT_PROFILE, PIPELINE_PROFILES[DEFAULT_PROFILE]
+    return profile, names
+
+
+class UserAudioPipeline:
+    """Per-call runner: one run() per caller frame, every stage timed"""
+
+    def __init__(self, profile, names, components):
+        """
+        Args:
+            profile: profile name (for logs/stats)
+            names: stage names from resolve_pipeline
+            components: the call's stage components - feature_extractor, nc_activation,
+                speech_gate, noise_suppressor, vad_processor, vad_stream, on_vad_result
+                (coroutine), get_audio_source (callable) and stats (the handler's counters)
+        """
+        self.profile = profile
+        self.stages = []
+        self.disabled = []
+        for name in names:
+            stage = PIPELINE_STAGES[name].create(components)
+            if stage is None:
+                self.disabled.append(name)
+            else:
+                self.stages.append(stage)
+        self.frame = UserAudioFrame()
+
+        # Stats
+        self.frames = 0
+        self.elapsed = 0.0
+
+        disabled = f" (disabled: {', '.join(self.disabled)})" if self.disabled else ""
+        logger.info(f"✅ User audio pipeline '{profile}': {' → '.join(self.stage_names)}{disabled}")
+
+    @property
+    def stage_names(self):
+        return [stage.name for stage in self.stages]
+
+    def set_bypass(self, name, bypassed=True):
+        """Skip (or resume) a stage for the rest of the call; False if it is absent or not bypassable"""
+        for stage in self.stages:
+            if stage.name == name:
+                if not stage.bypassable:
+                    logger.warning(f"⚠️ Pipeline stage '{name}' cannot be bypassed")
+                    return False
+                stage.bypassed = bypassed
+                logger.info(f"🔀 Pipeline stage '{name}' {'bypassed' if bypassed else 'resumed'}")
+                return True
+        return False
+
+    async def run(self, data):
+        """
+        Push one caller frame (μ-law bytes) through every stage
+
+        A bypassable stage that fails passes the frame on unchanged; other failures propagate
+        """
+        frame = self.frame.set(data)
+        frame_start = time.perf_counter()
+        for stage in self.stages:
+            if stage.bypassed:
+                stage.bypassed_frames += 1
+                continue
+
+            start = time.perf_counter()
+            try:
+                if stage.asynchronous:
+                    result = stage.process(frame)
+                    if result is not None:
+                        await result
+                else:
+                    stage.process(frame)
+            except Exception as e:
+                if not stage.bypassable:
+                    raise
+                stage.errors += 1
+                if stage.errors == 1 or stage.errors % ERROR_LOG_INTERVAL == 0:
+                    logger.error(f"❌ Pipeline stage '{stage.name}' failed ({stage.errors}x), "
+                                f"frame passed through: {e}")
+
+            elapsed = time.perf_counter() - start
+            stage.frames += 1
+            stage.elapsed += elapsed
+            if elapsed > stage.max_elapsed:
+                stage.max_elapsed = elapsed
+
+        self.frames += 1
+        self.elapsed += time.perf_counter() - frame_start
+        return frame
+
+    def get_stats(self):
+        """Per-stage timing (async stages include time spent waiting)"""
+        return {
+            "profile": self.profile,
+            "stages": [stage.get_stats() for stage in self.stages],
+            "disabled": list(self.disabled),
+            "frames": self.frames,
+            "total_ms": self.elapsed * 1000,
+            "per_frame_us": self.elapsed / self.frames * 1e6 if self.frames else 0.0
+        }
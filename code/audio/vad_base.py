@@ -0,0 +1,280 @@
+"""
+Common streaming VAD front end: window buffering + speech state machine
+Backends only turn one window of float samples into a speech probability;
+every backend returns the same VADResult consumed by the handler and
+InterruptionDetector
+
+Steady state is allocation-free: frames go into a fixed ring buffer, windows are
+copied into one preallocated array and the result object is reused
+"""
+import abc
+import logging
+import time
+import numpy as np
+from audio.ring_buffer import PCMRingBuffer
+
+logger = logging.getLogger(__name__)
+
+RING_WINDOWS = 4  # Ring capacity in windows (a 20ms frame is well under one window)
+
+
+class VADResult:
+    """
+    Outcome of the latest chunk. Each processor owns one instance and overwrites
+    it on every call, so read it before the next process_chunk
+    """
+
+    __slots__ = ("enabled", "is_speech", "confidence", "speech_started", "speech_ended", "user_speaking")
+
+    def __init__(self):
+        self.set(False, False, 0.0, False, False, False)
+
+    def set(self, enabled, is_speech, confidence, speech_started, speech_ended, user_speaking):
+        self.enabled = enabled
+        self.is_speech = is_speech
+        self.confidence = confidence
+        self.speech_started = speech_started
+        self.speech_ended = speech_ended
+        self.user_speaking = user_speaking
+        return self
+
+
+class BaseVADProcessor(abc.ABC):
+    """Streaming VAD with buffering and speech start/end hysteresis"""
+
+    backend = None
+
+    def __init__(self, enabled=True, threshold=0.5, speech_frames=3, silence_frames=10, sample_rate=8000,
+                 window_samples=256):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+
+        # Configuration for interruption detection
+        self.speech_threshold_frames = speech_frames
+        self.silence_threshold_frames = silence_frames
+
+        # Speech detection state
+        self.is_speaking = False
+        self.speech_frames = 0
+        self.silence_frames = 0
+
+        # Audio buffering for the backend's window size
+        self.min_samples = window_samples
+        self.ring = PCMRingBuffer(window_samples * RING_WINDOWS)
+        self.window = np.zeros(window_samples, dtype=np.float32)
+        self.result = VADResult()
+
+        # Set by the backend once it is usable
+        self.model_loaded = False
+
+        # CPU accounting (inference run by this call, not shared batches)
+        self.windows_processed = 0
+        self.inference_time = 0.0
+
+        # Event-loop accounting for the async path
+        self.loop_time = 0.0       # Time the event loop spent in VAD code
+        self.offload_wait = 0.0    # Time spent awaiting off-loop inference
+        self.stale_windows = 0     # Windows past the deadline (history kept, state untouched)
+
+    def process_chunk(self, audio_pcm_int16):
+        """
+        Process audio chunk with buffering for minimum size
+
+        Args:
+            audio_pcm_int16: PCM audio as int16 numpy array or bytes (or FrameFeatures.samples)
+
+        Returns:
+            VADResult (neutral if buffering)
+        """
+        # If disabled, return neutral result
+        if not self.enabled or not self.model_loaded:
+            return self._neutral_result()
+
+        try:
+            # Process buffered audio in chunks (neutral while still buffering)
+            result = self._neutral_result()
+            self._push(audio_pcm_int16)
+
+            while self._next_window():
+                start = time.perf_counter()
+                speech_prob = self._window_probability(self.window)
+                self.inference_time += time.perf_counter() - start
+                self.windows_processed += 1
+
+                is_speech = speech_prob >= self.threshold
+
+                # Update result with this chunk's analysis
+                result = self._update_speech_state(is_speech, speech_prob)
+
+            return result
+
+        except Exception as e:
+            logger.error(f"❌ VAD processing error: {e}")
+            return self._neutral_result()
+
+    async def process_chunk_async(self, audio_pcm_int16, stale=False):
+        """
+        Same as process_chunk, but backends may await inference off the event loop
+
+        Args:
+            audio_pcm_int16: PCM audio as int16 numpy array or bytes (or FrameFeatures.samples)
+            stale: the chunk missed the VAD deadline - its windows only keep the
+                backend's history in step and never change the speech state
+        """
+        if not self.enabled or not self.model_loaded:
+            return self._neutral_result()
+
+        try:
+            start = time.perf_counter()
+            waited = self.offload_wait
+            result = self._neutral_result()
+            self._push(audio_pcm_int16)
+
+            while self._next_window():
+                if stale:
+                    self._skip_window(self.window)
+                    self.stale_windows += 1
+                    continue
+
+                self.windows_processed += 1
+                speech_prob = await self._window_probability_async(self.window)
+                result = self._update_speech_state(speech_prob >= self.threshold, speech_prob)
+
+            self.loop_time += time.perf_counter() - start - (self.offload_wait - waited)
+            return result
+
+        except Exception as e:
+            logger.error(f"❌ VAD processing error: {e}")
+            return self._neutral_result()
+
+    def skip_chunks(self, chunks):
+        """
+        Frames dropped by the VAD deadline, oldest first: no inference and no change to
+        the speech state. Only the audio ending the last complete window is buffered,
+        so the backend's history advances once however long the backlog is
+        """
+        if not self.enabled or not self.model_loaded or not chunks:
+            return
+
+        # Trailing chunks covering two windows: one to skip, plus what is left after it
+        start, samples = len(chunks), 0
+        while start > 0 and samples < 2 * self.min_samples:
+            start -= 1
+            chunk = chunks[start]
+            samples += len(chunk) // 2 if isinstance(chunk, (bytes, bytearray, memoryview)) else len(chunk)
+        if start > 0:
+            self.ring.clear()  # Buffered audio no longer joins up with the kept tail
+
+        skipped = False
+        for chunk in chunks[start:]:
+            self._push(chunk)
+            while self._next_window():
+                self.stale_windows += 1
+                skipped = True
+        if skipped:
+            self._skip_window(self.window)
+
+    @abc.abstractmethod
+    def _window_probability(self, window):
+        """Speech probability for one float32 window (backend specific)"""
+
+    async def _window_probability_async(self, window):
+        """Backends that can run inference off the event loop override this"""
+        start = time.perf_counter()
+        speech_prob = self._window_probability(window)
+        self.inference_time += time.perf_counter() - start
+        return speech_prob
+
+    def _skip_window(self, window):
+        """Window dropped by the deadline policy (backends with history override this)"""
+
+    def _reset_backend(self):
+        """Clear backend state between calls"""
+
+    def _push(self, audio_pcm_int16):
+        """Append a chunk (int16 array, PCM bytes or normalized float32 samples) to the ring buffer"""
+        if isinstance(audio_pcm_int16, (bytes, bytearray, memoryview)):
+            audio_pcm_int16 = np.frombuffer(audio_pcm_int16, dtype=np.int16)
+        if audio_pcm_int16.dtype == np.float32:
+            self.ring.write(audio_pcm_int16)  # Already converted by the frame feature stage
+        else:
+            self.ring.write_pcm16(audio_pcm_int16)
+
+    def _next_window(self):
+        """Move the next complete window into self.window (False while still buffering)"""
+        if len(self.ring) < self.min_samples:
+            return False
+        self.ring.read_into(self.window)
+        return True
+
+    def _update_speech_state(self, is_speech, speech_prob):
+        """Update speech state machine"""
+        speech_started = False
+        speech_ended = False
+
+        if is_speech:
+            self.speech_frames += 1
+            self.silence_frames = 0
+
+            # Detect speech start
+            if not self.is_speaking and self.speech_frames >= self.speech_threshold_frames:
+                self.is_speaking = True
+                speech_started = True
+                logger.info(f"🎤 USER SPEECH STARTED (confidence: {speech_prob:.3f})")
+        else:
+            self.silence_frames += 1
+            self.speech_frames = 0
+
+            # Detect speech end
+            if self.is_speaking and self.silence_frames >= self.silence_threshold_frames:
+                self.is_speaking = False
+                speech_ended = True
+                logger.info(f"🔇 USER SPEECH ENDED")
+
+        return self.result.set(True, is_speech, speech_prob, speech_started, speech_ended, self.is_speaking)
+
+    def _neutral_result(self):
+        """Return neutral result when buffering or disabled"""
+        # Keep current speaking state
+        return self.result.set(self.enabled, False, 0.0, False, False, self.is_speaking)
+
+    def reset(self):
+        """Reset VAD state (e.g., between calls)"""
+        self._reset_backend()
+
+        self.is_speaking = False
+        self.speech_frames = 0
+        self.silence_frames = 0
+        self.ring.clear()
+        logger.info("🔄 VAD state reset")
+
+    def close(self):
+        """Release shared resources held for this call"""
+
+    def get_cpu_stats(self):
+        """Inference CPU attributed to this call"""
+        return {
+            "backend": self.backend,
+            "windows": self.windows_processed,
+            "inference_ms": self.inference_time * 1000,
+            "per_window_us": self.inference_time / self.windows_processed * 1e6 if self.windows_processed else 0.0,
+            "loop_ms": self.loop_time * 1000,
+            "stale_windows": self.stale_windows
+        }
+
+    def get_status(self):
+        """Get VAD status"""
+        return {
+            "backend": self.backend,
+            "enabled": self.enabled,
+            "model_loaded": self.model_loaded,
+            "threshold": self.threshold,
+            "speech_threshold_frames": self.speech_threshold_frames,
+            "silence_threshold_frames": self.silence_threshold_frames,
+            "currently_speaking": self.is_speaking,
+            "buffer_samples": len(self.ring),
+            "buffer_capacity": self.ring.capacity,
+            "buffer_grows": self.ring.grows,
+            "min_samples": self.min_samples
+        }
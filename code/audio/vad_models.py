@@ -0,0 +1,283 @@
+"""
+Process-wide Silero VAD model registry
+Weights are loaded once from a vendored local file (no torch.hub / network) and shared
+by every call; each call only owns its recurrent state and context samples
+
+Single-window inference reuses per-call input/output buffers (bound once), so the
+streaming path does not allocate model inputs per window
+
+Runtimes (VAD_RUNTIME):
+    onnx  - Silero ONNX graph on onnxruntime CPU (models/silero_vad.onnx)
+"""
+import abc
+import hashlib
+import logging
+import os
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from config import VAD_RUNTIME, VAD_MODEL_PATH, VAD_MODEL_SHA256, VAD_INFERENCE_THREADS, VAD_EXECUTOR_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Samples per inference window and context carried between windows (Silero v5)
+WINDOW_SAMPLES = {8000: 256, 16000: 512}
+CONTEXT_SAMPLES = {8000: 32, 16000: 64}
+STATE_SHAPE = (2, 1, 128)
+
+
+def file_sha256(path):
+    """SHA-256 of a file, hex encoded"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def expected_sha256(path):
+    """Configured checksum, or the one stored next to the model as <path>.sha256"""
+    if VAD_MODEL_SHA256:
+        return VAD_MODEL_SHA256.strip().lower()
+    sidecar = Path(f"{path}.sha256")
+    if sidecar.exists():
+        return sidecar.read_text().split()[0].strip().lower()
+    return None
+
+
+class SileroState:
+    """
+    Per-call recurrent state + context (float32 numpy, updated in place - never
+    rebound, since the runtime's I/O buffers point at them) and the runtime's
+    reusable I/O buffers for this call
+    """
+
+    __slots__ = ("sample_rate", "rnn_state", "context", "io")
+
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+        self.rnn_state = np.zeros(STATE_SHAPE, dtype=np.float32)
+        self.context = np.zeros((1, CONTEXT_SAMPLES[sample_rate]), dtype=np.float32)
+        self.io = None  # Created by the model on first single-window inference
+
+    def reset(self):
+        self.rnn_state.fill(0.0)
+        self.context.fill(0.0)
+
+
+class SileroModel(abc.ABC):
+    """Shared Silero VAD weights; inference takes the caller's state explicitly"""
+
+    runtime = None
+
+    def __init__(self, path, sha256):
+        self.path = str(path)
+        self.sha256 = sha256
+
+    def new_state(self, sample_rate):
+        """Fresh state for one call"""
+        if sample_rate not in WINDOW_SAMPLES:
+            raise ValueError(f"Silero VAD supports 8000/16000Hz, got {sample_rate}")
+        return SileroState(sample_rate)
+
+    def skip(self, window, state):
+        """
+        Account for a window that is not run through the model (e.g. gated silence):
+        the context samples still advance so the next inference sees the right history
+        """
+        state.context[0] = window[-CONTEXT_SAMPLES[state.sample_rate]:]
+
+    def _input_buffer(self, state):
+        """Preallocated (1, context + window) model input for one call"""
+        rate = state.sample_rate
+        return np.zeros((1, CONTEXT_SAMPLES[rate] + WINDOW_SAMPLES[rate]), dtype=np.float32)
+
+    @abc.abstractmethod
+    def infer(self, window, state):
+        """
+        Speech probability for one window
+
+        Args:
+            window: float32 array of WINDOW_SAMPLES[state.sample_rate] samples in [-1, 1]
+            state: SileroState for the call (updated in place)
+        """
+
+    @abc.abstractmethod
+    def infer_batch(self, windows, states):
+        """
+        Speech probabilities for one window from each of several calls in a single forward pass
+
+        Args:
+            windows: float32 array (batch, WINDOW_SAMPLES) - row i belongs to states[i]
+            states: SileroStates of the same sample rate (each updated in place)
+
+        Returns:
+            float32 numpy array of probabilities, one per row
+        """
+
+
+class SileroOnnxModel(SileroModel):
+    """Silero ONNX graph on onnxruntime (CPU) - explicit numpy state, no torch"""
+
+    runtime = "onnx"
+
+    def __init__(self, session, path, sha256):
+        super().__init__(path, sha256)
+        self.session = session
+        self._sample_rates = {rate: np.array(rate, dtype=np.int64) for rate in WINDOW_SAMPLES}
+
+    def _bind(self, state):
+        """Bind this call's input, state and output buffers to an onnxruntime IOBinding"""
+        x = self._input_buffer(state)
+        prob = np.zeros((1, 1), dtype=np.float32)
+        rnn_out = np.zeros(STATE_SHAPE, dtype=np.float32)
+
+        binding = self.session.io_binding()
+        for name, array in (("input", x), ("state", state.rnn_state), ("sr", self._sample_rates[state.sample_rate])):
+            binding.bind_input(name, "cpu", 0, array.dtype, list(array.shape), array.ctypes.data)
+        for name, array in (("output", prob), ("stateN", rnn_out)):
+            binding.bind_output(name, "cpu", 0, array.dtype, list(array.shape), array.ctypes.data)
+
+        state.io = (x, prob, rnn_out, binding)
+        return state.io
+
+    def infer(self, window, state):
+        x, prob, rnn_out, binding = state.io or self._bind(state)
+        context_samples = CONTEXT_SAMPLES[state.sample_rate]
+
+        x[0, :context_samples] = state.context[0]
+        x[0, context_samples:] = window
+        self.session.run_with_iobinding(binding)
+
+        state.rnn_state[...] = rnn_out
+        state.context[0] = x[0, -context_samples:]
+        return float(prob[0, 0])
+
+    def infer_batch(self, windows, states):
+        sample_rate = states[0].sample_rate
+        context_samples = CONTEXT_SAMPLES[sample_rate]
+
+        if len(states) == 1:
+            x = np.concatenate((states[0].context, windows), axis=1)
+            rnn_state = states[0].rnn_state
+        else:
+            x = np.concatenate((np.concatenate([s.context for s in states]), windows), axis=1)
+            rnn_state = np.concatenate([s.rnn_state for s in states], axis=1)
+
+        out, rnn_state = self.session.run(
+            None, {"input": x, "state": rnn_state, "sr": self._sample_rates[sample_rate]}
+        )
+
+        for i, state in enumerate(states):
+            state.rnn_state[...] = rnn_state[:, i:i + 1]
+            state.context[0] = x[i, -context_samples:]
+        return out.reshape(-1)
+
+
+def _load_onnx(path, sha256):
+    try:
+        import onnxruntime
+    except ImportError:
+        logger.error("❌ onnxruntime not installed! Install with: pip install onnxruntime")
+        return None
+
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = VAD_INFERENCE_THREADS
+    options.inter_op_num_threads = 1
+    session = onnxruntime.InferenceSession(str(path), sess_options=options, providers=["CPUExecutionProvider"])
+    return SileroOnnxModel(session, path, sha256)
+
+
+_LOADERS = {"onnx": _load_onnx}
+
+
+class SileroModelRegistry:
+    """Loads the Silero model at most once per process"""
+
+    def __init__(self, runtime=VAD_RUNTIME, model_path=VAD_MODEL_PATH):
+        self.runtime = runtime
+        self.model_path = model_path
+        self._model = None
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Shared SileroModel, or None if it cannot be loaded (failure is not retried)"""
+        if self._model is not None or self._failed:
+            return self._model
+
+        with self._lock:
+            if self._model is None and not self._failed:
+                self._model = self._load()
+                self._failed = self._model is None
+        return self._model
+
+    def _load(self):
+        loader = _LOADERS.get(self.runtime)
+        if loader is None:
+            logger.error(f"❌ Unknown VAD_RUNTIME '{self.runtime}' (expected: {', '.join(_LOADERS)})")
+            return None
+
+        path = Path(self.model_path)
+        if not path.exists():
+            logger.error(f"❌ Silero VAD model not found: {path} (set VAD_MODEL_PATH)")
+            return None
+
+        sha256 = file_sha256(path)
+        expected = expected_sha256(path)
+        if expected is None:
+            logger.warning(f"⚠️ No checksum configured for {path} - set VAD_MODEL_SHA256")
+        elif sha256 != expected:
+            logger.error(f"❌ Silero VAD checksum mismatch for {path}: {sha256} != {expected}")
+            return None
+
+        try:
+            logger.info(f"🎤 Loading Silero VAD model: {path} "
+                        f"(runtime={self.runtime}, threads={VAD_INFERENCE_THREADS})")
+            model = loader(path, sha256)
+            if model is not None:
+                logger.info(f"✅ Silero VAD model loaded once for this process (pid {os.getpid()})")
+            return model
+
+        except Exception as e:
+            logger.error(f"❌ Failed to load Silero VAD: {e}")
+            return None
+
+    def get_status(self):
+        """Registry status"""
+        return {
+            "runtime": self.runtime,
+            "model_path": str(self.model_path),
+            "loaded": self._model is not None,
+            "failed": self._failed,
+            "sha256": self._model.sha256 if self._model is not None else None,
+            "inference_threads": VAD_INFERENCE_THREADS
+        }
+
+
+# Global registry (one model per process)
+_silero_registry = SileroModelRegistry()
+
+
+def get_silero_registry():
+    """Process-wide Silero model registry"""
+    return _silero_registry
+
+
+def get_silero_model():
+    """Shared Silero model (loads on first use)"""
+    return _silero_registry.get()
+
+
+# Global inference executor (keeps forward passes off the event loop)
+_vad_executor = None
+
+
+def get_vad_executor():
+    """Process-wide VAD inference thread pool (VAD_EXECUTOR_WORKERS threads, created on first use)"""
+    global _vad_executor
+    if _vad_executor is None:
+        _vad_executor = ThreadPoolExecutor(max_workers=max(1, VAD_EXECUTOR_WORKERS), thread_name_prefix="vad-infer")
+        logger.info(f"🎤 VAD inference executor: {VAD_EXECUTOR_WORKERS} worker(s)")
+    return _vad_executor
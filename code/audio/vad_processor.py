@@ -1,199 +1,236 @@
 """
 Silero VAD with audio buffering for minimum chunk size
 FIXED: Buffers small chunks to meet Silero's 256-sample minimum
+The model is shared process-wide (audio.vad_models); each call owns only its state
+
+create_vad_processor() picks the VAD tier (VAD_BACKEND or per call):
+    silero - neural VAD (shared Silero model, optional cross-call batching)
+    energy - NumPy band-energy / spectral-flatness VAD (no model, ~free)
 """
+import asyncio
 import logging
+import time
 import numpy as np
-from collections import deque
+from audio.vad_base import BaseVADProcessor
+from audio.energy_vad import EnergyVADProcessor
+from audio.vad_models import get_silero_model, get_vad_executor, WINDOW_SAMPLES
+from audio.vad_scheduler import get_vad_scheduler
+from config import (
+    VAD_BACKEND, VAD_GATE_RMS_DB, VAD_GATE_HISS_RMS_DB, VAD_GATE_HISS_ZCR,
+    VAD_GATE_DECAY, VAD_GATE_REFRESH_WINDOWS
+)
 
 logger = logging.getLogger(__name__)
 
 
-class SileroVADProcessor:
+class SileroVADProcessor(BaseVADProcessor):
     """Streaming VAD processor with audio buffering"""
-    
-    def __init__(self, enabled=True, threshold=0.5, speech_frames=3, silence_frames=10, sample_rate=8000):
-        self.enabled = enabled
-        self.sample_rate = sample_rate
-        self.threshold = threshold
-        
-        # Configuration for interruption detection
-        self.speech_threshold_frames = speech_frames
-        self.silence_threshold_frames = silence_frames
-        
-        # Speech detection state
-        self.is_speaking = False
-        self.speech_frames = 0
-        self.silence_frames = 0
-        
-        # Audio buffering for minimum chunk size
+
+    backend = "silero"
+
+    def __init__(self, enabled=True, threshold=0.5, speech_frames=3, silence_frames=10, sample_rate=8000,
+                 batching=False, gate=False, offload=False):
         # Silero needs at least 256 samples (32ms at 8kHz)
-        self.min_samples = 256
-        self.audio_buffer = np.array([], dtype=np.float32)
+        super().__init__(enabled, threshold, speech_frames, silence_frames, sample_rate,
+                         window_samples=WINDOW_SAMPLES.get(sample_rate, 256))
+        self.batching = batching
+        self.offload = offload
         
-        # Model (only load if enabled)
+        # Energy/ZCR pre-gate: obvious silence never reaches the model
+        self.gate = gate
+        self.gate_rms = 10 ** (VAD_GATE_RMS_DB / 20)
+        self.gate_hiss_rms = 10 ** (VAD_GATE_HISS_RMS_DB / 20)
+        self.last_prob = 0.0
+        self.gated_run = 0
+        self.gate_windows = 0
+        self.gated_windows = 0
+        self.gate_refreshes = 0
+        self._signs = np.zeros(self.min_samples, dtype=bool)
+        self._crossings = np.zeros(self.min_samples - 1, dtype=bool)
+
+        # Shared model + this call's recurrent state (only if enabled)
         self.model = None
-        self.model_loaded = False
-        
+        self.model_state = None
+        self.scheduler = None
+        self.executor = None
+
         if self.enabled:
             self._load_model()
         else:
             logger.info("🎤 VAD: DISABLED (VAD_ENABLED=false)")
-    
+
     def _load_model(self):
-        """Load Silero VAD model"""
+        """Attach to the shared Silero VAD model (loaded once per process)"""
         try:
-            import torch
-            
-            logger.info("🎤 Loading Silero VAD model...")
-            
-            # Load Silero VAD model
-            self.model, utils = torch.hub.load(
-                repo_or_dir='snakers4/silero-vad',
-                model='silero_vad',
-                force_reload=False,
-                onnx=False
-            )
-            
+            self.model = get_silero_model()
+            if self.model is None:
+                logger.error("❌ VAD will be disabled")
+                self.enabled = False
+                self.model_loaded = False
+                return
+
+            self.model_state = self.model.new_state(self.sample_rate)
             self.model_loaded = True
-            logger.info(f"✅ Silero VAD loaded: {self.sample_rate}Hz, threshold={self.threshold}")
+
+            # Cross-call batching / inference thread (used by process_chunk_async)
+            if self.batching:
+                self.scheduler = get_vad_scheduler()
+                if self.scheduler:
+                    self.scheduler.register()
+            if self.offload:
+                self.executor = get_vad_executor()
+            logger.info(f"✅ Silero VAD attached: {self.sample_rate}Hz, threshold={self.threshold}")
             logger.info(f"   Min chunk size: {self.min_samples} samples ({self.min_samples/self.sample_rate*1000:.1f}ms)")
             logger.info(f"   Speech trigger: {self.speech_threshold_frames} frames")
             logger.info(f"   Silence trigger: {self.silence_threshold_frames} frames")
-            
-        except ImportError:
-            logger.error("❌ PyTorch not installed! Install with: pip install torch")
-            logger.error("❌ VAD will be disabled")
-            self.enabled = False
-            self.model_loaded = False
+
         except Exception as e:
-            logger.error(f"❌ Failed to load Silero VAD: {e}")
+            logger.error(f"❌ Failed to attach Silero VAD: {e}")
             logger.error("❌ VAD will be disabled")
             self.enabled = False
             self.model_loaded = False
+
+    def _window_probability(self, window):
+        if self._should_skip(window):
+            return self._gated_probability(window)
+        
+        # Shared weights, this call's state
+        self.last_prob = self.model.infer(window, self.model_state)
+        return self.last_prob
     
-    def process_chunk(self, audio_pcm_int16):
+    def _should_skip(self, window):
         """
-        Process audio chunk with buffering for minimum size
-        
-        Args:
-            audio_pcm_int16: PCM audio as int16 numpy array or bytes
-            
-        Returns:
-            dict with VAD result (or neutral if buffering)
+        Gate decision for one window. Every VAD_GATE_REFRESH_WINDOWS-th window of a
+        gated run still goes through the model so the recurrent state keeps tracking
+        the background instead of meeting speech onset cold
         """
-        # If disabled, return neutral result
-        if not self.enabled or not self.model_loaded:
-            return self._neutral_result()
+        if not self._is_gated(window):
+            self.gated_run = 0
+            return False
         
-        try:
-            import torch
-            
-            # Convert to numpy if bytes
-            if isinstance(audio_pcm_int16, bytes):
-                audio_np = np.frombuffer(audio_pcm_int16, dtype=np.int16)
-            else:
-                audio_np = audio_pcm_int16
-            
-            # Normalize to float32 [-1, 1]
-            audio_float = audio_np.astype(np.float32) / 32768.0
-            
-            # Add to buffer
-            self.audio_buffer = np.concatenate([self.audio_buffer, audio_float])
-            
-            # If buffer is still too small, return neutral result
-            if len(self.audio_buffer) < self.min_samples:
-                return self._neutral_result()
-            
-            # Process buffered audio in chunks
-            result = self._neutral_result()
-            
-            while len(self.audio_buffer) >= self.min_samples:
-                # Take minimum chunk size
-                chunk = self.audio_buffer[:self.min_samples]
-                self.audio_buffer = self.audio_buffer[self.min_samples:]
-                
-                # Convert to torch tensor
-                audio_tensor = torch.from_numpy(chunk)
-                
-                # Get VAD probability
-                speech_prob = self.model(audio_tensor, self.sample_rate).item()
-                
-                is_speech = speech_prob >= self.threshold
-                
-                # Update result with this chunk's analysis
-                result = self._update_speech_state(is_speech, speech_prob)
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"❌ VAD processing error: {e}")
-            return self._neutral_result()
+        self.gated_run += 1
+        if self.gated_run % VAD_GATE_REFRESH_WINDOWS == 0:
+            self.gate_refreshes += 1
+            return False
+        return True
     
-    def _update_speech_state(self, is_speech, speech_prob):
-        """Update speech state machine"""
-        speech_started = False
-        speech_ended = False
-        
-        if is_speech:
-            self.speech_frames += 1
-            self.silence_frames = 0
-            
-            # Detect speech start
-            if not self.is_speaking and self.speech_frames >= self.speech_threshold_frames:
-                self.is_speaking = True
-                speech_started = True
-                logger.info(f"🎤 USER SPEECH STARTED (confidence: {speech_prob:.3f})")
-        else:
-            self.silence_frames += 1
-            self.speech_frames = 0
-            
-            # Detect speech end
-            if self.is_speaking and self.silence_frames >= self.silence_threshold_frames:
-                self.is_speaking = False
-                speech_ended = True
-                logger.info(f"🔇 USER SPEECH ENDED")
+    def _is_gated(self, window):
+        """Cheap RMS / zero-crossing check for windows that are clearly not speech"""
+        if not self.gate:
+            return False
         
-        return {
-            "enabled": True,
-            "is_speech": is_speech,
-            "confidence": speech_prob,
-            "speech_started": speech_started,
-            "speech_ended": speech_ended,
-            "user_speaking": self.is_speaking
-        }
+        self.gate_windows += 1
+        rms = np.sqrt(np.dot(window, window) / len(window))
+        if rms < self.gate_rms:
+            return True
+        if rms < self.gate_hiss_rms:
+            # Quiet and noise-like (hiss crosses zero far more often than voiced speech)
+            np.signbit(window, out=self._signs)
+            np.not_equal(self._signs[1:], self._signs[:-1], out=self._crossings)
+            return np.count_nonzero(self._crossings) / len(self._crossings) > VAD_GATE_HISS_ZCR
+        return False
     
-    def _neutral_result(self):
-        """Return neutral result when buffering or disabled"""
+    def _gated_probability(self, window):
+        """Skip inference: probability decays from the last model output, context samples still advance"""
+        self.gated_windows += 1
+        self.model.skip(window, self.model_state)
+        
+        self.last_prob *= VAD_GATE_DECAY
+        return self.last_prob
+
+    async def _window_probability_async(self, window):
+        """
+        Windows go through the cross-call batch scheduler (adds at most
+        VAD_BATCH_MAX_DELAY_MS) or straight to the inference executor; either way
+        the forward pass runs off the event loop when offload is on. The window
+        buffer is not touched again until this returns
+        """
+        if self.scheduler is None and self.executor is None:
+            return await super()._window_probability_async(window)
+
+        if self._should_skip(window):
+            return self._gated_probability(window)
+
+        start = time.perf_counter()
+        if self.scheduler is not None:
+            speech_prob = await self.scheduler.infer(window, self.model_state)
+        else:
+            speech_prob = await asyncio.get_running_loop().run_in_executor(self.executor, self._infer, window)
+        self.offload_wait += time.perf_counter() - start
+
+        self.last_prob = speech_prob
+        return speech_prob
+
+    def _infer(self, window):
+        """One forward pass on this call's state (inference thread)"""
+        start = time.perf_counter()
+        speech_prob = self.model.infer(window, self.model_state)
+        self.inference_time += time.perf_counter() - start
+        return speech_prob
+
+    def _skip_window(self, window):
+        self.model.skip(window, self.model_state)
+
+    def _reset_backend(self):
+        if self.model_state is not None:
+            self.model_state.reset()
+        self.last_prob = 0.0
+        self.gated_run = 0
+
+    def close(self):
+        """Release this call's slot in the batch scheduler"""
+        if self.scheduler is not None:
+            self.scheduler.unregister()
+            self.scheduler = None
+
+    def get_gate_stats(self):
+        """Pre-gate counters - skip_ratio is the share of windows that never ran the model"""
         return {
-            "enabled": self.enabled,
-            "is_speech": False,
-            "confidence": 0.0,
-            "speech_started": False,
-            "speech_ended": False,
-            "user_speaking": self.is_speaking  # Keep current state
+            "enabled": self.gate,
+            "windows": self.gate_windows,
+            "skipped": self.gated_windows,
+            "skip_ratio": self.gated_windows / self.gate_windows if self.gate_windows else 0.0,
+            "refreshes": self.gate_refreshes
         }
     
-    def reset(self):
-        """Reset VAD state (e.g., between calls)"""
-        if self.model_loaded and self.model:
-            self.model.reset_states()
-        
-        self.is_speaking = False
-        self.speech_frames = 0
-        self.silence_frames = 0
-        self.audio_buffer = np.array([], dtype=np.float32)
-        logger.info("🔄 VAD state reset")
+    def get_cpu_stats(self):
+        """Inference CPU attributed to this call (gated windows are nearly free)"""
+        stats = super().get_cpu_stats()
+        stats["gate_skip_ratio"] = self.get_gate_stats()["skip_ratio"]
+        return stats
     
     def get_status(self):
         """Get VAD status"""
-        return {
-            "enabled": self.enabled,
-            "model_loaded": self.model_loaded,
-            "threshold": self.threshold,
-            "speech_threshold_frames": self.speech_threshold_frames,
-            "silence_threshold_frames": self.silence_threshold_frames,
-            "currently_speaking": self.is_speaking,
-            "buffer_samples": len(self.audio_buffer),
-            "min_samples": self.min_samples
-        }
\ No newline at end of file
+        status = super().get_status()
+        status["batching"] = self.scheduler is not None
+        status["offload"] = self.executor is not None
+        status["gate"] = self.get_gate_stats()
+        return status
+
+
+VAD_BACKENDS = {
+    "silero": SileroVADProcessor,
+    "energy": EnergyVADProcessor
+}
+
+
+def create_vad_processor(backend=None, batching=False, gate=False, offload=False, **kwargs):
+    """
+    Build the VAD processor for one call
+
+    Args:
+        backend: "silero" | "energy" (defaults to VAD_BACKEND)
+        batching: cross-call batching (Silero only)
+        gate: energy/ZCR pre-gate in front of the model (Silero only)
+        offload: run inference on the VAD executor, off the event loop (Silero only)
+        **kwargs: enabled, threshold, speech_frames, silence_frames, sample_rate
+    """
+    backend = (backend or VAD_BACKEND).lower()
+    processor_class = VAD_BACKENDS.get(backend)
+    if processor_class is None:
+        logger.warning(f"⚠️ Unknown VAD backend '{backend}' - using {VAD_BACKEND}")
+        processor_class = VAD_BACKENDS.get(VAD_BACKEND, SileroVADProcessor)
+
+    if processor_class is SileroVADProcessor:
+        return SileroVADProcessor(batching=batching, gate=gate, offload=offload, **kwargs)
+    return processor_class(**kwargs)
@@ -0,0 +1,166 @@
+"""
+Cross-call micro-batched VAD scheduler
+Windows submitted by all active calls during a short tick run as one batched
+Silero forward pass; each call gets its probability back through a future.
+With an executor the forward pass runs on an inference thread, not the event loop
+"""
+import asyncio
+import logging
+import time
+from functools import partial
+import numpy as np
+from audio.vad_models import get_silero_model, get_vad_executor
+from config import VAD_BATCH_MAX_DELAY_MS, VAD_BATCH_MAX_SIZE, VAD_OFFLOAD_ENABLED
+
+logger = logging.getLogger(__name__)
+
+
+class VADBatchScheduler:
+    """Collects VAD windows from many calls and runs them in batches"""
+
+    def __init__(self, model, max_delay_ms=VAD_BATCH_MAX_DELAY_MS, max_batch=VAD_BATCH_MAX_SIZE, executor=None):
+        """
+        Args:
+            model: shared SileroModel
+            max_delay_ms: upper bound on the time a window waits for its batch
+            max_batch: flush as soon as this many windows are waiting
+            executor: runs the batched forward pass (None = inline on the event loop)
+        """
+        self.model = model
+        self.executor = executor
+        self.max_delay = max_delay_ms / 1000.0
+        self.max_batch = max_batch
+
+        self._pending = []  # (window, state, future)
+        self._pending_states = set()
+        self._flush_handle = None
+        self._first_enqueued = 0.0
+        self.active_calls = 0
+
+        # Stats
+        self.batches = 0
+        self.windows = 0
+        self.max_batch_seen = 0
+        self.max_wait_ms = 0.0
+        self.inference_time = 0.0
+
+    def register(self):
+        """A call started using the scheduler"""
+        self.active_calls += 1
+
+    def unregister(self):
+        """A call stopped using the scheduler"""
+        self.active_calls = max(0, self.active_calls - 1)
+
+    async def infer(self, window, state):
+        """Speech probability for one window (resolved when its batch runs)"""
+        loop = asyncio.get_running_loop()
+
+        # A call's windows depend on each other's state - never put two in one batch
+        if id(state) in self._pending_states:
+            self.flush()
+
+        future = loop.create_future()
+        if not self._pending:
+            self._first_enqueued = time.perf_counter()
+            self._flush_handle = loop.call_later(self.max_delay, self.flush)
+        self._pending.append((window, state, future))
+        self._pending_states.add(id(state))
+
+        # Flush early once every active call is in (no point waiting) or the batch is full
+        if len(self._pending) >= self.max_batch or len(self._pending) >= self.active_calls:
+            self.flush()
+
+        return await future
+
+    def flush(self):
+        """Run everything that is waiting as one batch per sample rate"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, []
+        self._pending_states.clear()
+        if not pending:
+            return
+
+        self.max_wait_ms = max(self.max_wait_ms, (time.perf_counter() - self._first_enqueued) * 1000)
+
+        by_rate = {}
+        for item in pending:
+            by_rate.setdefault(item[1].sample_rate, []).append(item)
+
+        for items in by_rate.values():
+            if self.executor is not None:
+                done = asyncio.get_running_loop().run_in_executor(self.executor, self._run_batch, items)
+                done.add_done_callback(partial(self._batch_done, items))
+                continue
+
+            try:
+                result = self._run_batch(items)
+            except Exception as e:
+                self._fail(items, e)
+                continue
+            self._deliver(items, *result)
+
+    def _run_batch(self, items):
+        """One forward pass for the batch (inference thread) -> (probs, seconds)"""
+        start = time.perf_counter()
+        windows = np.stack([window for window, _, _ in items])
+        probs = self.model.infer_batch(windows, [state for _, state, _ in items])
+        return probs, time.perf_counter() - start
+
+    def _batch_done(self, items, done):
+        """Executor callback (on the event loop)"""
+        if done.cancelled():
+            self._fail(items, asyncio.CancelledError())
+        elif done.exception() is not None:
+            self._fail(items, done.exception())
+        else:
+            self._deliver(items, *done.result())
+
+    def _fail(self, items, error):
+        logger.error(f"❌ VAD batch failed ({len(items)} windows): {error}")
+        for _, _, future in items:
+            if not future.done():
+                future.set_exception(error)
+
+    def _deliver(self, items, probs, elapsed):
+        """Resolve the batch's futures"""
+        for (_, _, future), prob in zip(items, probs):
+            if not future.done():
+                future.set_result(float(prob))
+
+        self.inference_time += elapsed
+        self.batches += 1
+        self.windows += len(items)
+        self.max_batch_seen = max(self.max_batch_seen, len(items))
+
+    def get_stats(self):
+        """Scheduler statistics"""
+        return {
+            "active_calls": self.active_calls,
+            "batches": self.batches,
+            "windows": self.windows,
+            "avg_batch_size": self.windows / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "max_wait_ms": self.max_wait_ms,
+            "max_delay_ms": self.max_delay * 1000,
+            "offloaded": self.executor is not None,
+            "inference_time_s": self.inference_time
+        }
+
+
+# Global scheduler (created on first use, once the shared model is available)
+_vad_scheduler = None
+
+
+def get_vad_scheduler():
+    """Process-wide VAD batch scheduler, or None if the model is unavailable"""
+    global _vad_scheduler
+    if _vad_scheduler is None:
+        model = get_silero_model()
+        if model is None:
+            return None
+        _vad_scheduler = VADBatchScheduler(model, executor=get_vad_executor() if VAD_OFFLOAD_ENABLED else None)
+    return _vad_scheduler
@@ -0,0 +1,137 @@
+"""
+Per-call VAD stream - keeps VAD out of the inbound audio path
+Frames are queued without waiting; one task per call feeds them to the VAD
+processor in order (inference runs on the VAD executor) and hands each result
+back to the handler's callback on the event loop. The queue holds at most one
+deadline of frames: once it is full, or the oldest frame is past the deadline,
+the whole stale backlog is skipped in one go (no inference, the VAD history
+advances once), so falling behind never compounds
+"""
+import asyncio
+import logging
+import math
+import time
+from config import VAD_DEADLINE_MS
+
+logger = logging.getLogger(__name__)
+
+FRAME_MS = 20  # One submit() per telephony frame
+
+
+class VADStream:
+    """Ordered per-call VAD queue with a staleness deadline"""
+
+    def __init__(self, processor, on_result, deadline_ms=VAD_DEADLINE_MS):
+        """
+        Args:
+            processor: the call's VAD processor
+            on_result: async callable(VADResult), awaited for every fresh frame
+            deadline_ms: frames older than this when dequeued only advance VAD history;
+                also bounds the queue (deadline_ms / FRAME_MS frames)
+        """
+        self.processor = processor
+        self.on_result = on_result
+        self.deadline = deadline_ms / 1000.0
+
+        self.queue = asyncio.Queue(maxsize=max(1, math.ceil(deadline_ms / FRAME_MS)))
+        self.backlog = []  # Stale frames (oldest first) waiting to be skipped by the stream task
+        self.task = None
+        self.closed = False
+
+        # Stats
+        self.frames_submitted = 0
+        self.frames_processed = 0
+        self.stale_frames = 0
+        self.overflows = 0
+        self.backlog_skips = 0
+        self.max_queue_depth = 0
+        self.total_latency = 0.0
+        self.max_latency_ms = 0.0
+
+    def submit(self, pcm):
+        """Queue one frame of PCM (never blocks)"""
+        if self.closed:
+            return
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+        if self.queue.full():
+            # A full queue is a deadline's worth of frames behind: all of it is stale
+            self._drain_stale(None)
+            self.overflows += 1
+        self.queue.put_nowait((time.perf_counter(), pcm))
+        self.frames_submitted += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    def _drain_stale(self, max_age):
+        """Move queued frames older than max_age (all if None, oldest first) to the backlog; newer ones stay queued"""
+        now = time.perf_counter()
+        fresh = []
+        while not self.queue.empty():
+            enqueued, pcm = self.queue.get_nowait()
+            if not fresh and (max_age is None or now - enqueued > max_age):
+                self.backlog.append(pcm)
+            else:
+                fresh.append((enqueued, pcm))
+        for item in fresh:
+            self.queue.put_nowait(item)
+
+    def _skip_backlog(self):
+        """One history update for every stale frame (runs between inferences, in order)"""
+        self.processor.skip_chunks(self.backlog)
+        self.stale_frames += len(self.backlog)
+        self.backlog_skips += 1
+        if self.backlog_skips % 50 == 1:
+            logger.warning(f"⚠️ VAD behind deadline ({self.deadline * 1000:.0f}ms): skipped {len(self.backlog)} "
+                           f"frames ({self.stale_frames} total), queue depth {self.queue.qsize()}")
+        self.backlog.clear()
+
+    async def _run(self):
+        while True:
+            if self.backlog:
+                self._skip_backlog()
+            enqueued, pcm = await self.queue.get()
+
+            try:
+                if time.perf_counter() - enqueued > self.deadline:
+                    self.backlog.append(pcm)
+                    self._drain_stale(self.deadline)
+                    continue
+
+                result = await self.processor.process_chunk_async(pcm)
+                latency = time.perf_counter() - enqueued
+                self.frames_processed += 1
+                self.total_latency += latency
+                self.max_latency_ms = max(self.max_latency_ms, latency * 1000)
+
+                await self.on_result(result)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ VAD stream error: {e}")
+
+    async def close(self):
+        """Stop the stream; queued frames are dropped"""
+        self.closed = True
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    def get_stats(self):
+        """Queue / latency statistics"""
+        return {
+            "frames_submitted": self.frames_submitted,
+            "frames_processed": self.frames_processed,
+            "stale_frames": self.stale_frames,
+            "backlog_skips": self.backlog_skips,
+            "overflows": self.overflows,
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "avg_latency_ms": self.total_latency / self.frames_processed * 1000 if self.frames_processed else 0.0,
+            "max_latency_ms": self.max_latency_ms,
+            "deadline_ms": self.deadline * 1000
+        }
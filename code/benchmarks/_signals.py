@@ -0,0 +1,65 @@
+"""
+Synthetic telephony signals shared by the benchmarks
+
+A call is white noise with a 1.5s synthetic vowel every 5 seconds (from 2s),
+so every benchmark sees the same speech/noise layout for a given seed
+"""
+import numpy as np
+
+SAMPLE_RATE = 8000
+FRAME_SAMPLES = 160  # 20ms
+VOWEL_STARTS_EVERY = 5  # Seconds
+VOWEL_FIRST_START = 2
+VOWEL_SECONDS = 1.5
+VOWEL_LEVEL = 0.3
+
+
+def voiced(num_samples, f0=120.0, formants=((700, 110), (1200, 120), (2600, 160)), sample_rate=SAMPLE_RATE):
+    """Synthetic vowel: glottal pulse train through three formant resonators"""
+    signal = np.zeros(num_samples)
+    signal[::int(sample_rate / f0)] = 1.0
+    for centre, bandwidth in formants:
+        r = np.exp(-np.pi * bandwidth / sample_rate)
+        a1, a2 = -2 * r * np.cos(2 * np.pi * centre / sample_rate), r * r
+        out = np.zeros(num_samples)
+        prev1 = prev2 = 0.0
+        for i in range(num_samples):
+            prev2, prev1 = prev1, signal[i] - a1 * prev1 - a2 * prev2
+            out[i] = prev1
+        signal = out
+    return signal / np.abs(signal).max()
+
+
+def vowel_starts(seconds):
+    """Start of each vowel in a call, in seconds"""
+    return range(VOWEL_FIRST_START, seconds, VOWEL_STARTS_EVERY)
+
+
+def vowel_track(seconds, sample_rate=SAMPLE_RATE):
+    """The call's speech alone (float, full scale 1.0)"""
+    track = np.zeros(sample_rate * seconds)
+    vowel = voiced(int(sample_rate * VOWEL_SECONDS), sample_rate=sample_rate) * VOWEL_LEVEL
+    for start in vowel_starts(seconds):
+        segment = track[start * sample_rate:start * sample_rate + len(vowel)]
+        segment[:] = vowel[:len(segment)]
+    return track
+
+
+def call_audio(rng, seconds, noise_level, sample_rate=SAMPLE_RATE):
+    """One call as int16: the vowel track plus white noise of the given level"""
+    noisy = vowel_track(seconds, sample_rate) + rng.standard_normal(sample_rate * seconds) * noise_level
+    return (np.clip(noisy, -1, 1) * 32767).astype(np.int16)
+
+
+def vowel_frames(seconds, frame_samples=FRAME_SAMPLES, sample_rate=SAMPLE_RATE):
+    """Ground truth per frame: True inside a vowel"""
+    frames_per_second = sample_rate // frame_samples
+    truth = np.zeros(seconds * frames_per_second, dtype=bool)
+    for start in vowel_starts(seconds):
+        truth[start * frames_per_second:int((start + VOWEL_SECONDS) * frames_per_second)] = True
+    return truth
+
+
+def split_frames(audio, frame_samples=FRAME_SAMPLES):
+    """Views of consecutive frames"""
+    return [audio[i:i + frame_samples] for i in range(0, len(audio), frame_samples)]
@@ -0,0 +1,75 @@
+"""
+μ-law codec benchmark - audio.codec vs audioop (when the interpreter still has it)
+
+Run from the code/ directory:
+    python -m benchmarks.bench_codec
+"""
+import time
+import warnings
+import numpy as np
+
+from audio import codec
+
+try:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        import audioop
+except ImportError:
+    audioop = None
+
+FRAME_SAMPLES = 160  # 20ms at 8kHz
+FRAMES = 20000
+BATCH = 500
+
+
+def _rate(fn, frames):
+    """Run fn over every frame and return frames/sec"""
+    start = time.perf_counter()
+    for frame in frames:
+        fn(frame)
+    return len(frames) / (time.perf_counter() - start)
+
+
+def _batch_rate(fn, frames, batch):
+    """Run fn over stacked batches and return frames/sec"""
+    stacked = [frames[i:i + batch] for i in range(0, len(frames), batch)]
+    start = time.perf_counter()
+    for chunk in stacked:
+        fn(chunk)
+    return len(frames) / (time.perf_counter() - start)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    pcm = (rng.standard_normal(FRAMES * FRAME_SAMPLES) * 4000).clip(-32768, 32767).astype(np.int16)
+    pcm_frames = [pcm[i * FRAME_SAMPLES:(i + 1) * FRAME_SAMPLES].tobytes() for i in range(FRAMES)]
+    ulaw_frames = [codec.lin2ulaw(frame) for frame in pcm_frames]
+    pcm_arrays = np.frombuffer(b"".join(pcm_frames), dtype=np.int16).reshape(FRAMES, FRAME_SAMPLES)
+    ulaw_arrays = np.frombuffer(b"".join(ulaw_frames), dtype=np.uint8).reshape(FRAMES, FRAME_SAMPLES)
+
+    results = [
+        ("codec.ulaw2lin (bytes)", _rate(codec.ulaw2lin, ulaw_frames)),
+        ("codec.lin2ulaw (bytes)", _rate(codec.lin2ulaw, pcm_frames)),
+        ("codec.decode (array)", _rate(codec.decode, ulaw_arrays)),
+        ("codec.encode (array)", _rate(codec.encode, pcm_arrays)),
+        (f"codec.decode batch={BATCH}", _batch_rate(codec.decode, ulaw_arrays, BATCH)),
+        (f"codec.encode batch={BATCH}", _batch_rate(codec.encode, pcm_arrays, BATCH)),
+    ]
+
+    if audioop is not None:
+        assert all(codec.ulaw2lin(f) == audioop.ulaw2lin(f, 2) for f in ulaw_frames[:100])
+        assert all(codec.lin2ulaw(f) == audioop.lin2ulaw(f, 2) for f in pcm_frames[:100])
+        results += [
+            ("audioop.ulaw2lin", _rate(lambda f: audioop.ulaw2lin(f, 2), ulaw_frames)),
+            ("audioop.lin2ulaw", _rate(lambda f: audioop.lin2ulaw(f, 2), pcm_frames)),
+        ]
+    else:
+        print("audioop not available on this interpreter - skipping baseline")
+
+    print(f"{FRAMES} frames of {FRAME_SAMPLES} samples")
+    for name, rate in results:
+        print(f"  {name:<28} {rate:>14,.0f} frames/sec")
+
+
+if __name__ == "__main__":
+    main()
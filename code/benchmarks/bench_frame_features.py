@@ -0,0 +1,82 @@
+"""
+Frame feature benchmark - user-audio path with and without shared features
+
+Runs 20ms telephony frames through the same stages as the handler's
+_handle_user_audio (adaptive NC activation, VAD-first gate, noise
+suppression, inbound DTX and the energy VAD) twice: once with every stage
+measuring the frame itself, once with one FeatureExtractor per frame whose
+level, activity, float samples and STFT are shared. Reports CPU per frame,
+checks both runs produce the same audio before the DTX and how many frames
+the DTX sends (with shared features it decides on the raw frame's activity
+instead of the denoised one, so the counts may differ slightly).
+Run from the code/ directory:
+    python -m benchmarks.bench_frame_features
+"""
+import logging
+import time
+import numpy as np
+
+from audio.frame_features import FeatureExtractor
+from audio.noise_suppression import NoiseSuppressionProcessor
+from audio.nc_activation import NoiseActivationController
+from audio.speech_gate import SpeechFirstGate
+from audio.dtx import InboundDTX
+from audio.vad_processor import create_vad_processor
+from benchmarks._signals import SAMPLE_RATE, FRAME_SAMPLES, call_audio, split_frames
+
+SECONDS = 60
+NOISE_LEVEL = 0.02
+RUNS = 5  # Best of
+
+
+def _user_path(frames, shared):
+    """One call through the user-audio stages; returns (clean frames, frames sent, CPU seconds)"""
+    extractor = FeatureExtractor(sample_rate=SAMPLE_RATE, activity=True) if shared else None
+    suppressor = NoiseSuppressionProcessor(sample_rate=SAMPLE_RATE)
+    activation = NoiseActivationController(on_db=-60.0)
+    gate = SpeechFirstGate(sample_rate=SAMPLE_RATE)
+    dtx = InboundDTX(sample_rate=SAMPLE_RATE)
+    vad = create_vad_processor(backend="energy", sample_rate=SAMPLE_RATE)
+
+    out = []
+    sent = 0
+    start = time.process_time()
+    for pcm in frames:
+        features = extractor.extract(pcm) if shared else None
+        if not activation.update(pcm, features):
+            clean = suppressor.bypass_chunk(pcm, features)
+        elif not gate.is_speech(pcm, features):
+            clean = suppressor.bypass_chunk(pcm, features, gate.non_speech_frame(pcm, features))
+        else:
+            clean = suppressor.process_chunk(pcm, features)
+        vad.process_chunk(features.samples if shared and clean is pcm else clean)
+        sent += len(dtx.process(clean, features))
+        out.append(clean)
+    return out, sent, time.process_time() - start
+
+
+def main():
+    logging.disable(logging.INFO)
+    frames = split_frames(call_audio(np.random.default_rng(0), SECONDS, NOISE_LEVEL))
+    print(f"{SECONDS}s call, noise {NOISE_LEVEL}, {len(frames)} frames of {FRAME_SAMPLES} samples")
+
+    # Alternate the two variants so both see the same machine load
+    variants = (("per-stage analysis", False), ("shared features", True))
+    results = {}
+    for _ in range(RUNS):
+        for name, shared in variants:
+            out, sent, cpu = _user_path(frames, shared)
+            if name not in results or cpu < results[name][2]:
+                results[name] = (out, sent, cpu)
+
+    for name, (out, sent, cpu) in results.items():
+        print(f"  {name:20s} {cpu / len(frames) * 1e6:7.1f} µs/frame   {cpu / SECONDS * 100:6.3f}% of a core per call   "
+              f"DTX sent {sent} frames")
+
+    (base, _, base_cpu), (shared, _, shared_cpu) = results.values()
+    identical = len(base) == len(shared) and all(np.array_equal(a, b) for a, b in zip(base, shared))
+    print(f"  saved {(1 - shared_cpu / base_cpu) * 100:.1f}% CPU, output identical: {identical}")
+
+
+if __name__ == "__main__":
+    main()
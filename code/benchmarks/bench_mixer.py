@@ -0,0 +1,74 @@
+"""
+Mixer benchmark - per-frame cost of agent + background mixing
+
+Compares the old per-sample array.array loop with audio.mixer.mix.
+Run from the code/ directory:
+    python -m benchmarks.bench_mixer
+"""
+import array
+import time
+import numpy as np
+
+from audio import codec, mixer
+
+FRAME_SAMPLES = 160  # 20ms at 8kHz
+FRAMES = 5000
+BG_VOLUME = 0.15
+
+
+def legacy_mix(agent_mulaw, background_mulaw, bg_volume=BG_VOLUME):
+    """Reference copy of the pre-vectorization AudioProcessor.mix_audio_chunks"""
+    agent_samples = array.array('h')
+    bg_samples = array.array('h')
+    agent_samples.frombytes(codec.ulaw2lin(agent_mulaw))
+    bg_samples.frombytes(codec.ulaw2lin(background_mulaw))
+
+    mixed_samples = array.array('h')
+    for i in range(len(agent_samples)):
+        mixed_sample = agent_samples[i] + int(bg_samples[i] * bg_volume)
+        mixed_samples.append(max(-32768, min(32767, mixed_sample)))
+    return codec.lin2ulaw(mixed_samples.tobytes())
+
+
+def vectorized_mix(agent_mulaw, background_mulaw, bg_volume=BG_VOLUME):
+    """Same operation through audio.mixer"""
+    mixed = mixer.mix([codec.decode(agent_mulaw), codec.decode(background_mulaw)],
+                      gains=[1.0, bg_volume])
+    return codec.encode(mixed).tobytes()
+
+
+def _per_frame_us(fn, agent_frames, bg_frames):
+    start = time.perf_counter()
+    for agent, bg in zip(agent_frames, bg_frames):
+        fn(agent, bg)
+    return (time.perf_counter() - start) / len(agent_frames) * 1e6
+
+
+def main():
+    rng = np.random.default_rng(0)
+
+    def frames(scale):
+        pcm = (rng.standard_normal((FRAMES, FRAME_SAMPLES)) * scale).clip(-32768, 32767).astype(np.int16)
+        return [codec.encode(row).tobytes() for row in pcm]
+
+    agent_frames = frames(6000)
+    bg_frames = frames(3000)
+
+    legacy_us = _per_frame_us(legacy_mix, agent_frames, bg_frames)
+    vector_us = _per_frame_us(vectorized_mix, agent_frames, bg_frames)
+
+    # Mix-only cost (PCM in, PCM out) with three layers to show multi-input scaling
+    layers = [codec.decode(f) for f in agent_frames[:3]]
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        mixer.mix(layers, gains=[1.0, BG_VOLUME, 0.05])
+    three_layer_us = (time.perf_counter() - start) / FRAMES * 1e6
+
+    print(f"{FRAMES} frames of {FRAME_SAMPLES} samples")
+    print(f"  legacy per-sample loop      {legacy_us:8.1f} µs/frame")
+    print(f"  vectorized mixer            {vector_us:8.1f} µs/frame  ({legacy_us / vector_us:.1f}x faster)")
+    print(f"  mixer.mix, 3 PCM layers     {three_layer_us:8.1f} µs/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Noise suppression benchmark - streaming STFT gate vs per-chunk noisereduce
+
+Runs 20ms telephony frames (white noise with a synthetic vowel every few
+seconds) through the streaming spectral-gating suppressor and, when the
+noisereduce package is installed, through the previous path (one
+noisereduce.reduce_noise call per chunk with the learned noise clip).
+Reports CPU per frame, noise attenuation on speech-free frames and SNR of
+the output against the clean vowel (aligned by each path's latency), and
+whether the streaming gate is at least as good as noisereduce on both.
+Run from the code/ directory:
+    python -m benchmarks.bench_noise_suppression
+"""
+import logging
+import time
+import numpy as np
+
+from audio.noise_suppression import NoiseSuppressionProcessor
+from benchmarks._signals import SAMPLE_RATE, FRAME_SAMPLES, call_audio, split_frames, vowel_track
+
+SECONDS = 20
+NOISE_LEVELS = (0.01, 0.03)
+LEARNING_FRAMES = 25
+PROP_DECREASE = 0.8
+RUNS = 3  # Best of (the noisereduce path runs once - it is slow)
+
+
+def _call_audio(rng, noise_level):
+    """(noisy int16, clean float, speech mask) for one call"""
+    clean = vowel_track(SECONDS)
+    return call_audio(rng, SECONDS, noise_level), clean * 32767, clean != 0
+
+
+def _streaming(frames):
+    ns = NoiseSuppressionProcessor(prop_decrease=PROP_DECREASE, learning_frames=LEARNING_FRAMES)
+    out = [ns.process_chunk(frame) for frame in frames]
+    return np.concatenate(out), ns.hop
+
+
+def _legacy(frames, nr):
+    """Previous process_chunk: learn 25 frames, then reduce_noise per chunk"""
+    noise_clip = np.concatenate([f.astype(np.float32) / 32768.0 for f in frames[:LEARNING_FRAMES]])
+    out = list(frames[:LEARNING_FRAMES])
+    for frame in frames[LEARNING_FRAMES:]:
+        reduced = nr.reduce_noise(y=frame.astype(np.float32) / 32768.0, sr=SAMPLE_RATE,
+                                  y_noise=noise_clip, stationary=True, prop_decrease=PROP_DECREASE)
+        out.append((reduced * 32768.0).astype(np.int16))
+    return np.concatenate(out), 0
+
+
+def _measure(name, run, frames, clean, speech, runs=RUNS):
+    best = None
+    for _ in range(runs):
+        start = time.process_time()
+        out, latency = run(frames)
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Undo the path's fixed delay, skip the learning period
+    out = out[latency:].astype(np.float64)
+    skip = LEARNING_FRAMES * FRAME_SAMPLES
+    clean, speech = clean[skip:len(out)], speech[skip:len(out)]
+    noisy = np.concatenate(frames)[skip:len(out)].astype(np.float64)
+    out = out[skip:]
+
+    silence = ~speech
+    attenuation = 10 * np.log10(np.mean(noisy[silence] ** 2) / max(np.mean(out[silence] ** 2), 1e-9))
+    snr_in = 10 * np.log10(np.sum(clean[speech] ** 2) / np.sum((noisy[speech] - clean[speech]) ** 2))
+    snr_out = 10 * np.log10(np.sum(clean[speech] ** 2) / np.sum((out[speech] - clean[speech]) ** 2))
+
+    per_frame_us = best / len(frames) * 1e6
+    print(f"  {name:22s} {per_frame_us:8.1f} us/frame  {per_frame_us / 200:6.2f}% of a core   "
+          f"noise -{attenuation:4.1f}dB   speech SNR {snr_in:5.1f} -> {snr_out:5.1f}dB   "
+          f"latency {latency * 1000 / SAMPLE_RATE:.0f}ms")
+    return attenuation, snr_out
+
+
+def main():
+    logging.disable(logging.INFO)
+    try:
+        import noisereduce as nr
+    except ImportError:
+        nr = None
+
+    for noise_level in NOISE_LEVELS:
+        audio, clean, speech = _call_audio(np.random.default_rng(0), noise_level)
+        frames = split_frames(audio)
+        print(f"{SECONDS}s call, noise {noise_level}, {len(frames)} frames of {FRAME_SAMPLES} samples")
+
+        attenuation, snr = _measure("streaming STFT gate", _streaming, frames, clean, speech)
+        if nr is None:
+            print("  noisereduce per chunk   skipped (noisereduce not installed)")
+            continue
+        legacy_attenuation, legacy_snr = _measure("noisereduce per chunk", lambda f: _legacy(f, nr),
+                                                  frames, clean, speech, runs=1)
+        verdict = "yes" if attenuation >= legacy_attenuation and snr >= legacy_snr else "NO"
+        print(f"  streaming gate at least as good as noisereduce (noise and SNR): {verdict}")
+
+
+if __name__ == "__main__":
+    main()
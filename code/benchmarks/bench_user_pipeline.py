@@ -0,0 +1,94 @@
+"""
+User audio pipeline benchmark - per-stage CPU for each profile
+
+Runs one call of 20ms μ-law frames (noise with a synthetic vowel every few
+seconds) through every pipeline profile and prints the runner's per-stage
+timing plus its own time outside the stages. The agent stage writes into an
+in-memory sink (with inbound DTX) instead of a LiveKit track, which would
+pace the run in real time.
+Run from the code/ directory:
+    python -m benchmarks.bench_user_pipeline
+"""
+import asyncio
+import logging
+import time
+import numpy as np
+
+from audio import codec
+from audio.dtx import InboundDTX
+from audio.frame_features import FeatureExtractor
+from audio.nc_activation import NoiseActivationController
+from audio.noise_suppression import NoiseSuppressionProcessor
+from audio.speech_gate import SpeechFirstGate
+from audio.user_pipeline import PIPELINE_PROFILES, UserAudioPipeline, resolve_pipeline
+from audio.vad_processor import create_vad_processor
+from benchmarks._signals import SAMPLE_RATE, FRAME_SAMPLES, call_audio, split_frames
+
+SECONDS = 60
+NOISE_LEVEL = 0.02
+
+
+class RecordingSink:
+    """Stands in for TelephonyAudioSource: inbound DTX, frames kept in memory"""
+
+    def __init__(self):
+        self.dtx = InboundDTX(sample_rate=SAMPLE_RATE)
+        self.frames_sent = 0
+
+    async def push_pcm(self, pcm_data, features=None):
+        self.frames_sent += len(self.dtx.process(pcm_data, features))
+
+    async def push_audio_data(self, mulaw_data):
+        self.frames_sent += 1
+
+
+def _components(stage_names):
+    sink = RecordingSink()
+    stats = {"nc_inactive_frames": 0, "nc_bypassed_frames": 0, "noise_cancelled_frames": 0,
+             "audio_frames_sent_to_livekit": 0}
+
+    async def on_vad_result(vad_result):
+        pass
+
+    gate = SpeechFirstGate(sample_rate=SAMPLE_RATE) if "speech_gate" in stage_names else None
+    return {
+        "feature_extractor": FeatureExtractor(sample_rate=SAMPLE_RATE, activity=True)
+        if "features" in stage_names else None,
+        "nc_activation": NoiseActivationController(on_db=-60.0),
+        "speech_gate": gate,
+        "noise_suppressor": NoiseSuppressionProcessor(sample_rate=SAMPLE_RATE),
+        "vad_processor": create_vad_processor(backend="energy", sample_rate=SAMPLE_RATE),
+        "vad_stream": None,
+        "on_vad_result": on_vad_result,
+        "get_audio_source": lambda: sink,
+        "stats": stats
+    }
+
+
+async def _run_pipeline(profile, frames):
+    profile, names = resolve_pipeline(profile)
+    pipeline = UserAudioPipeline(profile, names, _components(names))
+    start = time.process_time()
+    for frame in frames:
+        await pipeline.run(frame)
+    return pipeline, time.process_time() - start
+
+
+async def main():
+    logging.disable(logging.INFO)
+    audio = call_audio(np.random.default_rng(0), SECONDS, NOISE_LEVEL)
+    frames = [codec.encode(frame).tobytes() for frame in split_frames(audio)]
+    print(f"{SECONDS}s call, {len(frames)} μ-law frames of {FRAME_SAMPLES} samples")
+
+    for profile in PIPELINE_PROFILES:
+        pipeline, cpu = await _run_pipeline(profile, frames)
+        stats = pipeline.get_stats()
+        print(f"  {profile:12s} {cpu / len(frames) * 1e6:7.1f} µs/frame   {cpu / SECONDS * 100:6.3f}% of a core per call")
+        for stage in stats["stages"]:
+            print(f"    {stage['name']:18s} {stage['per_frame_us']:7.1f} µs/frame   max {stage['max_us']:7.0f} µs")
+        overhead = stats["per_frame_us"] - sum(stage["per_frame_us"] for stage in stats["stages"])
+        print(f"    {'(runner)':18s} {overhead:7.1f} µs/frame")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""
+VAD runtime benchmark - onnxruntime
+
+The runtime runs in a fresh subprocess so cold start (import + model load) and
+peak RSS are measured in isolation, then per-window latency is measured and the
+batched forward pass is checked against single-window inference on the same
+audio. Run from the code/ directory:
+    python -m benchmarks.bench_vad_backends
+    python -m benchmarks.bench_vad_backends --onnx-model /path/to/silero_vad.onnx
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+SAMPLE_RATE = 8000
+WINDOWS = 2000
+PARITY_TOLERANCE = 1e-3
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+
+
+def _worker(runtime, model_path):
+    """Runs inside the subprocess: load, time, print JSON"""
+    import resource
+    start = time.perf_counter()
+
+    import numpy as np
+    from pathlib import Path
+    from audio.vad_models import WINDOW_SAMPLES, _LOADERS
+
+    model = _LOADERS[runtime](Path(model_path), None)
+    cold_start = time.perf_counter() - start
+    if model is None:
+        print(json.dumps({"error": f"{runtime} runtime unavailable"}))
+        return
+
+    window = WINDOW_SAMPLES[SAMPLE_RATE]
+    t = np.arange(window * WINDOWS) / SAMPLE_RATE
+    rng = np.random.default_rng(0)
+    audio = (0.3 * np.sin(2 * np.pi * 220 * t) * (np.sin(2 * np.pi * 2 * t) > 0)
+             + rng.standard_normal(len(t)) * 0.02).astype(np.float32).reshape(WINDOWS, window)
+
+    state = model.new_state(SAMPLE_RATE)
+    probs = []
+    start = time.perf_counter()
+    for row in audio:
+        probs.append(model.infer(row, state))
+    per_window_us = (time.perf_counter() - start) / WINDOWS * 1e6
+
+    # The same audio as one row of a two-call batch (the other call is silence)
+    states = [model.new_state(SAMPLE_RATE), model.new_state(SAMPLE_RATE)]
+    silence = np.zeros(window, dtype=np.float32)
+    batch_probs = [float(model.infer_batch(np.stack((row, silence)), states)[0]) for row in audio]
+
+    print(json.dumps({
+        "cold_start_s": cold_start,
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "per_window_us": per_window_us,
+        "probs": probs,
+        "batch_probs": batch_probs
+    }))
+
+
+def _run(runtime, model_path):
+    if not os.path.exists(model_path):
+        return {"error": f"model not found: {model_path}"}
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_vad_backends", "--worker", runtime, "--model", model_path],
+        capture_output=True, text=True
+    )
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"}
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--onnx-model", default=os.path.join(MODEL_DIR, "silero_vad.onnx"))
+    parser.add_argument("--worker")
+    parser.add_argument("--model")
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.worker, args.model)
+        return 0
+
+    results = {
+        "onnx": _run("onnx", args.onnx_model)
+    }
+
+    print(f"{WINDOWS} windows @ {SAMPLE_RATE}Hz, one call")
+    for runtime, result in results.items():
+        if "error" in result:
+            print(f"  {runtime:6s} skipped: {result['error']}")
+            continue
+        print(f"  {runtime:6s} cold start {result['cold_start_s']:6.2f}s   peak RSS {result['rss_mb']:7.1f} MB   "
+              f"{result['per_window_us']:7.1f} µs/window")
+
+        diff = max(abs(a - b) for a, b in zip(result["probs"], result["batch_probs"]))
+        verdict = "OK" if diff <= PARITY_TOLERANCE else "MISMATCH"
+        print(f"  {runtime:6s} parity: max |p_single - p_batch| = {diff:.2e} (tolerance {PARITY_TOLERANCE:g}) {verdict}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
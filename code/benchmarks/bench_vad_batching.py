@@ -0,0 +1,74 @@
+"""
+VAD batching benchmark - windows/sec with N concurrent calls
+
+Compares one forward pass per call (SileroModel.infer) with the cross-call
+VADBatchScheduler. Uses the runtime/model selected by VAD_RUNTIME / VAD_MODEL_PATH.
+Run from the code/ directory:
+    python -m benchmarks.bench_vad_batching
+"""
+import asyncio
+import sys
+import time
+import numpy as np
+
+from audio.vad_models import get_silero_model, WINDOW_SAMPLES
+from audio.vad_scheduler import VADBatchScheduler
+
+SAMPLE_RATE = 8000
+CALL_COUNTS = (1, 50, 500)
+ROUNDS = 20  # windows per call
+
+
+def _windows(rng, calls):
+    window = WINDOW_SAMPLES[SAMPLE_RATE]
+    return (rng.standard_normal((ROUNDS, calls, window)) * 0.1).astype(np.float32)
+
+
+def per_call_throughput(model, windows):
+    """Every call runs its own forward pass (the pre-batching behaviour)"""
+    states = [model.new_state(SAMPLE_RATE) for _ in range(windows.shape[1])]
+    start = time.perf_counter()
+    for round_windows in windows:
+        for window, state in zip(round_windows, states):
+            model.infer(window, state)
+    return windows.shape[0] * windows.shape[1] / (time.perf_counter() - start)
+
+
+async def batched_throughput(model, windows):
+    """All calls submit each round through the scheduler"""
+    scheduler = VADBatchScheduler(model)
+    states = [model.new_state(SAMPLE_RATE) for _ in range(windows.shape[1])]
+    for _ in states:
+        scheduler.register()
+
+    start = time.perf_counter()
+    for round_windows in windows:
+        await asyncio.gather(*[
+            scheduler.infer(window, state) for window, state in zip(round_windows, states)
+        ])
+    elapsed = time.perf_counter() - start
+    return windows.shape[0] * windows.shape[1] / elapsed, scheduler.get_stats()
+
+
+def main():
+    model = get_silero_model()
+    if model is None:
+        print("Silero model unavailable (check VAD_RUNTIME / VAD_MODEL_PATH) - nothing to benchmark")
+        return 1
+
+    rng = np.random.default_rng(0)
+    realtime_per_call = SAMPLE_RATE / WINDOW_SAMPLES[SAMPLE_RATE]  # windows/sec one live call produces
+
+    print(f"{ROUNDS} windows per call, {WINDOW_SAMPLES[SAMPLE_RATE]} samples @ {SAMPLE_RATE}Hz")
+    for calls in CALL_COUNTS:
+        windows = _windows(rng, calls)
+        single = per_call_throughput(model, windows)
+        batched, stats = asyncio.run(batched_throughput(model, windows))
+        print(f"  N={calls:4d}  per-call {single:10.0f} win/s   batched {batched:10.0f} win/s "
+              f"({batched / single:.1f}x, avg batch {stats['avg_batch_size']:.0f}, "
+              f"max wait {stats['max_wait_ms']:.2f}ms)   realtime needs {calls * realtime_per_call:.0f} win/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+VAD offload benchmark - event-loop time taken by VAD at high call counts
+
+Simulates N calls, each delivering a 20ms frame every 20ms on one event loop,
+and compares VAD run inline in the loop with the per-call VADStream on the
+inference executor (with and without cross-call batching). Reports event-loop
+time spent in VAD per second of wall clock, loop lag seen by a heartbeat task,
+VAD result latency, stale frames and the deepest per-call queue.
+Run from the code/ directory:
+    python -m benchmarks.bench_vad_offload
+"""
+import asyncio
+import logging
+import time
+import numpy as np
+
+import audio.vad_scheduler as vad_scheduler
+from audio.vad_processor import create_vad_processor
+from audio.vad_stream import VADStream
+
+SAMPLE_RATE = 8000
+FRAME_SAMPLES = 160  # 20ms
+FRAME_SECONDS = FRAME_SAMPLES / SAMPLE_RATE
+SECONDS = 3
+CALL_COUNTS = (50, 200)
+HEARTBEAT_SECONDS = 0.005
+
+MODES = {
+    "inline": {},
+    "executor": {"offload": True},
+    "executor+batch": {"offload": True, "batching": True}
+}
+
+
+async def _heartbeat(lags, stop):
+    """Records how late a short sleep wakes up (event-loop lag)"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        lags.append((time.perf_counter() - start - HEARTBEAT_SECONDS) * 1000)
+
+
+async def _call(mode, frames, vads, streams):
+    vad = create_vad_processor(backend="silero", **MODES[mode])
+    vads.append(vad)
+
+    async def on_result(result):
+        pass
+
+    stream = VADStream(vad, on_result) if vad.executor or vad.scheduler else None
+    if stream:
+        streams.append(stream)
+
+    next_frame = time.perf_counter()
+    for frame in frames:
+        if stream:
+            stream.submit(frame)
+        else:
+            await vad.process_chunk_async(frame)
+        next_frame += FRAME_SECONDS
+        await asyncio.sleep(max(0.0, next_frame - time.perf_counter()))
+
+
+async def _run(mode, calls, audio):
+    vad_scheduler._vad_scheduler = None  # Fresh batch stats per run
+    frames = [audio[i:i + FRAME_SAMPLES] for i in range(0, len(audio), FRAME_SAMPLES)]
+
+    vads, streams, lags = [], [], []
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(lags, stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_call(mode, frames, vads, streams) for _ in range(calls)))
+    while any(stream.queue.qsize() or stream.backlog for stream in streams):
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+    wall = time.perf_counter() - start
+
+    stop.set()
+    await heartbeat
+    for stream in streams:
+        await stream.close()
+    for vad in vads:
+        vad.close()
+
+    loop_ms = sum(vad.loop_time for vad in vads) * 1000
+    lags.sort()
+    stream_stats = [stream.get_stats() for stream in streams]
+    latency = max((s["max_latency_ms"] for s in stream_stats), default=0.0)
+    stale = sum(s["stale_frames"] for s in stream_stats)
+    depth = max((s["max_queue_depth"] for s in stream_stats), default=0)
+
+    print(f"  {mode:15s} VAD on loop {loop_ms / wall:6.1f} ms/s   "
+          f"loop lag p50 {lags[len(lags) // 2]:5.1f}ms p99 {lags[int(len(lags) * 0.99)]:6.1f}ms   "
+          f"max VAD latency {latency:6.1f}ms   stale frames {stale}   max queue depth {depth}")
+
+
+def main():
+    logging.disable(logging.WARNING)
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(SAMPLE_RATE * SECONDS) * 3000).astype(np.int16)
+
+    for calls in CALL_COUNTS:
+        print(f"{calls} calls x {SECONDS}s")
+        for mode in MODES:
+            asyncio.run(_run(mode, calls, audio))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Streaming VAD front-end benchmark - per-frame cost and allocations
+
+Compares the old SileroVADProcessor path (np.concatenate buffer, per-window
+slicing, fresh model inputs and a result dict per frame) with the ring buffer /
+preallocated I/O path, on the same shared Silero model.
+
+The dependable win is allocation: the transient peak drops from ~2.7KB to
+~1.0KB per frame. Per-frame time is dominated by ONNX inference and repeated
+runs swing by up to TIMING_NOISE either way, so a time delta inside that band
+is reported as noise rather than a speedup.
+Run from the code/ directory:
+    python -m benchmarks.bench_vad_streaming
+"""
+import logging
+import time
+import tracemalloc
+import numpy as np
+
+from audio.vad_models import get_silero_model
+from audio.vad_processor import create_vad_processor
+
+SAMPLE_RATE = 8000
+FRAME_SAMPLES = 160  # 20ms
+FRAMES = 3000
+ROUNDS = 5
+WINDOW = 256
+THRESHOLD = 0.5
+TIMING_NOISE = 0.10  # Run-to-run swing of per-frame time on an idle machine
+
+
+class LegacyStreamingVAD:
+    """Reference copy of the pre-ring-buffer buffering, inference and result path"""
+
+    def __init__(self, model):
+        self.model = model
+        self.state = model.new_state(SAMPLE_RATE)
+        self.audio_buffer = np.array([], dtype=np.float32)
+
+    def process_chunk(self, audio_pcm_int16):
+        audio_float = audio_pcm_int16.astype(np.float32) / 32768.0
+        self.audio_buffer = np.concatenate([self.audio_buffer, audio_float])
+
+        result = {"enabled": True, "is_speech": False, "confidence": 0.0,
+                  "speech_started": False, "speech_ended": False, "user_speaking": False}
+        while len(self.audio_buffer) >= WINDOW:
+            window = self.audio_buffer[:WINDOW]
+            self.audio_buffer = self.audio_buffer[WINDOW:]
+            prob = float(self.model.infer_batch(window.reshape(1, -1), [self.state])[0])
+            result = {"enabled": True, "is_speech": prob >= THRESHOLD, "confidence": prob,
+                      "speech_started": False, "speech_ended": False, "user_speaking": False}
+        return result
+
+
+def _per_frame_us(process, frames):
+    start = time.perf_counter()
+    for frame in frames:
+        process(frame)
+    return (time.perf_counter() - start) / len(frames) * 1e6
+
+
+def _bytes_per_frame(process, frames):
+    """Average transient traced-memory peak per frame (arrays, views, result objects)"""
+    tracemalloc.start()
+    total = 0
+    for frame in frames:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        process(frame)
+        total += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return total / len(frames)
+
+
+def main():
+    logging.disable(logging.INFO)
+    model = get_silero_model()
+    if model is None:
+        print("Silero model unavailable")
+        return
+
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(FRAMES * FRAME_SAMPLES) * 2000).astype(np.int16)
+    frames = [audio[i:i + FRAME_SAMPLES] for i in range(0, len(audio), FRAME_SAMPLES)]
+
+    legacy = LegacyStreamingVAD(model)
+    streaming = create_vad_processor(backend="silero", threshold=THRESHOLD)
+
+    # Warm both paths (binds the I/O buffers, settles the onnxruntime arena)
+    for frame in frames[:200]:
+        legacy.process_chunk(frame)
+        streaming.process_chunk(frame)
+
+    paths = (("legacy", legacy.process_chunk), ("streaming", streaming.process_chunk))
+
+    # Interleave rounds and keep the best so clock drift hits both paths alike
+    best = {name: float("inf") for name, _ in paths}
+    for _ in range(ROUNDS):
+        for name, process in paths:
+            best[name] = min(best[name], _per_frame_us(process, frames))
+
+    print(f"{FRAMES} frames of {FRAME_SAMPLES} samples, {model.runtime} runtime (best of {ROUNDS})")
+    peaks = {}
+    for name, process in paths:
+        peaks[name] = _bytes_per_frame(process, frames)
+        print(f"  {name:9s} {best[name]:7.1f} µs/frame   {peaks[name]:6.0f} bytes transient peak/frame")
+
+    print(f"  allocation: {peaks['legacy']:.0f} -> {peaks['streaming']:.0f} bytes/frame "
+          f"({(1 - peaks['streaming'] / peaks['legacy']) * 100:.0f}% less)")
+
+    delta = best["streaming"] / best["legacy"] - 1
+    if abs(delta) <= TIMING_NOISE:
+        verdict = f"within the ±{TIMING_NOISE:.0%} run-to-run noise (inference-bound) - no measurable speed change"
+    else:
+        verdict = f"{'faster' if delta < 0 else 'slower'} beyond the ±{TIMING_NOISE:.0%} run-to-run noise"
+    print(f"  time: {best['legacy']:.1f} -> {best['streaming']:.1f} µs/frame ({delta * 100:+.1f}%), {verdict}")
+
+    print(f"  ring buffer grows: {streaming.ring.grows}")
+
+
+if __name__ == "__main__":
+    main()
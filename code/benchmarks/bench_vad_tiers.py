@@ -0,0 +1,92 @@
+"""
+VAD tier benchmark - CPU cost per call for each VAD backend
+
+Feeds one minute of 20ms telephony frames (noise with a synthetic vowel
+every few seconds) through each backend and reports CPU per frame,
+share of one core per call and how many calls one core can carry.
+
+Accuracy is scored on the frames where a window completed: recall inside the
+vowels, false positives outside them, agreement with Silero and false
+positives on a noise-only call whose level steps up 12dB and then pulses.
+The energy tier flags far more speech frames than Silero here (~570 vs
+~140) with the same false positives (9 each, all on vowel tails): Silero
+stops firing ~1s into the steady synthetic vowel, which is not real
+speech. The energy tier is a coarse pre-tier - it finds voiced, harmonic
+energy over the noise floor, not speech, so tones or music also pass it.
+Run from the code/ directory:
+    python -m benchmarks.bench_vad_tiers
+"""
+import logging
+import time
+import numpy as np
+
+from audio.vad_processor import VAD_BACKENDS, create_vad_processor
+from benchmarks._signals import SAMPLE_RATE, FRAME_SAMPLES, call_audio, split_frames, vowel_frames
+
+SECONDS = 60
+NOISE_LEVEL = 0.01
+
+
+def _noise_only_audio(rng):
+    """Noise that steps up 12dB a third of the way in and pulses at 3Hz for the last third"""
+    audio = rng.standard_normal(SAMPLE_RATE * SECONDS) * NOISE_LEVEL
+    third = len(audio) // 3
+    audio[third:] *= 4
+    audio[2 * third:] *= 1 + 0.8 * np.sin(2 * np.pi * 3 * np.arange(len(audio) - 2 * third) / SAMPLE_RATE)
+    return (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+
+
+def _run(vad, frames):
+    """Per-frame decisions: (is_speech, a window completed on this frame), CPU seconds"""
+    speech = np.zeros(len(frames), dtype=bool)
+    decided = np.zeros(len(frames), dtype=bool)
+    start = time.process_time()
+    for i, frame in enumerate(frames):
+        windows = vad.windows_processed
+        speech[i] = vad.process_chunk(frame).is_speech
+        decided[i] = vad.windows_processed != windows
+    return speech, decided, time.process_time() - start
+
+
+
+def main():
+    logging.disable(logging.INFO)
+    frames = split_frames(call_audio(np.random.default_rng(0), SECONDS, NOISE_LEVEL))
+    noise_frames = split_frames(_noise_only_audio(np.random.default_rng(1)))
+    truth = vowel_frames(SECONDS)
+
+    print(f"{SECONDS}s call, {len(frames)} frames of {FRAME_SAMPLES} samples")
+    results = {}
+    for backend in VAD_BACKENDS:
+        vad = create_vad_processor(backend=backend)
+        if not vad.enabled:
+            print(f"  {backend:7s} unavailable")
+            continue
+
+        speech, decided, cpu = _run(vad, frames)
+        results[backend] = speech, decided
+        recall = (speech & truth).sum() / (decided & truth).sum()
+        false_positives = (speech & ~truth).sum()
+        noise_speech, noise_decided, _ = _run(create_vad_processor(backend=backend), noise_frames)
+
+        core_share = cpu / SECONDS
+        print(f"  {backend:7s} {cpu / len(frames) * 1e6:7.1f} µs/frame   {core_share * 100:6.3f}% of a core per call   "
+              f"~{1 / core_share:7.0f} calls/core")
+        print(f"  {'':7s} speech frames {speech.sum()}   vowel recall {recall * 100:5.1f}%   "
+              f"false positives {false_positives} ({false_positives / (decided & ~truth).sum() * 100:.2f}%)   "
+              f"noise-only false positives {noise_speech.sum()} "
+              f"({noise_speech.sum() / noise_decided.sum() * 100:.2f}%)")
+
+    if "silero" in results:
+        silero, decided = results["silero"]
+        for backend, (speech, _) in results.items():
+            if backend == "silero":
+                continue
+            extra = speech & ~silero
+            print(f"  {backend} vs silero: agree on {(speech == silero)[decided].mean() * 100:.1f}% of decisions, "
+                  f"{extra.sum()} frames only {backend} flags ({(extra & truth).sum()} inside vowels), "
+                  f"{(silero & ~speech).sum()} only silero flags")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Build prebuilt background noise assets
+
+Decodes every noise mp3 once (FFmpeg) into the memory-mappable format read by
+audio.noise_assets, so workers never transcode at runtime. Run from code/:
+    python build_noise_assets.py                  # NOISE_FOLDER @ TELEPHONY_SAMPLE_RATE
+    python build_noise_assets.py --rates 8000 16000
+    python build_noise_assets.py --source call-center.mp3   # extra files (e.g. maqsam)
+    python build_noise_assets.py --check          # verify existing assets, build nothing
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from audio.noise_assets import (
+    decode_noise_file, load_prebuilt_asset, prebuilt_path,
+    read_prebuilt_header, source_fingerprint, write_prebuilt_asset
+)
+from config import NOISE_FOLDER, TELEPHONY_SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+
+def _is_up_to_date(target, source, sample_rate, fields=("source_crc32", "source_size", "source_mtime_ns")):
+    """
+    Existing asset matches the source fingerprint and its data checksums verify.
+    Builds compare size / mtime too, so the header lets workers skip CRCing the source
+    """
+    if not target.exists():
+        return False
+    try:
+        header = read_prebuilt_header(target)
+    except ValueError:
+        return False
+    if any(header[field] != source[field] for field in fields):
+        return False
+    return load_prebuilt_asset(target, target.stem, sample_rate, verify=True) is not None
+
+
+def build(source, sample_rate, force=False):
+    """Build one asset -> True on success (or already up to date)"""
+    source = Path(source)
+    target = prebuilt_path(source.parent, source.stem, sample_rate)
+    fingerprint = source_fingerprint(source)
+
+    if not force and _is_up_to_date(target, fingerprint, sample_rate):
+        logger.info(f"✅ Up to date: {target}")
+        return True
+
+    pcm = decode_noise_file(source, sample_rate)
+    if pcm is None or len(pcm) == 0:
+        logger.error(f"❌ Could not decode {source}")
+        return False
+
+    write_prebuilt_asset(target, sample_rate, pcm, source=fingerprint)
+    logger.info(f"✅ Built {target}: {len(pcm)} samples, {len(pcm) / sample_rate:.1f}s")
+    return True
+
+
+def check(source, sample_rate):
+    """Verify an asset exists, matches its source and passes checksums"""
+    source = Path(source)
+    target = prebuilt_path(source.parent, source.stem, sample_rate)
+    if _is_up_to_date(target, source_fingerprint(source), sample_rate, fields=("source_crc32",)):
+        logger.info(f"✅ OK: {target}")
+        return True
+    logger.error(f"❌ Missing or stale: {target}")
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build memory-mappable background noise assets")
+    parser.add_argument("--folder", default=NOISE_FOLDER, help="folder with <noise_type>.mp3 files")
+    parser.add_argument("--source", nargs="*", default=[], help="additional source files")
+    parser.add_argument("--rates", nargs="+", type=int, default=[TELEPHONY_SAMPLE_RATE])
+    parser.add_argument("--force", action="store_true", help="rebuild even if up to date")
+    parser.add_argument("--check", action="store_true", help="verify only")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    sources = sorted(Path(args.folder).glob("*.mp3")) + [Path(s) for s in args.source]
+    if not sources:
+        logger.error(f"❌ No noise sources found in {args.folder}")
+        return 1
+
+    ok = True
+    for source in sources:
+        for rate in args.rates:
+            ok &= check(source, rate) if args.check else build(source, rate, force=args.force)
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,8 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Default file paths resolve here, not against the CWD
+
 # Environment variables
 LIVEKIT_URL = os.environ.get("LIVEKIT_URL", "wss://setupforretell-hk7yl5xf.livekit.cloud")
 LIVEKIT_API_KEY = os.environ.get("LIVEKIT_API_KEY", "APIoLr2sRCRJWY5")
@@ -34,6 +36,12 @@ BG_NOISE_ENABLED = os.environ.get("BG_NOISE_ENABLED", "true").lower() == "true"
 NOISE_TYPE = os.environ.get("NOISE_TYPE", "call-center")
 NOISE_VOLUME = float(os.environ.get("NOISE_VOLUME", "0.15"))
 NOISE_FOLDER = "noise"
+NOISE_CACHE_MAX_ASSETS = int(os.environ.get("NOISE_CACHE_MAX_ASSETS", "4"))  # Decoded noise files kept per process
+NOISE_LOAD_FAILURE_TTL_S = float(os.environ.get("NOISE_LOAD_FAILURE_TTL_S", "300"))  # Don't retry a failed noise load for this long
+NOISE_PREBUILT_VERIFY = os.environ.get("NOISE_PREBUILT_VERIFY", "false").lower() == "true"  # CRC whole assets on load (reads every page)
+NOISE_RANDOM_START = os.environ.get("NOISE_RANDOM_START", "false").lower() == "true"  # Per-call random loop offset
+NOISE_VOLUME_STEP = float(os.environ.get("NOISE_VOLUME_STEP", "0.01"))  # Volume quantization for pre-scaled buffers
+NOISE_SCALED_LEVELS = int(os.environ.get("NOISE_SCALED_LEVELS", "8"))  # Pre-scaled volume levels kept per asset
 
 # ============================================
 # NEW: VAD (Voice Activity Detection) Settings
@@ -42,6 +50,27 @@ VAD_ENABLED = os.environ.get("VAD_ENABLED", "true").lower() == "true"
 VAD_THRESHOLD = float(os.environ.get("VAD_THRESHOLD", "0.5"))  # 0.0 to 1.0
 VAD_SPEECH_FRAMES = int(os.environ.get("VAD_SPEECH_FRAMES", "3"))  # Frames to trigger speech start
 VAD_SILENCE_FRAMES = int(os.environ.get("VAD_SILENCE_FRAMES", "10"))  # Frames to trigger speech end
+VAD_BACKEND = os.environ.get("VAD_BACKEND", "silero").lower()  # silero (neural) | energy (NumPy, no model)
+VAD_RUNTIME = os.environ.get("VAD_RUNTIME", "onnx").lower()  # onnx (onnxruntime) - the only vendored model
+VAD_MODEL_DIR = os.path.join(BASE_DIR, "models")  # Vendored models
+VAD_MODEL_PATH = os.environ.get(
+    "VAD_MODEL_PATH",
+    os.path.join(VAD_MODEL_DIR, "silero_vad.onnx")
+)  # Vendored Silero VAD v5 ONNX graph
+VAD_MODEL_SHA256 = os.environ.get("VAD_MODEL_SHA256", "")  # Expected checksum (falls back to <path>.sha256)
+VAD_INFERENCE_THREADS = int(os.environ.get("VAD_INFERENCE_THREADS", "1"))  # Intra-op threads
+VAD_BATCHING_ENABLED = os.environ.get("VAD_BATCHING_ENABLED", "true").lower() == "true"  # Batch windows across calls
+VAD_BATCH_MAX_DELAY_MS = float(os.environ.get("VAD_BATCH_MAX_DELAY_MS", "5"))  # Max extra latency per window
+VAD_BATCH_MAX_SIZE = int(os.environ.get("VAD_BATCH_MAX_SIZE", "256"))  # Flush once this many windows wait
+VAD_GATE_ENABLED = os.environ.get("VAD_GATE_ENABLED", "true").lower() == "true"  # Skip the model on obvious silence
+VAD_GATE_RMS_DB = float(os.environ.get("VAD_GATE_RMS_DB", "-50"))  # Windows quieter than this are silence
+VAD_GATE_HISS_RMS_DB = float(os.environ.get("VAD_GATE_HISS_RMS_DB", "-45"))  # ...or quieter than this and noise-like
+VAD_GATE_HISS_ZCR = float(os.environ.get("VAD_GATE_HISS_ZCR", "0.4"))  # Zero-crossing rate that counts as noise-like
+VAD_GATE_DECAY = float(os.environ.get("VAD_GATE_DECAY", "0.5"))  # Probability decay per gated window
+VAD_GATE_REFRESH_WINDOWS = int(os.environ.get("VAD_GATE_REFRESH_WINDOWS", "8"))  # Still run the model every Nth gated window
+VAD_OFFLOAD_ENABLED = os.environ.get("VAD_OFFLOAD_ENABLED", "true").lower() == "true"  # Inference off the event loop
+VAD_EXECUTOR_WORKERS = int(os.environ.get("VAD_EXECUTOR_WORKERS", "2"))  # Inference threads shared by all calls
+VAD_DEADLINE_MS = float(os.environ.get("VAD_DEADLINE_MS", "200"))  # Frames queued longer than this are not inferred
 
 # ============================================
 # NEW: Noise Cancellation Settings
@@ -50,6 +79,28 @@ NOISE_CANCELLATION_ENABLED = os.environ.get("NOISE_CANCELLATION_ENABLED", "true"
 NC_STATIONARY = os.environ.get("NC_STATIONARY", "true").lower() == "true"  # Stationary vs adaptive
 NC_PROP_DECREASE = float(os.environ.get("NC_PROP_DECREASE", "0.8"))  # 0.0 to 1.0 (aggressiveness)
 NC_LEARNING_FRAMES = int(os.environ.get("NC_LEARNING_FRAMES", "25"))  # Frames for noise profile
+NC_ORDER = os.environ.get("NC_ORDER", "nc_first").lower()  # nc_first | vad_first (only speech frames are denoised) - picks the default pipeline profile
+NC_NONSPEECH_MODE = os.environ.get("NC_NONSPEECH_MODE", "attenuate").lower()  # attenuate | comfort_noise
+NC_NONSPEECH_GAIN_DB = float(os.environ.get("NC_NONSPEECH_GAIN_DB", "-12"))  # Level of non-speech frames in vad_first
+NC_SPEECH_HANGOVER_FRAMES = int(os.environ.get("NC_SPEECH_HANGOVER_FRAMES", "15"))  # Keep denoising after speech
+NC_PROFILE_CACHE_ENABLED = os.environ.get("NC_PROFILE_CACHE_ENABLED", "true").lower() == "true"  # Warm-start from past calls
+NC_PROFILE_CACHE_PATH = os.environ.get(
+    "NC_PROFILE_CACHE_PATH", os.path.join(BASE_DIR, "noise_profiles.json")
+)  # Persisted across restarts
+NC_PROFILE_CACHE_MAX_ENTRIES = int(os.environ.get("NC_PROFILE_CACHE_MAX_ENTRIES", "1000"))  # LRU bound
+NC_PROFILE_CACHE_KEY = os.environ.get("NC_PROFILE_CACHE_KEY", "caller").lower()  # caller | trunk
+NC_PROFILE_CACHE_TTL_HOURS = float(os.environ.get("NC_PROFILE_CACHE_TTL_HOURS", "168"))  # Older profiles are relearned
+NC_PROFILE_CACHE_SAVE_INTERVAL_S = float(os.environ.get("NC_PROFILE_CACHE_SAVE_INTERVAL_S", "60"))  # Writes coalesced
+NC_PROFILE_CACHE_KEY_SECRET = os.environ.get("NC_PROFILE_CACHE_KEY_SECRET", "")  # HMAC key for caller numbers
+NC_PROFILE_CACHE_KEY_SECRET_PATH = os.environ.get(
+    "NC_PROFILE_CACHE_KEY_SECRET_PATH", os.path.join(BASE_DIR, "noise_profiles.key")
+)  # Generated on first run if no secret is set (keep it out of backups of the cache file)
+NC_ADAPTIVE_ENABLED = os.environ.get("NC_ADAPTIVE_ENABLED", "true").lower() == "true"  # Per-call on/off from noise floor
+NC_ADAPTIVE_ON_DB = float(os.environ.get("NC_ADAPTIVE_ON_DB", "-50"))  # Noise floor (dBFS) that turns NC on
+NC_ADAPTIVE_HYSTERESIS_DB = float(os.environ.get("NC_ADAPTIVE_HYSTERESIS_DB", "6"))  # ...and how far below it turns off
+NC_ADAPTIVE_MAX_SNR_DB = float(os.environ.get("NC_ADAPTIVE_MAX_SNR_DB", "35"))  # Cleaner lines stay off (0 = ignore SNR)
+NC_ADAPTIVE_HOLD_MS = int(os.environ.get("NC_ADAPTIVE_HOLD_MS", "2000"))  # Minimum time between switches
+NC_ADAPTIVE_WARMUP_MS = int(os.environ.get("NC_ADAPTIVE_WARMUP_MS", "500"))  # Measured before the first decision
 
 # ============================================
 # NEW: Interruption Detection Settings
@@ -58,6 +109,32 @@ INTERRUPTION_DETECTION_ENABLED = os.environ.get("INTERRUPTION_DETECTION_ENABLED"
 INTERRUPTION_COOLDOWN_MS = int(os.environ.get("INTERRUPTION_COOLDOWN_MS", "500"))  # Cooldown between detections
 INTERRUPTION_SIGNAL_AGENT = os.environ.get("INTERRUPTION_SIGNAL_AGENT", "true").lower() == "true"  # Send to agent?
 
+# ============================================
+# NEW: End-of-turn hints (VAD speech start/end → agent data channel)
+# ============================================
+TURN_HINTS_ENABLED = os.environ.get("TURN_HINTS_ENABLED", "false").lower() == "true"  # Opt-in: agents must listen on the topic
+TURN_HINTS_TOPIC = os.environ.get("TURN_HINTS_TOPIC", "turn_hints")  # Data channel topic agents listen on
+TURN_HINTS_BATCH_MS = float(os.environ.get("TURN_HINTS_BATCH_MS", "20"))  # Events within this window share a packet
+TURN_HINTS_MAX_PER_SECOND = float(os.environ.get("TURN_HINTS_MAX_PER_SECOND", "10"))  # Rate limit per call
+
+# ============================================
+# NEW: Inbound DTX (no caller frames to LiveKit during silence)
+# ============================================
+INBOUND_DTX_ENABLED = os.environ.get("INBOUND_DTX_ENABLED", "false").lower() == "true"
+INBOUND_DTX_HANGOVER_MS = int(os.environ.get("INBOUND_DTX_HANGOVER_MS", "400"))  # Silence before frames stop
+INBOUND_DTX_PREROLL_MS = int(os.environ.get("INBOUND_DTX_PREROLL_MS", "100"))  # Audio sent ahead of resumed speech
+INBOUND_DTX_COMFORT_INTERVAL_MS = int(os.environ.get("INBOUND_DTX_COMFORT_INTERVAL_MS", "0"))  # 0 = send nothing
+
+# ============================================
+# NEW: User audio pipeline (stage order, overridable per call)
+# ============================================
+USER_PIPELINE_PROFILE = os.environ.get(
+    "USER_PIPELINE_PROFILE", "vad_first" if NC_ORDER == "vad_first" else "default"
+).lower()  # default | vad_first | no_nc | legacy | passthrough
+USER_PIPELINE_STAGES = [
+    stage.strip() for stage in os.environ.get("USER_PIPELINE_STAGES", "").lower().split(",") if stage.strip()
+]  # Comma-separated stage names, overrides the profile
+
 # Server configuration
 WEBSOCKET_HOST = "0.0.0.0"
 WEBSOCKET_PORT = 8765
@@ -120,7 +197,12 @@ def get_vad_config():
         "enabled": VAD_ENABLED,
         "threshold": VAD_THRESHOLD,
         "speech_frames": VAD_SPEECH_FRAMES,
-        "silence_frames": VAD_SILENCE_FRAMES
+        "silence_frames": VAD_SILENCE_FRAMES,
+        "batching": VAD_BATCHING_ENABLED,
+        "backend": VAD_BACKEND,
+        "gate": VAD_GATE_ENABLED,
+        "offload": VAD_OFFLOAD_ENABLED,
+        "deadline_ms": VAD_DEADLINE_MS
     }
 
 
@@ -130,7 +212,24 @@ def get_noise_cancellation_config():
         "enabled": NOISE_CANCELLATION_ENABLED,
         "stationary": NC_STATIONARY,
         "prop_decrease": NC_PROP_DECREASE,
-        "learning_frames": NC_LEARNING_FRAMES
+        "learning_frames": NC_LEARNING_FRAMES,
+        "order": NC_ORDER,
+        "nonspeech_mode": NC_NONSPEECH_MODE,
+        "nonspeech_gain_db": NC_NONSPEECH_GAIN_DB,
+        "hangover_frames": NC_SPEECH_HANGOVER_FRAMES,
+        "profile_cache": NC_PROFILE_CACHE_ENABLED
+    }
+
+
+def get_nc_activation_config():
+    """Get adaptive noise cancellation activation configuration (durations in 20ms frames)"""
+    return {
+        "enabled": NC_ADAPTIVE_ENABLED,
+        "on_db": NC_ADAPTIVE_ON_DB,
+        "hysteresis_db": NC_ADAPTIVE_HYSTERESIS_DB,
+        "max_snr_db": NC_ADAPTIVE_MAX_SNR_DB,
+        "hold_frames": NC_ADAPTIVE_HOLD_MS // 20,
+        "warmup_frames": NC_ADAPTIVE_WARMUP_MS // 20
     }
 
 
@@ -143,10 +242,43 @@ def get_interruption_config():
     }
 
 
+def get_dtx_config():
+    """Get inbound DTX configuration (durations in 20ms frames)"""
+    return {
+        "enabled": INBOUND_DTX_ENABLED,
+        "hangover_frames": INBOUND_DTX_HANGOVER_MS // 20,
+        "preroll_frames": INBOUND_DTX_PREROLL_MS // 20,
+        "comfort_interval_frames": INBOUND_DTX_COMFORT_INTERVAL_MS // 20
+    }
+
+
+def get_user_pipeline_config():
+    """Get user audio pipeline configuration"""
+    return {
+        "profile": USER_PIPELINE_PROFILE,
+        "stages": USER_PIPELINE_STAGES or None
+    }
+
+
+def get_turn_hints_config():
+    """Get end-of-turn hint configuration"""
+    return {
+        "enabled": TURN_HINTS_ENABLED,
+        "topic": TURN_HINTS_TOPIC,
+        "batch_ms": TURN_HINTS_BATCH_MS,
+        "max_per_second": TURN_HINTS_MAX_PER_SECOND
+    }
+
+
 # Log configuration on import
 if __name__ != "__main__":
     logger = logging.getLogger(__name__)
     logger.info(f"🔊 Background Noise: enabled={BG_NOISE_ENABLED}, type={NOISE_TYPE}, volume={NOISE_VOLUME}")
-    logger.info(f"🎤 VAD: enabled={VAD_ENABLED}, threshold={VAD_THRESHOLD}")
-    logger.info(f"🔇 Noise Cancellation: enabled={NOISE_CANCELLATION_ENABLED}, stationary={NC_STATIONARY}")
-    logger.info(f"🚨 Interruption Detection: enabled={INTERRUPTION_DETECTION_ENABLED}, cooldown={INTERRUPTION_COOLDOWN_MS}ms")
\ No newline at end of file
+    logger.info(f"🎤 VAD: enabled={VAD_ENABLED}, backend={VAD_BACKEND}, threshold={VAD_THRESHOLD}")
+    logger.info(f"🔇 Noise Cancellation: enabled={NOISE_CANCELLATION_ENABLED}, stationary={NC_STATIONARY}, order={NC_ORDER}, "
+               f"profile cache={NC_PROFILE_CACHE_ENABLED} ({NC_PROFILE_CACHE_KEY}), "
+               f"adaptive={NC_ADAPTIVE_ENABLED} (on at {NC_ADAPTIVE_ON_DB:.0f}dBFS)")
+    logger.info(f"🚨 Interruption Detection: enabled={INTERRUPTION_DETECTION_ENABLED}, cooldown={INTERRUPTION_COOLDOWN_MS}ms")
+    logger.info(f"⏱️ Turn hints: enabled={TURN_HINTS_ENABLED}, topic={TURN_HINTS_TOPIC}")
+    logger.info(f"📵 Inbound DTX: enabled={INBOUND_DTX_ENABLED}, hangover={INBOUND_DTX_HANGOVER_MS}ms")
+    logger.info(f"🧩 User audio pipeline: profile={USER_PIPELINE_PROFILE}, stages={','.join(USER_PIPELINE_STAGES) or '-'}")
\ No newline at end of file
@@ -97,6 +97,8 @@ class LiveKitManager:
             self.room.on("track_subscribed")(handlers['on_track_subscribed'])
         if 'on_track_unsubscribed' in handlers:
             self.room.on("track_unsubscribed")(handlers['on_track_unsubscribed'])
+        if 'on_participant_attributes_changed' in handlers:
+            self.room.on("participant_attributes_changed")(handlers['on_participant_attributes_changed'])
     
     async def publish_audio_track(self, audio_track):
         """Publish audio track to LiveKit room"""
@@ -7,8 +7,9 @@ import signal
 import sys
 from config import (
     validate_environment, setup_logging,
-    LIVEKIT_URL, CALLBACK_WS_URL, TELEPHONY_SAMPLE_RATE, LIVEKIT_SAMPLE_RATE
+    LIVEKIT_URL, CALLBACK_WS_URL, TELEPHONY_SAMPLE_RATE, LIVEKIT_SAMPLE_RATE, VAD_ENABLED, VAD_BACKEND
 )
+from audio.vad_models import get_silero_model
 from server.websocket_server import WebSocketServerManager
 from server.http_server import HTTPServerManager
 
@@ -133,6 +134,11 @@ class TelephonyLiveKitBridge:
         # Log configuration
         self._log_configuration()
         
+        # Load the shared VAD model once, before the first call (off the event loop);
+        # the energy tier has no model
+        if VAD_ENABLED and VAD_BACKEND == "silero":
+            await asyncio.get_running_loop().run_in_executor(None, get_silero_model)
+        
         try:
             # Create server tasks
             logger.info("🚀 Starting servers...")
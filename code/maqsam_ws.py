@@ -9,7 +9,6 @@ import base64
 from livekit import rtc, api
 import subprocess
 import time
-import audioop
 from aiohttp import web
 from collections import defaultdict, deque
 import threading
@@ -17,6 +16,10 @@ from concurrent.futures import ThreadPoolExecutor
 import wave
 import struct
 import array
+import numpy as np
+
+from audio import codec, mixer
+from audio.noise_assets import NoiseAsset, load_prebuilt_asset, prebuilt_path
 
 
 # Environment variables
@@ -91,7 +94,7 @@ def create_room_from_context(context: dict) -> str:
 def process_mulaw_to_pcm(mulaw_data):
     """Process μ-law conversion"""
     try:
-        return audioop.ulaw2lin(mulaw_data, 2)
+        return codec.ulaw2lin(mulaw_data)
     except Exception as e:
         logger.error(f"μ-law conversion error: {e}")
         return None
@@ -99,27 +102,42 @@ def process_mulaw_to_pcm(mulaw_data):
 def process_pcm_to_mulaw(pcm_data):
     """Process PCM to μ-law conversion"""
     try:
-        return audioop.lin2ulaw(pcm_data, 2)
+        return codec.lin2ulaw(pcm_data)
     except Exception as e:
         logger.error(f"PCM to μ-law conversion error: {e}")
         return None
 
 class BackgroundAudioManager:
-    """Manages background audio for calls"""
+    """Holds the shared background audio loop; each call reads it through its own cursor"""
     
     def __init__(self, audio_file_path):
         self.audio_file_path = audio_file_path
-        self.background_audio_data = None
-        self.current_position = 0
+        self.asset = None  # Shared NoiseAsset: μ-law + PCM loop, each followed by its wrap padding
+        self.loop_view = None
+        self.mix_loop = None
+        self.packets = []
         self.is_running = False
-        self.lock = threading.Lock()
         
         logger.info("Initializing background audio manager")
         self._load_background_audio()
+        self._build_loop_view()
     
     def _load_background_audio(self):
         """Load and convert background audio to telephony format"""
         try:
+            # Prebuilt asset (python build_noise_assets.py --source <file>) skips FFmpeg
+            folder, file_name = os.path.split(self.audio_file_path)
+            noise_type = os.path.splitext(file_name)[0]
+            asset = load_prebuilt_asset(
+                prebuilt_path(folder or ".", noise_type, TELEPHONY_SAMPLE_RATE),
+                noise_type, TELEPHONY_SAMPLE_RATE, source_file=self.audio_file_path
+            )
+            if asset is not None:
+                self.asset = asset
+                logger.info(f"Background audio mapped from prebuilt asset: "
+                            f"{len(asset)} bytes, {asset.duration:.1f}s")
+                return
+
             if not os.path.exists(self.audio_file_path):
                 logger.warning(f"Background audio file not found: {self.audio_file_path}")
                 return
@@ -150,11 +168,13 @@ class BackgroundAudioManager:
                         logger.error("Background audio must be mono and 8kHz")
                         return
                     
-                    pcm_data = wav_file.readframes(wav_file.getnframes())
-                    self.background_audio_data = audioop.lin2ulaw(pcm_data, 2)
+                    pcm_data = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+                    if len(pcm_data) == 0:
+                        logger.error("Background audio is empty")
+                        return
+                    self.asset = NoiseAsset(noise_type, TELEPHONY_SAMPLE_RATE, pcm_data)
                     
-                    duration = len(pcm_data) / (2 * TELEPHONY_SAMPLE_RATE)
-                    logger.info(f"Background audio loaded: {len(self.background_audio_data)} bytes, {duration:.1f}s")
+                    logger.info(f"Background audio loaded: {len(self.asset)} bytes, {self.asset.duration:.1f}s")
                 
             finally:
                 try:
@@ -165,28 +185,39 @@ class BackgroundAudioManager:
         except Exception as e:
             logger.error(f"Error loading background audio: {e}")
     
-    def get_audio_chunk(self, chunk_size):
-        """Get a chunk of background audio data"""
-        if not self.background_audio_data:
-            return None
+    def _build_loop_view(self):
+        """
+        Loop buffers with the start repeated after the end, so wrapping reads are plain
+        slices. They are the asset's own (memory-mapped for prebuilt assets) - not copied
+        """
+        if self.asset is None:
+            return
+        self.loop_view = self.asset.ulaw
         
-        with self.lock:
-            data_len = len(self.background_audio_data)
-            
-            if self.current_position >= data_len:
-                self.current_position = 0
-            
-            if self.current_position + chunk_size <= data_len:
-                chunk = self.background_audio_data[self.current_position:self.current_position + chunk_size]
-                self.current_position += chunk_size
-            else:
-                first_part = self.background_audio_data[self.current_position:]
-                remaining = chunk_size - len(first_part)
-                second_part = self.background_audio_data[:remaining]
-                chunk = first_part + second_part
-                self.current_position = remaining
-            
-            return chunk
+        # Same loop as PCM with BACKGROUND_VOLUME_RATIO already applied, for mixing under the agent
+        self.mix_loop = self.asset.scaled_pcm(BACKGROUND_VOLUME_RATIO)
+        
+        self._build_packets()
+    
+    def _build_packets(self):
+        """Pre-encode the loop as ready-to-send response.stream messages, one per 20ms frame"""
+        # The partial frame at the loop end (< 20ms) is dropped so slots stay frame-aligned
+        frame_count = max(1, len(self.asset) // AUDIO_FRAME_SIZE)
+        self.packets = [
+            json.dumps({
+                "type": "response.stream",
+                "data": {"audio": base64.b64encode(self.loop_view[i * AUDIO_FRAME_SIZE:(i + 1) * AUDIO_FRAME_SIZE]).decode('utf-8')}
+            })
+            for i in range(frame_count)
+        ]
+        packet_bytes = sum(len(packet) for packet in self.packets)
+        logger.info(f"Background packets pre-encoded: {len(self.packets)} frames, {packet_bytes / 1024:.0f} KB")
+    
+    def create_cursor(self):
+        """New per-call reader over the shared loop (None if no audio is loaded)"""
+        if self.asset is None:
+            return None
+        return BackgroundAudioCursor(self)
     
     def start(self):
         self.is_running = True
@@ -196,6 +227,53 @@ class BackgroundAudioManager:
         self.is_running = False
         logger.info("Background audio stopped")
 
+class BackgroundAudioCursor:
+    """Per-call position into the shared background loop - no lock, no copy"""
+    
+    __slots__ = ("loop_view", "mix_loop", "packets", "data_len", "padding", "position", "is_running")
+    
+    def __init__(self, manager):
+        self.loop_view = manager.loop_view
+        self.mix_loop = manager.mix_loop
+        self.packets = manager.packets
+        self.data_len = len(manager.asset)
+        self.padding = len(self.loop_view) - self.data_len
+        self.position = 0
+        self.is_running = False
+    
+    def get_audio_chunk(self, chunk_size):
+        """Next μ-law chunk as a read-only memoryview into the shared loop"""
+        return self._take(self.loop_view, chunk_size).data
+    
+    def get_mix_chunk(self, num_samples):
+        """Next chunk as volume-scaled int16 PCM, ready to add under the agent"""
+        return self._take(self.mix_loop, num_samples)
+    
+    def next_packet(self):
+        """Next pre-encoded background-only message (JSON string) - only moves an index"""
+        # Snap forward to the frame grid (mixing under the agent can leave the position mid-frame)
+        index = -(-self.position // AUDIO_FRAME_SIZE) % len(self.packets)
+        self.position = ((index + 1) % len(self.packets)) * AUDIO_FRAME_SIZE
+        return self.packets[index]
+    
+    def _take(self, source, count):
+        if self.position >= self.data_len:
+            self.position = 0
+        
+        start = self.position
+        self.position = (start + count) % self.data_len
+        if count <= self.padding:
+            return source[start:start + count]
+        
+        # Larger than the padded tail (rare) - gather with a copy
+        return source[(start + np.arange(count)) % self.data_len]
+    
+    def start(self):
+        self.is_running = True
+    
+    def stop(self):
+        self.is_running = False
+
 class OptimizedAudioBuffer:
     """Audio buffer with minimal latency"""
     
@@ -280,7 +358,7 @@ class OptimizedMaqsamAudioSource(rtc.AudioSource):
                     mulaw_data
                 )
             else:
-                pcm_data = audioop.ulaw2lin(mulaw_data, 2)
+                pcm_data = codec.ulaw2lin(mulaw_data)
             
             if not pcm_data:
                 return
@@ -360,6 +438,9 @@ class OptimizedMaqsamWebSocketHandler:
         
         self.return_audio_buffer = OptimizedAudioBuffer()
         self.background_audio_manager = global_background_audio_manager
+        self.background_cursor = (
+            global_background_audio_manager.create_cursor() if global_background_audio_manager else None
+        )
         
         self.stats = {
             "audio_frames_sent_to_livekit": 0,
@@ -381,8 +462,8 @@ class OptimizedMaqsamWebSocketHandler:
         """Main handler for Maqsam WebSocket connection"""
         try:
             # Start background audio immediately
-            if self.background_audio_manager:
-                self.background_audio_manager.start()
+            if self.background_cursor:
+                self.background_cursor.start()
                 self.background_stream_task = asyncio.create_task(self._stream_background_audio())
                 logger.info("Background audio streaming started")
             
@@ -708,7 +789,7 @@ class OptimizedMaqsamWebSocketHandler:
                                 pcm_bytes
                             )
                         else:
-                            mulaw_bytes = audioop.lin2ulaw(pcm_bytes, 2)
+                            mulaw_bytes = codec.lin2ulaw(pcm_bytes)
                         
                         if mulaw_bytes:
                             await self.send_audio_to_maqsam_with_background(mulaw_bytes)
@@ -734,13 +815,9 @@ class OptimizedMaqsamWebSocketHandler:
             final_audio = agent_audio_data
             
             # Mix with background audio if available
-            if (self.background_audio_manager and 
-                self.background_audio_manager.is_running and 
-                self.background_audio_manager.background_audio_data):
-                
-                bg_chunk = self.background_audio_manager.get_audio_chunk(len(agent_audio_data))
-                if bg_chunk:
-                    final_audio = self._mix_audio_samples(agent_audio_data, bg_chunk)
+            if self.background_cursor and self.background_cursor.is_running:
+                bg_pcm = self.background_cursor.get_mix_chunk(len(agent_audio_data))
+                final_audio = self._mix_audio_samples(agent_audio_data, bg_pcm)
             
             encoded_audio = base64.b64encode(final_audio).decode('utf-8')
             message = {
@@ -760,47 +837,19 @@ class OptimizedMaqsamWebSocketHandler:
             logger.error(f"Error sending audio to Maqsam: {e}")
             return False
 
-    def _mix_audio_samples(self, agent_audio, bg_audio):
-        """Mix agent audio with background audio"""
+    def _mix_audio_samples(self, agent_audio, bg_pcm):
+        """Mix agent μ-law audio with pre-scaled background PCM"""
         try:
-            if not agent_audio or not bg_audio:
-                return agent_audio or bg_audio
-            
-            # Convert both to PCM for mixing
-            agent_pcm = audioop.ulaw2lin(agent_audio, 2)
-            bg_pcm = audioop.ulaw2lin(bg_audio, 2)
-            
-            # Ensure same length
-            agent_len = len(agent_pcm)
-            bg_len = len(bg_pcm)
+            if not agent_audio or bg_pcm is None or len(bg_pcm) == 0:
+                return agent_audio
             
-            if bg_len < agent_len:
-                repetitions = (agent_len // bg_len) + 1
-                bg_pcm = (bg_pcm * repetitions)[:agent_len]
-            elif bg_len > agent_len:
-                bg_pcm = bg_pcm[:agent_len]
+            agent_pcm = codec.decode(agent_audio)
             
-            # Convert to sample arrays
-            agent_samples = array.array('h')
-            bg_samples = array.array('h')
-            
-            agent_samples.frombytes(agent_pcm)
-            bg_samples.frombytes(bg_pcm)
-            
-            # Mix samples
-            mixed_samples = array.array('h')
-            for i in range(len(agent_samples)):
-                agent_sample = agent_samples[i]
-                bg_sample = int(bg_samples[i] * BACKGROUND_VOLUME_RATIO)
-                
-                # Prevent clipping
-                mixed_sample = agent_sample + bg_sample
-                mixed_sample = max(-32768, min(32767, mixed_sample))
-                mixed_samples.append(mixed_sample)
+            # Background already carries BACKGROUND_VOLUME_RATIO: one add + clamp
+            mixed_pcm = mixer.mix([agent_pcm, bg_pcm])
             
             # Convert back to μ-law
-            mixed_pcm = mixed_samples.tobytes()
-            return audioop.lin2ulaw(mixed_pcm, 2)
+            return codec.encode(mixed_pcm).tobytes()
             
         except Exception as e:
             logger.error(f"Error mixing audio: {e}")
@@ -808,7 +857,7 @@ class OptimizedMaqsamWebSocketHandler:
 
     async def _stream_background_audio(self):
         """Stream background audio when agent is not speaking"""
-        if not self.background_audio_manager or not self.background_audio_manager.background_audio_data:
+        if not self.background_cursor:
             logger.warning("No background audio available")
             return
         
@@ -825,19 +874,9 @@ class OptimizedMaqsamWebSocketHandler:
                     await asyncio.sleep(0.02)
                     continue
                 
-                # Send background audio chunk
-                chunk_size = AUDIO_FRAME_SIZE
-                bg_chunk = self.background_audio_manager.get_audio_chunk(chunk_size)
-                
-                if bg_chunk:
-                    encoded_audio = base64.b64encode(bg_chunk).decode('utf-8')
-                    message = {
-                        "type": "response.stream",
-                        "data": {"audio": encoded_audio}
-                    }
-                    
-                    await self.websocket.send(json.dumps(message))
-                    self.messages_sent += 1
+                # Send the next pre-encoded background frame (no slicing/base64/JSON per call)
+                await self.websocket.send(self.background_cursor.next_packet())
+                self.messages_sent += 1
                 
                 # 20ms intervals for background audio
                 await asyncio.sleep(0.02)
@@ -1014,8 +1053,8 @@ class OptimizedMaqsamWebSocketHandler:
             self.agent_connection_timeout_task.cancel()
         
         # Stop background audio
-        if self.background_audio_manager:
-            self.background_audio_manager.stop()
+        if self.background_cursor:
+            self.background_cursor.stop()
         
         # Cancel background streaming task
         if self.background_stream_task and not self.background_stream_task.done():
@@ -1158,7 +1197,7 @@ async def start_maqsam_websocket_server():
             logger.info(f"Agent connection timeout: {AGENT_CONNECTION_TIMEOUT}s")
             logger.info(f"Audio frame size: {AUDIO_FRAME_SIZE} samples (20ms)")
             logger.info(f"Background audio: {ENABLE_BACKGROUND_AUDIO}")
-            if ENABLE_BACKGROUND_AUDIO and global_background_audio_manager and global_background_audio_manager.background_audio_data:
+            if ENABLE_BACKGROUND_AUDIO and global_background_audio_manager and global_background_audio_manager.asset is not None:
                 logger.info(f"Background file: {BACKGROUND_AUDIO_FILE} (loaded)")
             logger.info("Server ready for connections...")
             
@@ -1250,7 +1289,7 @@ async def main():
     if ENABLE_BACKGROUND_AUDIO:
         logger.info("Pre-loading background audio...")
         global_background_audio_manager = BackgroundAudioManager(BACKGROUND_AUDIO_FILE)
-        if global_background_audio_manager.background_audio_data:
+        if global_background_audio_manager.asset is not None:
             logger.info("Background audio loaded successfully")
         else:
             logger.warning("Background audio failed to load")
@@ -258,6 +258,7 @@ import websockets
 from urllib.parse import urlparse, parse_qs
 from config import WEBSOCKET_HOST, WEBSOCKET_PORT, get_agent_name
 from telephony.websocket_handler import TelephonyWebSocketHandler
+from audio.noise_profile_cache import flush_noise_profile_cache
 
 logger = logging.getLogger(__name__)
 
@@ -330,6 +331,22 @@ class WebSocketServerManager:
                 except ValueError:
                     logger.warning(f"⚠️ Invalid noise volume: {query['noise_volume'][0]}")
             
+            # Per-call VAD tier (e.g. &vad=energy for low-cost calls)
+            vad_settings = {}
+            if "vad" in query:
+                vad_settings["backend"] = query["vad"][0].lower()
+                logger.info(f"🎤 VAD backend: {vad_settings['backend']}")
+            
+            # Per-call user audio pipeline (e.g. &pipeline=no_nc, &stages=decode,vad,agent, &bypass=features)
+            pipeline_settings = {}
+            if "pipeline" in query:
+                pipeline_settings["profile"] = query["pipeline"][0].lower()
+                logger.info(f"🧩 Pipeline profile: {pipeline_settings['profile']}")
+            for key in ("stages", "bypass"):
+                if key in query:
+                    pipeline_settings[key] = [name.strip() for name in query[key][0].lower().split(",") if name.strip()]
+                    logger.info(f"🧩 Pipeline {key}: {pipeline_settings[key]}")
+            
             # Show all parsed query parameters
             logger.info(f"📋 All parsed query parameters:")
             for key, value in query.items():
@@ -343,7 +360,8 @@ class WebSocketServerManager:
             
             # Create handler for Plivo WebSocket (ONLY ONCE)
             logger.info(f"🆕 Creating handler with agent_name='{agent_name}', outbound={outbound_agent_exists}")
-            handler = TelephonyWebSocketHandler(room_name, websocket, agent_name, noise_settings)
+            handler = TelephonyWebSocketHandler(room_name, websocket, agent_name, noise_settings, vad_settings,
+                                                pipeline_settings)
             
             # CRITICAL FIX: Set the outbound flag IMMEDIATELY after creation
             handler.outbound_agent_exists = outbound_agent_exists
@@ -417,6 +435,9 @@ class WebSocketServerManager:
             # Step 2: Clean up all active handlers
             await self.cleanup_all_handlers()
             
+            # Step 3: Write noise profiles still waiting for the coalesced save
+            await flush_noise_profile_cache()
+            
         except Exception as e:
             logger.error(f"❌ Error during WebSocket server graceful shutdown: {e}")
         finally:
@@ -84,6 +84,9 @@ class PlivoMessageHandler:
         else:
             logger.info(f"✅ Stream ID captured: {self.stream_sid}")
 
+        if websocket_handler:
+            websocket_handler.on_call_started(start_data)
+
         # Create database record if we have the API
         if call_id and websocket_handler:
             await self._create_inbound_call_record(
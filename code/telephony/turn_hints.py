@@ -0,0 +1,168 @@
+"""
+End-of-turn hints for the agent over the LiveKit data channel
+Speech start/end events from the bridge's VAD are batched into small JSON
+packets on a dedicated topic and rate-limited. The publisher also watches the
+agent's own state (lk.agent.state attribute set by LiveKit agents) to record
+how much earlier than the agent's endpointing each end-of-turn hint arrived
+"""
+import asyncio
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+AGENT_STATE_ATTRIBUTE = "lk.agent.state"
+AGENT_TURN_STATE = "thinking"   # Agent has decided the user's turn is over
+MATCH_WINDOW_S = 3.0            # Hint and agent detection further apart than this are unrelated
+CLOSE_FLUSH_TIMEOUT_S = 0.5     # Wait this long for an in-flight packet at hangup
+
+
+class TurnHintPublisher:
+    """Batched, rate-limited speech start/end hints for one call"""
+
+    def __init__(self, livekit_manager, topic="turn_hints", batch_ms=20, max_per_second=10):
+        """
+        Args:
+            livekit_manager: call's LiveKitManager (room + connection state)
+            topic: data channel topic agents subscribe to
+            batch_ms: events within this window go out as one packet
+            max_per_second: token-bucket rate limit on turns (burst of the same size); a
+                speech_start takes a token and its speech_end always follows it
+        """
+        self.livekit_manager = livekit_manager
+        self.topic = topic
+        self.batch_delay = batch_ms / 1000.0
+        self.max_per_second = max_per_second
+
+        self.pending = []
+        self.flush_task = None
+        self.seq = 0
+        self.tokens = float(max_per_second)
+        self.last_refill = time.monotonic()
+        self.turn_suppressed = False
+
+        # Lead time tracking (monotonic clock)
+        self.last_end_hint = None
+        self.last_agent_turn = None
+
+        # Stats
+        self.events_sent = 0
+        self.packets_sent = 0
+        self.rate_limited = 0
+        self.publish_errors = 0
+        self.lead_times_ms = []
+
+    def hint(self, event, confidence):
+        """
+        Queue a speech event
+
+        Args:
+            event: "speech_start" | "speech_end"
+            confidence: VAD confidence of the window that triggered it
+        """
+        # Rate-limit whole turns so the agent never sees an orphaned start or end
+        if event == "speech_start":
+            self.turn_suppressed = not self._take_token()
+        if self.turn_suppressed:
+            self.rate_limited += 1
+            return
+
+        now = time.monotonic()
+        self.seq += 1
+        self.pending.append({
+            "event": event,
+            "seq": self.seq,
+            "ts": round(time.time() * 1000),
+            "confidence": round(float(confidence), 3)
+        })
+
+        if event == "speech_end":
+            self.last_end_hint = now
+            # Agent already ended the turn on its own - the hint was late
+            if self.last_agent_turn is not None and now - self.last_agent_turn < MATCH_WINDOW_S:
+                self._record_lead(self.last_agent_turn - now)
+                self.last_agent_turn = None
+                self.last_end_hint = None
+
+        if self.flush_task is None:
+            self.flush_task = asyncio.create_task(self._flush_after_delay())
+
+    def on_agent_state(self, state):
+        """Agent participant's lk.agent.state changed"""
+        if state != AGENT_TURN_STATE:
+            return
+
+        now = time.monotonic()
+        if self.last_end_hint is not None and now - self.last_end_hint < MATCH_WINDOW_S:
+            self._record_lead(now - self.last_end_hint)
+            self.last_end_hint = None
+        else:
+            self.last_agent_turn = now
+
+    def _record_lead(self, seconds):
+        lead_ms = seconds * 1000
+        self.lead_times_ms.append(lead_ms)
+        logger.debug(f"⏱️ End-of-turn hint lead: {lead_ms:+.0f}ms")
+
+    def _take_token(self):
+        now = time.monotonic()
+        self.tokens = min(self.max_per_second, self.tokens + (now - self.last_refill) * self.max_per_second)
+        self.last_refill = now
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+    async def _flush_after_delay(self):
+        try:
+            await asyncio.sleep(self.batch_delay)
+            await self.flush()
+        finally:
+            self.flush_task = None
+
+    async def flush(self):
+        """Publish every queued event as one packet"""
+        events, self.pending = self.pending, []
+        if not events or not self.livekit_manager.is_connected():
+            return
+
+        room = self.livekit_manager.get_room()
+        if not room:
+            return
+
+        try:
+            payload = json.dumps({"type": "turn_hints", "events": events}, separators=(",", ":"))
+            await room.local_participant.publish_data(payload.encode(), reliable=True, topic=self.topic)
+            self.packets_sent += 1
+            self.events_sent += len(events)
+        except Exception as e:
+            self.publish_errors += 1
+            if self.publish_errors <= 5:
+                logger.error(f"❌ Error publishing turn hints: {e}")
+
+    async def close(self):
+        """Send anything still queued and stop (the in-flight packet is awaited, not dropped)"""
+        task = self.flush_task
+        if task is not None and not task.done():
+            # The task may already hold the swapped-out events - let it publish them
+            await asyncio.wait({task}, timeout=CLOSE_FLUSH_TIMEOUT_S)
+            if not task.done():
+                logger.warning("⚠️ Turn hint flush still pending at close - cancelled")
+                task.cancel()
+        await self.flush()
+
+    def get_stats(self):
+        """Hint statistics - lead_ms > 0 means the hint beat the agent's own endpointing"""
+        leads = sorted(self.lead_times_ms)
+        return {
+            "topic": self.topic,
+            "events_sent": self.events_sent,
+            "packets_sent": self.packets_sent,
+            "rate_limited": self.rate_limited,
+            "publish_errors": self.publish_errors,
+            "turns_matched": len(leads),
+            "avg_lead_ms": sum(leads) / len(leads) if leads else None,
+            "median_lead_ms": leads[len(leads) // 2] if leads else None,
+            "early_ratio": sum(1 for lead in leads if lead > 0) / len(leads) if leads else None
+        }
@@ -345,32 +345,44 @@
 
 """
 WebSocket handler - WITH VAD, NOISE CANCELLATION, AND INTERRUPTION DETECTION
-Audio flow:
+Audio flow (user side is a per-call pipeline, see audio/user_pipeline.py; default profile):
 1. User audio (μ-law) → PCM
-2. Noise cancellation (if enabled)
-3. VAD processing (if enabled)
-4. Interruption detection (if enabled)
-5. Clean audio → μ-law → LiveKit (agent)
+2. Noise cancellation (if enabled) - with the vad_first profile a cheap energy VAD
+   on the raw PCM runs first and only speech frames are denoised
+3. VAD processing (if enabled) - queued per call, inference off the event loop
+4. Interruption detection (if enabled) - on each VAD result; speech start/end
+   also go to the agent as end-of-turn hints (data channel)
+5. Clean PCM → LiveKit (agent), without waiting for VAD (inbound DTX, if enabled,
+   stops frames during sustained silence)
 6. Agent audio → Background mixing → Plivo
 """
 import asyncio
 import time
 import logging
 import websockets
-import audioop
 from livekit import rtc
 
+from audio import codec
 from audio.telephony_audio_source import TelephonyAudioSource
 from audio.audio_processor import AudioProcessor
-from audio.vad_processor import SileroVADProcessor
+from audio.vad_processor import create_vad_processor
+from audio.vad_stream import VADStream
 from audio.noise_suppression import NoiseSuppressionProcessor
+from audio.noise_profile_cache import get_noise_profile_cache, profile_key_from_plivo
+from audio.nc_activation import NoiseActivationController
+from audio.speech_gate import SpeechFirstGate
+from audio.dtx import InboundDTX
+from audio.frame_features import FeatureExtractor
+from audio.user_pipeline import UserAudioPipeline, resolve_pipeline
 from audio.interruption_detector import InterruptionDetector
 from lk_utils.livekit_manager import LiveKitManager
 from agents.agent_manager import AgentManager
 from telephony.plivo_handler import PlivoMessageHandler
 from telephony.agent_monitor import AgentConnectionMonitor
+from telephony.turn_hints import TurnHintPublisher, AGENT_STATE_ATTRIBUTE
 from config import (
-    get_vad_config, get_noise_cancellation_config, get_interruption_config
+    get_vad_config, get_noise_cancellation_config, get_interruption_config, get_turn_hints_config,
+    get_dtx_config, get_nc_activation_config, get_user_pipeline_config
 )
 
 logger = logging.getLogger(__name__)
@@ -379,7 +391,8 @@ logger = logging.getLogger(__name__)
 class TelephonyWebSocketHandler:
     """WebSocket handler with VAD, noise cancellation, and interruption detection"""
     
-    def __init__(self, room_name, websocket, agent_name=None, noise_settings=None):
+    def __init__(self, room_name, websocket, agent_name=None, noise_settings=None, vad_settings=None,
+                 pipeline_settings=None):
         self.room_name = room_name
         self.websocket = websocket
         self.agent_name = agent_name
@@ -407,15 +420,34 @@ class TelephonyWebSocketHandler:
         nc_config = get_noise_cancellation_config()
         int_config = get_interruption_config()
         
-        # VAD Processor
-        self.vad_processor = SileroVADProcessor(
+        # User audio stage order (profile unless the call overrides it)
+        pipeline_config = get_user_pipeline_config()
+        pipeline_settings = pipeline_settings or {}
+        pipeline_profile, pipeline_stages = resolve_pipeline(
+            profile=pipeline_settings.get("profile", pipeline_config["profile"]),
+            stages=pipeline_settings.get("stages", pipeline_config["stages"])
+        )
+        
+        # VAD Processor (tier from VAD_BACKEND unless the call overrides it)
+        vad_settings = vad_settings or {}
+        self.vad_processor = create_vad_processor(
+            backend=vad_settings.get("backend", vad_config["backend"]),
             enabled=vad_config["enabled"],
             threshold=vad_config["threshold"],
             speech_frames=vad_config["speech_frames"],
             silence_frames=vad_config["silence_frames"],
+            batching=vad_config["batching"],
+            gate=vad_config["gate"],
+            offload=vad_config["offload"],
             sample_rate=8000  # Telephony rate
         )
         
+        # Per-call ordered VAD queue - results come back through _on_vad_result
+        self.vad_stream = None
+        if vad_config["offload"]:
+            self.vad_stream = VADStream(self.vad_processor, self._on_vad_result,
+                                        deadline_ms=vad_config["deadline_ms"])
+        
         # Noise Suppression
         self.noise_suppressor = NoiseSuppressionProcessor(
             enabled=nc_config["enabled"],
@@ -425,6 +457,42 @@ class TelephonyWebSocketHandler:
             learning_frames=nc_config["learning_frames"]
         )
         
+        # Per-caller noise profiles: warm start on the Plivo start event, stored back at cleanup
+        self.noise_profile_cache = None
+        self.noise_profile_key = None
+        if self.noise_suppressor.enabled and nc_config["stationary"] and nc_config["profile_cache"]:
+            self.noise_profile_cache = get_noise_profile_cache()
+        
+        # Adaptive NC: per-call on/off from the measured noise floor
+        activation_config = get_nc_activation_config()
+        self.nc_activation = None
+        if self.noise_suppressor.enabled and activation_config["enabled"]:
+            self.nc_activation = NoiseActivationController(
+                on_db=activation_config["on_db"],
+                hysteresis_db=activation_config["hysteresis_db"],
+                max_snr_db=activation_config["max_snr_db"],
+                hold_frames=activation_config["hold_frames"],
+                warmup_frames=activation_config["warmup_frames"]
+            )
+        
+        # VAD-first ordering: cheap raw-PCM speech decision in front of NC
+        self.speech_gate = None
+        if self.noise_suppressor.enabled and "speech_gate" in pipeline_stages:
+            self.speech_gate = SpeechFirstGate(
+                mode=nc_config["nonspeech_mode"],
+                gain_db=nc_config["nonspeech_gain_db"],
+                hangover_frames=nc_config["hangover_frames"],
+                sample_rate=8000
+            )
+        
+        # Shared per-frame features (level, activity, STFT) read by the stages after it
+        self.feature_extractor = None
+        if "features" in pipeline_stages:
+            self.feature_extractor = FeatureExtractor(
+                sample_rate=8000,
+                activity=bool(self.speech_gate) or get_dtx_config()["enabled"]
+            )
+        
         # Interruption Detector
         self.interruption_detector = InterruptionDetector(
             enabled=int_config["enabled"],
@@ -433,9 +501,20 @@ class TelephonyWebSocketHandler:
         
         self.interruption_signal_agent = int_config["signal_agent"]
         
+        # End-of-turn hints to the agent (needs VAD)
+        hint_config = get_turn_hints_config()
+        self.turn_hints = None
+        if hint_config["enabled"] and self.vad_processor.enabled:
+            self.turn_hints = TurnHintPublisher(
+                self.livekit_manager,
+                topic=hint_config["topic"],
+                batch_ms=hint_config["batch_ms"],
+                max_per_second=hint_config["max_per_second"]
+            )
+        
         # Log configuration
         logger.info(f"🆕 Handler created for room: {room_name}")
-        logger.info(f"   🎤 VAD: {vad_config['enabled']}")
+        logger.info(f"   🎤 VAD: {vad_config['enabled']} ({self.vad_processor.backend})")
         logger.info(f"   🔇 Noise Cancellation: {nc_config['enabled']}")
         logger.info(f"   🚨 Interruption Detection: {int_config['enabled']}")
         
@@ -466,9 +545,26 @@ class TelephonyWebSocketHandler:
             "vad_speech_frames": 0,
             "vad_silence_frames": 0,
             "noise_cancelled_frames": 0,
+            "nc_bypassed_frames": 0,
+            "nc_inactive_frames": 0,
             "interruptions_detected": 0
         }
         
+        # User audio pipeline over the components above
+        self.user_pipeline = UserAudioPipeline(pipeline_profile, pipeline_stages, {
+            "feature_extractor": self.feature_extractor,
+            "nc_activation": self.nc_activation,
+            "speech_gate": self.speech_gate,
+            "noise_suppressor": self.noise_suppressor,
+            "vad_processor": self.vad_processor,
+            "vad_stream": self.vad_stream,
+            "on_vad_result": self._on_vad_result,
+            "get_audio_source": lambda: self.audio_source,
+            "stats": self.stats
+        })
+        for stage in pipeline_settings.get("bypass", ()):
+            self.user_pipeline.set_bypass(stage)
+        
         # Log noise status
         noise_status = self.audio_processor.get_noise_status()
         if noise_status["enabled"]:
@@ -478,7 +574,8 @@ class TelephonyWebSocketHandler:
         """Initialize handler"""
         logger.info(f"🚀 Initializing...")
         
-        # Start background audio
+        # Start background audio (decoded once per process, shared across calls)
+        await self.audio_processor.load_background_audio()
         noise_status = self.audio_processor.get_noise_status()
         if noise_status["enabled"]:
             logger.info("🎵 Background noise ready for mixing...")
@@ -520,6 +617,7 @@ class TelephonyWebSocketHandler:
             'on_participant_connected': self._on_participant_connected,
             'on_participant_disconnected': self._on_participant_disconnected,
             'on_track_subscribed': self._on_track_subscribed,
+            'on_participant_attributes_changed': self._on_participant_attributes_changed,
         }
         
         success = await self.livekit_manager.connect_to_room(event_handlers)
@@ -530,7 +628,17 @@ class TelephonyWebSocketHandler:
         return success
     
     async def _setup_audio_track(self):
-        self.audio_source = TelephonyAudioSource()
+        dtx_config = get_dtx_config()
+        dtx = None
+        if dtx_config["enabled"]:
+            dtx = InboundDTX(
+                hangover_frames=dtx_config["hangover_frames"],
+                preroll_frames=dtx_config["preroll_frames"],
+                comfort_interval_frames=dtx_config["comfort_interval_frames"],
+                sample_rate=8000
+            )
+        
+        self.audio_source = TelephonyAudioSource(dtx=dtx)
         self.audio_track = rtc.LocalAudioTrack.create_audio_track(
             "telephony-audio", 
             self.audio_source
@@ -559,6 +667,12 @@ class TelephonyWebSocketHandler:
             logger.warning("🤖 Agent disconnected")
             asyncio.create_task(self._terminate_call_immediately("Agent disconnected"))
     
+    def _on_participant_attributes_changed(self, changed_attributes, participant):
+        # Agent's own turn detection - used to measure how early our hints are
+        if self.turn_hints and AGENT_STATE_ATTRIBUTE in changed_attributes:
+            if self.agent_manager.is_agent_participant(participant):
+                self.turn_hints.on_agent_state(changed_attributes[AGENT_STATE_ATTRIBUTE])
+    
     async def _terminate_call_immediately(self, reason):
         if self.call_ended:
             return
@@ -640,27 +754,15 @@ class TelephonyWebSocketHandler:
                     last_log_time = current_time
                 
                 try:
-                    # Convert agent audio to telephony
-                    telephony_chunks = self.audio_processor.convert_livekit_to_telephony(
+                    # Resample, mix with background in PCM, encode to μ-law once
+                    mixed_chunks = self.audio_processor.process_outbound_frame(
                         audio_frame_event.frame
                     )
                     
-                    # Mix each chunk with background BEFORE sending
-                    for agent_chunk in telephony_chunks:
+                    for mixed_chunk in mixed_chunks:
                         if self.cleanup_started or self.call_ended:
                             break
                         
-                        # Get matching background chunk
-                        bg_chunk = self.audio_processor.get_background_audio_chunk(len(agent_chunk))
-                        
-                        # Mix agent + background
-                        if bg_chunk:
-                            mixed_chunk = self.audio_processor.mix_audio_chunks(
-                                agent_chunk, bg_chunk
-                            )
-                        else:
-                            mixed_chunk = agent_chunk
-                        
                         # Send ONE mixed stream to Plivo
                         await self.plivo_handler.send_audio_to_plivo(
                             self.websocket, mixed_chunk
@@ -701,7 +803,8 @@ class TelephonyWebSocketHandler:
     async def _handle_user_audio(self, audio_data):
         """
         User audio processing pipeline with VAD and noise cancellation
-        Flow: μ-law → PCM → Noise Cancel → VAD → Interruption → μ-law → Agent
+        Stages and their order come from the call's pipeline profile
+        (default: μ-law → PCM → Features → Noise Cancel → VAD → Interruption → Agent (PCM))
         """
         if self.cleanup_started or self.call_ended:
             return
@@ -710,60 +813,57 @@ class TelephonyWebSocketHandler:
             return
         
         try:
-            # Step 1: Convert μ-law to PCM for processing
-            pcm_data = audioop.ulaw2lin(audio_data, 2)
-            
-            # Step 2: Apply noise cancellation (if enabled)
-            if self.noise_suppressor.enabled:
-                clean_pcm = self.noise_suppressor.process_chunk(pcm_data)
-                self.stats["noise_cancelled_frames"] += 1
-            else:
-                clean_pcm = pcm_data
-            
-            # Step 3: Run VAD on clean audio (if enabled)
-            vad_result = self.vad_processor.process_chunk(clean_pcm)
-            
-            if vad_result["is_speech"]:
-                self.stats["vad_speech_frames"] += 1
-            else:
-                self.stats["vad_silence_frames"] += 1
-            
-            # Step 4: Check for interruptions (if enabled)
-            if self.interruption_detector.enabled:
-                interruption = self.interruption_detector.check_interruption(
-                    vad_result, 
-                    self.agent_is_speaking
-                )
-                
-                if interruption:
-                    self.stats["interruptions_detected"] += 1
-                    
-                    # Send interruption signal to agent (if configured)
-                    if self.interruption_signal_agent:
-                        await self._signal_agent_interruption()
+            await self.user_pipeline.run(audio_data)
             
-            # Step 5: Convert back to μ-law for LiveKit
-            clean_mulaw = audioop.lin2ulaw(clean_pcm, 2)
-            
-            # Step 6: Send clean audio to LiveKit (agent hears clean audio)
-            await self.audio_source.push_audio_data(clean_mulaw)
-            self.stats["audio_frames_sent_to_livekit"] += 1
-            
-            # Step 7: Log stats occasionally
-            if self.stats["audio_frames_sent_to_livekit"] % 500 == 0:
+            # Log stats occasionally
+            if self.user_pipeline.frames % 500 == 0:
                 self._log_processing_stats()
                 
         except Exception as e:
             logger.error(f"❌ Error processing user audio: {e}")
 
+    async def _on_vad_result(self, vad_result):
+        """VAD result for one user frame (from the call's VAD stream, in order)"""
+        if vad_result.is_speech:
+            self.stats["vad_speech_frames"] += 1
+        else:
+            self.stats["vad_silence_frames"] += 1
+        
+        if self.audio_source:
+            self.audio_source.note_speech(vad_result.user_speaking)
+        
+        # End-of-turn hints (batched/rate-limited by the publisher)
+        if self.turn_hints:
+            if vad_result.speech_started:
+                self.turn_hints.hint("speech_start", vad_result.confidence)
+            elif vad_result.speech_ended:
+                self.turn_hints.hint("speech_end", vad_result.confidence)
+        
+        # Check for interruptions (if enabled)
+        if self.interruption_detector.enabled:
+            interruption = self.interruption_detector.check_interruption(
+                vad_result, 
+                self.agent_is_speaking
+            )
+            
+            if interruption:
+                self.stats["interruptions_detected"] += 1
+                
+                # Send interruption signal to agent (if configured)
+                if self.interruption_signal_agent:
+                    await self._signal_agent_interruption()
+
     def _log_processing_stats(self):
         """Log audio processing statistics"""
         total_vad = self.stats["vad_speech_frames"] + self.stats["vad_silence_frames"]
         speech_ratio = (self.stats["vad_speech_frames"] / total_vad * 100) if total_vad > 0 else 0
         
         logger.info(f"📊 Processing stats:")
-        logger.info(f"   Frames processed: {self.stats['audio_frames_sent_to_livekit']}")
+        logger.info(f"   Frames processed: {self.stats['audio_frames_sent_to_livekit']} "
+                   f"({self.user_pipeline.get_stats()['per_frame_us']:.0f}µs/frame in the pipeline)")
         logger.info(f"   Noise cancelled: {self.stats['noise_cancelled_frames']}")
+        if self.speech_gate:
+            logger.info(f"   NC bypassed (non-speech): {self.stats['nc_bypassed_frames']}")
         logger.info(f"   VAD speech: {self.stats['vad_speech_frames']} ({speech_ratio:.1f}%)")
         logger.info(f"   Interruptions: {self.stats['interruptions_detected']}")
     
@@ -783,6 +883,30 @@ class TelephonyWebSocketHandler:
         except Exception as e:
             logger.error(f"❌ Error signaling interruption: {e}")
 
+    def on_call_started(self, start_data):
+        """Plivo start event - warm-start noise suppression from the caller's cached profile"""
+        if not self.noise_profile_cache:
+            return
+        
+        self.noise_profile_key = profile_key_from_plivo(start_data, outbound=self.outbound_agent_exists)
+        profile = self.noise_profile_cache.get(self.noise_profile_key)
+        if profile and self.noise_suppressor.load_noise_profile(profile):
+            logger.info(f"🎯 Noise profile warm start for {self.noise_profile_key}")
+            if self.nc_activation:
+                self.nc_activation.warm_start(profile.get("floor_db"))
+    
+    async def _store_noise_profile(self):
+        """Save this call's (refined) noise profile for the next call from the same caller"""
+        if not self.noise_profile_cache or not self.noise_profile_key:
+            return
+        
+        profile = self.noise_suppressor.get_noise_profile()
+        if profile:
+            if self.nc_activation and self.nc_activation.floor_db is not None:
+                profile["floor_db"] = round(self.nc_activation.floor_db, 1)
+            self.noise_profile_cache.put(self.noise_profile_key, profile)
+            await self.noise_profile_cache.save_async()
+    
     async def _handle_plivo_event(self, event_type):
         if event_type == "call_ended":
             await self._terminate_call_immediately("Plivo call ended")
@@ -810,13 +934,33 @@ class TelephonyWebSocketHandler:
             self.audio_processor.stop()
         
         # Reset VAD/NC/Interruption states
+        if self.vad_stream:
+            await self.vad_stream.close()
         if self.vad_processor:
             self.vad_processor.reset()
+            self.vad_processor.close()
         if self.noise_suppressor:
+            try:
+                await asyncio.wait_for(self._store_noise_profile(), timeout=2.0)
+            except Exception as e:
+                logger.error(f"❌ Error storing noise profile: {e}")
             self.noise_suppressor.reset()
+        if self.speech_gate:
+            self.speech_gate.reset()
+        if self.nc_activation:
+            self.nc_activation.reset()
+        if self.feature_extractor:
+            self.feature_extractor.reset()
         if self.interruption_detector:
             self.interruption_detector.reset()
         
+        # Flush pending turn hints while the room is still connected
+        if self.turn_hints:
+            try:
+                await asyncio.wait_for(self.turn_hints.close(), timeout=1.0)
+            except:
+                pass
+        
         # Disconnect LiveKit
         try:
             await asyncio.wait_for(self.livekit_manager.disconnect(), timeout=3.0)
@@ -837,13 +981,80 @@ class TelephonyWebSocketHandler:
         logger.info(f"   Frames to LiveKit: {self.stats['audio_frames_sent_to_livekit']}")
         logger.info(f"   Mixed frames sent: {self.stats['mixed_frames_sent']}")
         
+        # Pooled buffers - allocations should stay flat once the call is warm
+        buffer_stats = self.audio_processor.get_buffer_stats()
+        outbound_allocations = sum(pool["allocations"] for pool in buffer_stats["pools"])
+        logger.info(f"   Outbound buffer allocations: {outbound_allocations} "
+                   f"over {buffer_stats['outbound_frames']} frames")
+        if self.audio_source:
+            inbound_pool = self.audio_source.get_stats()["frame_pool"]
+            logger.info(f"   Inbound frame allocations: {inbound_pool['allocations']} "
+                       f"({inbound_pool['allocations_per_frame']:.4f}/frame)")
+            dtx = self.audio_source.get_stats().get("dtx")
+            if dtx:
+                logger.info(f"   Inbound DTX: {dtx['frames_suppressed']}/{dtx['frames']} frames suppressed "
+                           f"({dtx['suppressed_ratio'] * 100:.1f}%), {dtx['dtx_periods']} silent periods, "
+                           f"{dtx['comfort_frames']} comfort frames")
+        
+        # Per-stage CPU of the user audio pipeline
+        pipeline = self.user_pipeline.get_stats()
+        logger.info(f"   User pipeline '{pipeline['profile']}': {pipeline['per_frame_us']:.0f}µs/frame "
+                   f"over {pipeline['frames']} frames")
+        for stage in pipeline["stages"]:
+            bypassed = f", {stage['bypassed_frames']} bypassed" if stage["bypassed_frames"] else ""
+            errors = f", {stage['errors']} errors" if stage["errors"] else ""
+            logger.info(f"      {stage['name']}: {stage['per_frame_us']:.1f}µs/frame "
+                       f"(max {stage['max_us']:.0f}µs){bypassed}{errors}")
+        if self.feature_extractor:
+            features = self.feature_extractor.get_stats()
+            logger.info(f"   Frame features: {features['frames']} frames, {features['stft_frames']} shared STFTs")
+        
         if self.noise_suppressor.enabled:
-            logger.info(f"   Noise cancelled: {self.stats['noise_cancelled_frames']}")
+            logger.info(f"   Noise cancelled: {self.stats['noise_cancelled_frames']} "
+                       f"({self.noise_suppressor.get_frame_cost_ms():.3f}ms/frame, "
+                       f"{self.noise_suppressor.latency_ms:.0f}ms latency)")
+            if self.noise_profile_cache:
+                cache = self.noise_profile_cache.get_stats()
+                logger.info(f"   NC profile cache: key {self.noise_profile_key}, {cache['profiles']} profiles, "
+                           f"{cache['hits']} hits / {cache['misses']} misses")
+            if self.nc_activation:
+                # NC frame cost is only known if it ran at some point in the call
+                nc_frame_ms = self.noise_suppressor.get_frame_cost_ms()
+                activation = self.nc_activation.get_stats(nc_frame_ms if nc_frame_ms else None)
+                saved = f", ~{activation['nc_ms_saved']:.0f}ms CPU saved" if "nc_ms_saved" in activation else ""
+                logger.info(f"   NC active: {activation['active_ratio'] * 100:.1f}% of call, "
+                           f"{activation['switches']} switches, monitor {activation['monitor_ms']:.0f}ms{saved}")
+            if self.speech_gate:
+                # Per-stage CPU: what the gate cost vs NC it avoided
+                nc_frame_ms = self.noise_suppressor.get_frame_cost_ms()
+                gate = self.speech_gate.get_stats(nc_frame_ms)
+                logger.info(f"   NC bypassed: {gate['bypassed_frames']} frames ({gate['bypass_ratio'] * 100:.1f}%, "
+                           f"{gate['mode']}), NC {nc_frame_ms:.2f}ms/frame, gate {gate['gate_ms']:.0f}ms total, "
+                           f"~{gate['nc_ms_saved']:.0f}ms CPU saved")
         
         if self.vad_processor.enabled:
             total_vad = self.stats["vad_speech_frames"] + self.stats["vad_silence_frames"]
             speech_ratio = (self.stats["vad_speech_frames"] / total_vad * 100) if total_vad > 0 else 0
             logger.info(f"   VAD speech frames: {self.stats['vad_speech_frames']} ({speech_ratio:.1f}%)")
+            
+            vad_cpu = self.vad_processor.get_cpu_stats()
+            logger.info(f"   VAD CPU ({vad_cpu['backend']}): {vad_cpu['inference_ms']:.0f}ms over "
+                       f"{vad_cpu['windows']} windows ({vad_cpu['per_window_us']:.0f}µs/window)")
+            if "gate_skip_ratio" in vad_cpu:
+                logger.info(f"   VAD pre-gate skipped: {vad_cpu['gate_skip_ratio'] * 100:.1f}% of windows")
+            logger.info(f"   VAD event-loop time: {vad_cpu['loop_ms']:.0f}ms")
+            if self.vad_stream:
+                stream = self.vad_stream.get_stats()
+                logger.info(f"   VAD latency: avg {stream['avg_latency_ms']:.1f}ms, max {stream['max_latency_ms']:.1f}ms, "
+                           f"stale frames {stream['stale_frames']}")
         
         if self.interruption_detector.enabled:
-            logger.info(f"   Interruptions detected: {self.stats['interruptions_detected']}")
\ No newline at end of file
+            logger.info(f"   Interruptions detected: {self.stats['interruptions_detected']}")
+        
+        if self.turn_hints:
+            hints = self.turn_hints.get_stats()
+            logger.info(f"   Turn hints: {hints['events_sent']} events in {hints['packets_sent']} packets, "
+                       f"{hints['rate_limited']} rate-limited")
+            if hints["turns_matched"]:
+                logger.info(f"   Turn hint lead vs agent: median {hints['median_lead_ms']:+.0f}ms, "
+                           f"early on {hints['early_ratio'] * 100:.0f}% of {hints['turns_matched']} turns")
\ No newline at end of file
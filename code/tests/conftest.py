@@ -0,0 +1,11 @@
+"""
+Test setup: modules are imported the way the app imports them (from the code/
+directory). Run from code/:
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if CODE_DIR not in sys.path:
+    sys.path.insert(0, CODE_DIR)
@@ -0,0 +1,89 @@
+"""μ-law codec against a scalar port of the G.711 reference (audioop.c)"""
+import warnings
+import numpy as np
+import pytest
+from audio import codec
+
+SEG_END = (0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF)
+BIAS = 0x84
+CLIP = 8159
+
+
+def reference_ulaw2linear(code):
+    code = ~code & 0xFF
+    t = (((code & 0x0F) << 3) + BIAS) << ((code & 0x70) >> 4)
+    return BIAS - t if code & 0x80 else t - BIAS
+
+
+def reference_linear2ulaw(sample):
+    pcm = sample >> 2  # 14-bit
+    if pcm < 0:
+        pcm, mask = -pcm, 0x7F
+    else:
+        mask = 0xFF
+    pcm = min(pcm, CLIP) + (BIAS >> 2)
+    segment = next((i for i, end in enumerate(SEG_END) if pcm <= end), 8)
+    if segment >= 8:
+        return 0x7F ^ mask
+    return ((segment << 4) | ((pcm >> (segment + 1)) & 0x0F)) ^ mask
+
+
+ALL_CODES = np.arange(256, dtype=np.uint8)
+ALL_SAMPLES = np.arange(-32768, 32768, dtype=np.int16)
+
+
+def test_decode_matches_reference():
+    expected = np.array([reference_ulaw2linear(int(c)) for c in ALL_CODES], dtype=np.int16)
+    np.testing.assert_array_equal(codec.decode(ALL_CODES), expected)
+
+
+def test_encode_matches_reference():
+    expected = np.array([reference_linear2ulaw(int(s)) for s in ALL_SAMPLES], dtype=np.uint8)
+    np.testing.assert_array_equal(codec.encode(ALL_SAMPLES), expected)
+
+
+def test_matches_audioop():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        audioop = pytest.importorskip("audioop")
+    pcm = ALL_SAMPLES.tobytes()
+    assert codec.lin2ulaw(pcm) == audioop.lin2ulaw(pcm, 2)
+    assert codec.ulaw2lin(ALL_CODES.tobytes()) == audioop.ulaw2lin(ALL_CODES.tobytes(), 2)
+
+
+def test_bytes_and_out_buffers():
+    frame = ALL_SAMPLES[::409][:160]
+    out = np.empty(len(frame), dtype=np.uint8)
+    codec.encode(frame.tobytes(), out=out)
+    np.testing.assert_array_equal(out, codec.encode(frame))
+
+    pcm = np.empty(len(out), dtype=np.int16)
+    codec.decode(out.tobytes(), out=pcm)
+    np.testing.assert_array_equal(pcm, codec.decode(out))
+
+
+def test_batches_match_single_frames():
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(-32768, 32768, 160).astype(np.int16) for _ in range(4)]
+    encoded = codec.encode_batch(frames)
+    for frame, row in zip(frames, encoded):
+        np.testing.assert_array_equal(row, codec.encode(frame))
+    decoded = codec.decode_batch([row.tobytes() for row in encoded])
+    for row, pcm in zip(encoded, decoded):
+        np.testing.assert_array_equal(pcm, codec.decode(row))
+
+
+@pytest.mark.parametrize("dtype", [np.int32, np.int64, np.uint16, np.uint32])
+def test_wide_integers_saturate(dtype):
+    info = np.iinfo(dtype)
+    wide = np.array([v for v in (-40000, -32768, -1, 0, 32767, 40000, 70000) if info.min <= v <= info.max],
+                    dtype=dtype)
+    expected = np.clip(wide.astype(np.int64), -32768, 32767).astype(np.int16)
+    np.testing.assert_array_equal(codec.encode(wide), codec.encode(expected))
+    np.testing.assert_array_equal(codec.encode_batch([wide]), codec.encode(expected)[None])
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_float_input_rejected(dtype):
+    with pytest.raises(TypeError):
+        codec.encode(np.zeros(160, dtype=dtype))
@@ -0,0 +1,78 @@
+"""Adaptive noise suppression on/off hysteresis"""
+from types import SimpleNamespace
+import numpy as np
+from audio.nc_activation import NoiseActivationController
+
+
+def _feed(controller, level_db, frames):
+    """Frames at a constant level; returns the decision after each"""
+    features = SimpleNamespace(level_db=level_db)
+    return [controller.update(None, features) for _ in range(frames)]
+
+
+def _controller(**kwargs):
+    options = dict(on_db=-50.0, hysteresis_db=6.0, max_snr_db=0, hold_frames=10, warmup_frames=5)
+    options.update(kwargs)
+    return NoiseActivationController(**options)
+
+
+def test_no_decision_during_warmup():
+    controller = _controller()
+    assert _feed(controller, -30.0, 4) == [False] * 4
+    assert _feed(controller, -30.0, 1) == [True]
+
+
+def test_floor_between_thresholds_keeps_current_state():
+    on = _controller()
+    _feed(on, -40.0, 50)
+    assert on.active
+    _feed(on, -53.0, 300)  # Below on_db, above off_db (-56)
+    assert on.active
+    assert on.switches == 0
+
+    off = _controller()
+    _feed(off, -53.0, 300)
+    assert not off.active
+
+
+def test_switches_off_below_hysteresis_and_back_on_above_on_level():
+    controller = _controller()
+    _feed(controller, -40.0, 50)
+    _feed(controller, -70.0, 200)
+    assert not controller.active
+    assert controller.switches == 1
+
+    _feed(controller, -53.0, 300)  # Inside the band: stays off
+    assert not controller.active
+    _feed(controller, -40.0, 300)
+    assert controller.active
+    assert controller.switches == 2
+
+
+def test_hold_time_delays_switch():
+    controller = _controller(hold_frames=100)
+    _feed(controller, -40.0, 5)  # Decides on the 5th frame
+    assert controller.active
+
+    decisions = _feed(controller, -90.0, 200)
+    first_off = decisions.index(False)
+    assert first_off == 99  # 100 frames after the first decision
+    assert not any(decisions[first_off:])
+
+
+def test_clean_line_stays_off_with_snr_hysteresis():
+    controller = _controller(max_snr_db=35.0)
+    # Loud speech frames well above a noisy floor: SNR ~ 45dB - a clean line
+    for _ in range(20):
+        _feed(controller, -45.0, 10)
+        _feed(controller, 0.0, 5)
+    assert controller.snr_db > 35.0
+    assert not controller.active
+
+
+def test_pcm_level_measured_without_features():
+    controller = _controller(warmup_frames=1)
+    noise = (np.random.default_rng(0).standard_normal(160) * 300).astype(np.int16)  # ~ -41dBFS
+    assert controller.update(noise)
+    assert controller.update(noise.tobytes())
+    assert -45.0 < controller.floor_db < -35.0
@@ -0,0 +1,97 @@
+"""Wrap-around of the shared noise loop readers (NoiseCursor, maqsam BackgroundAudioCursor)"""
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from audio import codec
+from audio.noise_assets import NoiseAsset, NoiseCursor
+
+SAMPLE_RATE = 8000
+LOOP_LEN = 1000     # Shorter than the 1s wrap padding: padding is the whole loop
+FRAME = 160
+
+
+@pytest.fixture
+def asset():
+    return NoiseAsset("test", SAMPLE_RATE, np.arange(LOOP_LEN, dtype=np.int16) * 7)
+
+
+def _expected(asset, start, total):
+    """The loop played from start, tiled as far as needed"""
+    loop = asset.pcm[:asset.loop_len]
+    return np.tile(loop, total // len(loop) + 2)[start:start + total]
+
+
+def test_asset_is_padded_with_loop_start(asset):
+    assert len(asset) == LOOP_LEN
+    assert asset.padding == LOOP_LEN
+    np.testing.assert_array_equal(asset.pcm[LOOP_LEN:], asset.pcm[:LOOP_LEN])
+    np.testing.assert_array_equal(asset.ulaw, codec.encode(asset.pcm))
+
+
+@pytest.mark.parametrize("size", [FRAME, 333, LOOP_LEN, 2500])
+def test_noise_cursor_wraps_like_tiled_loop(asset, size):
+    cursor = NoiseCursor(asset)
+    chunks = [cursor.read_pcm(size) for _ in range(10)]
+    assert all(len(chunk) == size for chunk in chunks)
+    np.testing.assert_array_equal(np.concatenate(chunks), _expected(asset, 0, size * 10))
+    assert cursor.position == size * 10 % LOOP_LEN
+
+
+def test_noise_cursor_reads_are_views(asset):
+    cursor = NoiseCursor(asset)
+    cursor.position = LOOP_LEN - 10
+    chunk = cursor.read_pcm(FRAME)  # Crosses the loop end
+    assert np.shares_memory(chunk, asset.pcm)
+    assert not chunk.flags.writeable
+
+
+def test_noise_cursor_ulaw_and_scaled_follow_pcm(asset):
+    pcm_cursor, ulaw_cursor, scaled_cursor = NoiseCursor(asset), NoiseCursor(asset), NoiseCursor(asset)
+    scaled = asset.scaled_pcm(0.5)
+    for _ in range(20):
+        pcm = pcm_cursor.read_pcm(FRAME)
+        assert ulaw_cursor.read_ulaw(FRAME) == codec.encode(pcm).tobytes()
+        np.testing.assert_array_equal(scaled_cursor.read(scaled, FRAME), (pcm * 0.5).astype(np.int16))
+
+
+def test_noise_cursor_random_start(asset):
+    cursor = NoiseCursor(asset, random_start=True)
+    start = cursor.position
+    assert 0 <= start < LOOP_LEN
+    np.testing.assert_array_equal(cursor.read_pcm(LOOP_LEN), _expected(asset, start, LOOP_LEN))
+
+
+@pytest.fixture
+def background_cursor(asset):
+    maqsam = pytest.importorskip("maqsam")
+    manager = SimpleNamespace(
+        asset=asset,
+        loop_view=asset.ulaw,
+        mix_loop=asset.scaled_pcm(maqsam.BACKGROUND_VOLUME_RATIO),
+        packets=[f"packet-{i}" for i in range(LOOP_LEN // maqsam.AUDIO_FRAME_SIZE)]
+    )
+    return maqsam.BackgroundAudioCursor(manager)
+
+
+@pytest.mark.parametrize("size", [FRAME, 333, 2500])
+def test_background_cursor_wraps_like_tiled_loop(asset, background_cursor, size):
+    chunks = [bytes(background_cursor.get_audio_chunk(size)) for _ in range(10)]
+    expected = codec.encode(_expected(asset, 0, size * 10)).tobytes()
+    assert b"".join(chunks) == expected
+
+
+def test_background_cursor_mix_chunks_wrap(asset, background_cursor):
+    chunks = [background_cursor.get_mix_chunk(FRAME) for _ in range(10)]
+    mix_loop = background_cursor.mix_loop[:LOOP_LEN]
+    expected = np.tile(mix_loop, 3)[:FRAME * 10]
+    np.testing.assert_array_equal(np.concatenate(chunks), expected)
+
+
+def test_background_cursor_packets_snap_to_frames(background_cursor):
+    packets = background_cursor.packets
+    assert [background_cursor.next_packet() for _ in range(len(packets) + 1)] == packets + packets[:1]
+
+    background_cursor.position = 0
+    background_cursor.get_mix_chunk(100)  # Mid-frame
+    assert background_cursor.next_packet() == packets[1]
+    assert background_cursor.position == 2 * FRAME
@@ -0,0 +1,125 @@
+"""Noise profile cache: TTL, LRU bound and the JSON file round trip"""
+import json
+import pytest
+from audio import noise_profile_cache
+from audio.noise_profile_cache import NoiseProfileCache, profile_key
+
+PROFILE = {"noise_psd": [0.1, 0.2, 0.3], "frames": 50}
+
+
+@pytest.fixture(autouse=True)
+def key_secret(monkeypatch):
+    """A fixed persistent secret, so tests never create the real secret file"""
+    monkeypatch.setattr(noise_profile_cache, "_key_secret", b"test-secret")
+    monkeypatch.setattr(noise_profile_cache, "_key_persistent", True)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(noise_profile_cache.time, "time", lambda: now[0])
+    return now
+
+
+def _cache(tmp_path, **kwargs):
+    return NoiseProfileCache(path=str(tmp_path / "profiles.json"), **kwargs)
+
+
+def test_keys_are_hmac_of_digits():
+    key = profile_key(caller="+971 50-123-4567")
+    assert noise_profile_cache.KEY_PATTERN.match(key)
+    assert "971501234567" not in key
+    assert key == profile_key(caller="971501234567")
+    assert profile_key(caller="anonymous", trunk="800123") == profile_key(trunk="800123")
+    assert profile_key(caller="anonymous") is None
+
+
+def test_ttl_expires_profiles(tmp_path, clock):
+    cache = _cache(tmp_path, ttl_hours=1)
+    key = profile_key(caller="1001")
+    cache.put(key, PROFILE)
+
+    clock[0] += 3599
+    assert cache.get(key)["noise_psd"] == PROFILE["noise_psd"]
+    clock[0] += 2
+    assert cache.get(key) is None
+    assert cache.get_stats()["expired"] == 1
+    assert cache.get_stats()["profiles"] == 0
+
+
+def test_lru_evicts_least_recently_used(tmp_path):
+    cache = _cache(tmp_path, max_entries=2)
+    first, second, third = (profile_key(caller=n) for n in ("1001", "1002", "1003"))
+    cache.put(first, PROFILE)
+    cache.put(second, PROFILE)
+    assert cache.get(first) is not None  # first is now the most recent
+    cache.put(third, PROFILE)
+
+    assert cache.get(second) is None
+    assert cache.get(first) is not None
+    assert cache.get(third) is not None
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_file_round_trip(tmp_path, clock):
+    cache = _cache(tmp_path)
+    key = profile_key(caller="1001")
+    cache.put(key, PROFILE)
+    cache.save()
+    assert cache.get_stats()["saves"] == 1
+
+    reloaded = _cache(tmp_path)
+    assert reloaded.get(key) == dict(PROFILE, updated=clock[0])
+    assert reloaded.get_stats()["dropped"] == 0
+
+
+def test_load_skips_expired_and_applies_bound(tmp_path, clock):
+    cache = _cache(tmp_path, ttl_hours=1)
+    keys = [profile_key(caller=n) for n in ("1001", "1002", "1003")]
+    cache.put(keys[0], PROFILE)
+    clock[0] += 3000
+    cache.put(keys[1], PROFILE)
+    cache.put(keys[2], PROFILE)
+    cache.save()
+
+    clock[0] += 1000  # keys[0] is now past the TTL
+    reloaded = _cache(tmp_path, ttl_hours=1, max_entries=1)
+    assert reloaded.get_stats()["profiles"] == 1
+    assert reloaded.get(keys[2]) is not None
+
+
+def test_load_drops_foreign_keys_and_rewrites(tmp_path, clock):
+    cache = _cache(tmp_path)
+    key = profile_key(caller="1001")
+    cache.put(key, PROFILE)
+    cache.save()
+
+    path = tmp_path / "profiles.json"
+    data = json.loads(path.read_text())
+    data["profiles"].append(["caller:971501234567", dict(PROFILE, updated=clock[0])])
+    path.write_text(json.dumps(data))
+
+    reloaded = _cache(tmp_path)
+    assert reloaded.get_stats()["dropped"] == 1
+    assert reloaded.get(key) is not None
+    assert "971501234567" not in path.read_text()
+
+
+def test_other_secret_drops_everything(tmp_path, monkeypatch):
+    cache = _cache(tmp_path)
+    cache.put(profile_key(caller="1001"), PROFILE)
+    cache.save()
+
+    monkeypatch.setattr(noise_profile_cache, "_key_secret", b"another-secret")
+    reloaded = _cache(tmp_path)
+    assert reloaded.get_stats()["profiles"] == 0
+    assert reloaded.get_stats()["dropped"] == 1
+
+
+def test_throwaway_secret_is_never_persisted(tmp_path, monkeypatch):
+    monkeypatch.setattr(noise_profile_cache, "_key_persistent", False)
+    cache = _cache(tmp_path)
+    cache.put(profile_key(caller="1001"), PROFILE)
+    cache.save()
+    assert cache.path is None
+    assert not (tmp_path / "profiles.json").exists()
@@ -0,0 +1,149 @@
+"""Pipeline profile resolution and the per-frame runner"""
+import asyncio
+from collections import Counter
+import numpy as np
+import pytest
+from audio import codec
+from audio.frame_features import FeatureExtractor
+from audio.user_pipeline import (
+    DEFAULT_PROFILE, PIPELINE_PROFILES, PipelineStage, UserAudioPipeline, _check_stages, resolve_pipeline
+)
+
+
+class FailingSuppressor:
+    enabled = True
+
+    def process_chunk(self, pcm, features=None):
+        raise RuntimeError("suppressor failed")
+
+
+class DelayingSuppressor:
+    """One-hop latency, like the STFT suppressor: returns the previous frame"""
+    enabled = True
+
+    def __init__(self):
+        self.previous = None
+
+    def process_chunk(self, pcm, features=None):
+        output, self.previous = self.previous, pcm.copy()
+        return np.zeros_like(pcm) if output is None else output
+
+
+class RecordingSource:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.pushed = []
+        self.features = []
+
+    async def push_pcm(self, pcm, features=None):
+        if self.fail:
+            raise RuntimeError("track closed")
+        self.pushed.append(pcm)
+        self.features.append(features)
+
+
+def _pipeline(names, source, **components):
+    components = dict(components, stats=Counter(), get_audio_source=lambda: source)
+    return UserAudioPipeline("custom", names, components)
+
+
+def _frame():
+    return codec.encode(np.arange(-8000, 8000, 100, dtype=np.int16)).tobytes()
+
+
+@pytest.mark.parametrize("profile", sorted(PIPELINE_PROFILES))
+def test_profiles_are_valid(profile):
+    _check_stages(PIPELINE_PROFILES[profile])
+
+
+@pytest.mark.parametrize("names, error", [
+    (("decode", "frobnicate", "agent"), "unknown stage"),
+    (("decode", "agent", "vad"), "after the sink"),
+    (("decode", "agent_ulaw"), "takes ulaw, gets pcm16"),
+    (("decode", "vad"), "does not end in a sink"),
+])
+def test_check_stages_rejects(names, error):
+    with pytest.raises(ValueError, match=error):
+        _check_stages(names)
+
+
+def test_resolve_named_profile():
+    assert resolve_pipeline("no_nc") == ("no_nc", PIPELINE_PROFILES["no_nc"])
+
+
+def test_resolve_custom_stages_override_profile():
+    assert resolve_pipeline("no_nc", ["decode", "encode", "agent_ulaw"]) == \
+        ("custom", ("decode", "encode", "agent_ulaw"))
+
+
+@pytest.mark.parametrize("profile, stages", [
+    ("nonexistent", None),
+    (None, None),
+    ("no_nc", ["decode", "agent_ulaw"]),
+    (None, ["decode", "missing", "agent"]),
+])
+def test_resolve_falls_back_to_default(profile, stages):
+    assert resolve_pipeline(profile, stages) == (DEFAULT_PROFILE, PIPELINE_PROFILES[DEFAULT_PROFILE])
+
+
+def test_disabled_components_drop_their_stages():
+    pipeline = _pipeline(PIPELINE_PROFILES["default"], RecordingSource())
+    assert pipeline.stage_names == ["decode", "agent"]
+    assert pipeline.disabled == ["features", "nc_activation", "noise_suppression", "vad"]
+
+
+def test_failing_bypassable_stage_passes_frame_through():
+    source = RecordingSource()
+    pipeline = _pipeline(("decode", "noise_suppression", "agent"), source, noise_suppressor=FailingSuppressor())
+    data = _frame()
+
+    for _ in range(3):
+        asyncio.run(pipeline.run(data))
+
+    assert len(source.pushed) == 3
+    for pcm in source.pushed:
+        np.testing.assert_array_equal(pcm, codec.decode(data))
+    stats = {stage["name"]: stage for stage in pipeline.get_stats()["stages"]}
+    assert stats["noise_suppression"]["errors"] == 3
+    assert stats["noise_suppression"]["frames"] == 3
+    assert pipeline.frames == 3
+
+
+def test_failing_sink_propagates():
+    pipeline = _pipeline(("decode", "agent"), RecordingSource(fail=True))
+    with pytest.raises(RuntimeError, match="track closed"):
+        asyncio.run(pipeline.run(_frame()))
+
+
+def test_bypassed_stage_is_skipped():
+    source = RecordingSource()
+    pipeline = _pipeline(("decode", "noise_suppression", "agent"), source, noise_suppressor=FailingSuppressor())
+    assert pipeline.set_bypass("noise_suppression")
+    assert not pipeline.set_bypass("decode")
+
+    asyncio.run(pipeline.run(_frame()))
+
+    stats = {stage["name"]: stage for stage in pipeline.get_stats()["stages"]}
+    assert stats["noise_suppression"]["bypassed_frames"] == 1
+    assert stats["noise_suppression"]["errors"] == 0
+    assert len(source.pushed) == 1
+
+
+def test_agent_gets_features_only_for_the_frame_it_sends():
+    names = ("decode", "features", "noise_suppression", "agent")
+    source = RecordingSource()
+    pipeline = _pipeline(names, source, feature_extractor=FeatureExtractor(activity=True),
+                         noise_suppressor=DelayingSuppressor())
+    asyncio.run(pipeline.run(_frame()))
+    assert source.features == [None]  # Suppressor output lags the raw frame
+
+    source = RecordingSource()
+    pipeline = _pipeline(("decode", "features", "agent"), source, feature_extractor=FeatureExtractor(activity=True))
+    asyncio.run(pipeline.run(_frame()))
+    assert source.features[0] is not None
+    assert source.features[0].pcm is source.pushed[0]
+
+
+def test_stage_base_is_abstract():
+    with pytest.raises(TypeError):
+        PipelineStage()